@@ -1,12 +1,277 @@
 import json
 import os
-import psycopg2
-import bcrypt
-import jwt
+import hashlib
+import math
+import uuid
+import importlib
+import threading
 from datetime import datetime, timedelta
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
+from collections import OrderedDict, deque
 import time
 
+# Lazy imports and warm connections inline (shared module doesn't work in cloud functions)
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', '2'))
+DB_IDLE_PING_SECONDS = float(os.environ.get('DB_IDLE_PING_SECONDS', '30'))
+
+class LazyModule:
+    '''Defers importing a heavy dependency until its first attribute access'''
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def load(self) -> Any:
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.load(), attr)
+
+psycopg2 = LazyModule('psycopg2')
+jwt = LazyModule('jwt')
+bcrypt = LazyModule('bcrypt')
+_idle_connections: List[Tuple[Any, float]] = []
+_pool_lock = threading.Lock()
+
+def get_connection() -> Any:
+    '''Reuse an idle connection of this warm instance, pinging it after a long idle period'''
+    with _pool_lock:
+        conn, released_at = _idle_connections.pop() if _idle_connections else (None, 0.0)
+    if conn is not None and not conn.closed and time.monotonic() - released_at > DB_IDLE_PING_SECONDS:
+        try:
+            ping_cursor = conn.cursor()
+            ping_cursor.execute('SELECT 1')
+            ping_cursor.close()
+            conn.rollback()
+        except psycopg2.Error:
+            conn.close()
+    if conn is None or conn.closed:
+        conn = psycopg2.connect(os.environ['DATABASE_URL'])
+    return conn
+
+def release_connection(conn: Any) -> None:
+    '''Return a connection to the idle pool in a clean transaction state'''
+    if conn.closed:
+        return
+    try:
+        if conn.autocommit:
+            conn.autocommit = False
+        else:
+            conn.rollback()
+    except psycopg2.Error:
+        conn.close()
+        return
+    with _pool_lock:
+        if len(_idle_connections) < DB_POOL_SIZE:
+            _idle_connections.append((conn, time.monotonic()))
+            return
+    conn.close()
+
+def is_warm_up(event: Dict[str, Any]) -> bool:
+    return bool(event.get('warmup')) or event.get('httpMethod') == 'WARMUP'
+
+def warm_up() -> Dict[str, Any]:
+    '''Init phase: import heavy modules and fill the idle pool before real traffic arrives'''
+    started = time.perf_counter()
+    for module in (psycopg2, jwt, bcrypt):
+        module.load()
+    warmed = 0
+    if os.environ.get('DATABASE_URL'):
+        connections = [get_connection() for _ in range(DB_POOL_SIZE)]
+        for conn in connections:
+            release_connection(conn)
+        warmed = len(connections)
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json'},
+        'isBase64Encoded': False,
+        'body': json.dumps({'warm': True, 'connections': warmed, 'ms': round((time.perf_counter() - started) * 1000, 1)})
+    }
+
+if os.environ.get('PREWARM_ON_IMPORT') == '1':
+    warm_up()
+
+# Auth inline (shared module doesn't work in cloud functions); scripts/check_inline.py keeps copies identical
+AUTH_CACHE_SIZE = int(os.environ.get('AUTH_CACHE_SIZE', '1024'))
+_verified_tokens: 'OrderedDict[bytes, Tuple[Dict[str, Any], float]]' = OrderedDict()
+_auth_lock = threading.Lock()
+
+def get_jwt_secret() -> Optional[str]:
+    return os.environ.get('JWT_SECRET')
+
+def decode_token(token: str) -> Dict[str, Any]:
+    '''HS256 verification memoized by token digest until the token expires (bounded LRU)'''
+    digest = hashlib.sha256(token.encode('utf-8')).digest()
+    now = time.time()
+    with _auth_lock:
+        cached = _verified_tokens.get(digest)
+        if cached is not None:
+            if cached[1] > now:
+                _verified_tokens.move_to_end(digest)
+                return cached[0]
+            del _verified_tokens[digest]
+    payload = jwt.decode(token, get_jwt_secret(), algorithms=['HS256'])
+    with _auth_lock:
+        _verified_tokens[digest] = (payload, float(payload.get('exp', now + 60)))
+        while len(_verified_tokens) > AUTH_CACHE_SIZE:
+            _verified_tokens.popitem(last=False)
+    return payload
+
+def verify_token(event: Dict[str, Any]) -> Tuple[bool, Optional[Dict], Optional[str]]:
+    '''Verify JWT token from request headers'''
+    headers = event.get('headers') or {}
+    token = headers.get('x-auth-token') or headers.get('X-Auth-Token')
+    
+    if not token:
+        return False, None, 'Missing authentication token'
+    
+    if not get_jwt_secret():
+        return False, None, 'Server configuration error'
+    
+    try:
+        payload = decode_token(token)
+    except jwt.ExpiredSignatureError:
+        return False, None, 'Token expired'
+    except jwt.InvalidTokenError:
+        return False, None, 'Invalid token'
+    
+    if is_token_revoked(payload):
+        return False, None, 'Token revoked'
+    
+    return True, payload, None
+
+def create_auth_error(message: str, status_code: int = 401) -> Dict[str, Any]:
+    '''Create authentication error response'''
+    return {
+        'statusCode': status_code,
+        'headers': {
+            'Content-Type': 'application/json',
+            'Access-Control-Allow-Origin': '*'
+        },
+        'isBase64Encoded': False,
+        'body': json.dumps({'error': message, 'success': False})
+    }
+
+def is_admin(claims: Dict[str, Any]) -> bool:
+    return claims.get('role') == 'admin'
+
+def judges_tournament(claims: Dict[str, Any], tournament_id: Any) -> bool:
+    '''Admins manage every tournament, judges the ones listed in their judgeOf claim'''
+    if is_admin(claims):
+        return True
+    try:
+        return int(tournament_id) in (claims.get('judgeOf') or [])
+    except (TypeError, ValueError):
+        return False
+
+# Token revocation: bloom filter of revoked jti values plus an exact set of the latest ones
+REVOCATION_REFRESH_SECONDS = float(os.environ.get('REVOCATION_REFRESH_SECONDS', '15'))
+REVOCATION_REBUILD_SECONDS = 3600
+REVOCATION_RECENT_SIZE = 256
+BLOOM_BITS = 1 << 16
+BLOOM_HASHES = 7
+
+class BloomFilter:
+    '''Fixed-size bloom filter over strings using double hashing of a SHA-256 digest'''
+    def __init__(self, bits: int = BLOOM_BITS, hashes: int = BLOOM_HASHES):
+        self.bits = bits
+        self.hashes = hashes
+        self.array = bytearray(bits // 8)
+
+    def _positions(self, value: str) -> List[int]:
+        digest = hashlib.sha256(value.encode('utf-8')).digest()
+        first = int.from_bytes(digest[:8], 'big')
+        second = int.from_bytes(digest[8:16], 'big') | 1
+        return [(first + i * second) % self.bits for i in range(self.hashes)]
+
+    def add(self, value: str) -> None:
+        for position in self._positions(value):
+            self.array[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value: str) -> bool:
+        return all(self.array[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+_revocation_bloom = BloomFilter()
+_recent_revocations: 'OrderedDict[str, None]' = OrderedDict()
+_revocation_watermark: Optional[Any] = None
+_revocations_refreshed_at = float('-inf')
+_revocations_built_at = float('-inf')
+
+def remember_revocation(jti: str) -> None:
+    with _auth_lock:
+        _revocation_bloom.add(jti)
+        _recent_revocations[jti] = None
+        _recent_revocations.move_to_end(jti)
+        while len(_recent_revocations) > REVOCATION_RECENT_SIZE:
+            _recent_revocations.popitem(last=False)
+
+def refresh_revocations() -> None:
+    '''Pull revocations newer than the watermark; rebuild hourly so expired ids leave the filter'''
+    global _revocation_bloom, _revocation_watermark, _revocations_refreshed_at, _revocations_built_at
+    now = time.monotonic()
+    rebuild = now - _revocations_built_at > REVOCATION_REBUILD_SECONDS
+    watermark = None if rebuild else _revocation_watermark
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        # Overlap the watermark a little so revocations committed out of order are not skipped
+        cursor.execute("""
+            SELECT jti, revoked_at FROM t_p79348767_tournament_site_buil.revoked_tokens
+            WHERE expires_at > NOW()
+              AND (%s::timestamptz IS NULL OR revoked_at > %s::timestamptz - INTERVAL '5 seconds')
+            ORDER BY revoked_at
+        """, (watermark, watermark))
+        rows = cursor.fetchall()
+        cursor.close()
+    finally:
+        release_connection(conn)
+    
+    if rebuild:
+        with _auth_lock:
+            _revocation_bloom = BloomFilter()
+            _recent_revocations.clear()
+        _revocations_built_at = now
+    for jti, revoked_at in rows:
+        remember_revocation(jti)
+        watermark = revoked_at
+    _revocation_watermark = watermark
+    _revocations_refreshed_at = now
+
+def is_token_revoked(claims: Dict[str, Any]) -> bool:
+    '''Exact set and bloom filter answer locally; a bloom hit or a stale filter costs a database lookup'''
+    jti = claims.get('jti')
+    if not jti:
+        return False
+    if time.monotonic() - _revocations_refreshed_at > REVOCATION_REFRESH_SECONDS:
+        try:
+            refresh_revocations()
+        except Exception as e:
+            print(f'Revocation refresh failed: {str(e)}')
+    if jti in _recent_revocations:
+        return True
+    # A miss only proves "not revoked" while the filter is fresh; after a failed refresh check exactly (fail closed)
+    stale = time.monotonic() - _revocations_refreshed_at > REVOCATION_REFRESH_SECONDS
+    if jti not in _revocation_bloom and not stale:
+        return False
+    try:
+        conn = get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                'SELECT 1 FROM t_p79348767_tournament_site_buil.revoked_tokens WHERE jti = %s',
+                (jti,)
+            )
+            revoked = cursor.fetchone() is not None
+            cursor.close()
+        finally:
+            release_connection(conn)
+    except Exception:
+        return True
+    if revoked:
+        remember_revocation(jti)
+    return revoked
+
 # CORS configuration inline (shared module doesn't work in cloud functions)
 ALLOWED_ORIGINS = [
     'https://poehali.dev',
@@ -31,10 +296,11 @@ def get_cors_headers(origin: str = None) -> dict:
         'Access-Control-Allow-Credentials': 'true'
     }
 
-def create_response(status_code: int, body: dict, origin: str = None) -> dict:
+def create_response(status_code: int, body: dict, origin: str = None, extra_headers: Dict[str, str] = None) -> dict:
     headers = {
         'Content-Type': 'application/json',
-        **get_cors_headers(origin)
+        **get_cors_headers(origin),
+        **(extra_headers or {})
     }
     
     return {
@@ -44,52 +310,398 @@ def create_response(status_code: int, body: dict, origin: str = None) -> dict:
         'body': json.dumps(body)
     }
 
+# Login throttling: sliding windows of failed attempts per username and per IP, kept in memory.
+# With LOGIN_THROTTLE_STORE=db failures are also written to login_attempts in batches that ride
+# along with the next login query, which also reads back failures other instances recorded.
+LOGIN_WINDOW_SECONDS = int(os.environ.get('LOGIN_WINDOW_SECONDS', '900'))
+LOGIN_MAX_FAILURES_PER_USER = int(os.environ.get('LOGIN_MAX_FAILURES_PER_USER', '5'))
+# Higher than per user: players at a venue share one NAT address
+LOGIN_MAX_FAILURES_PER_IP = int(os.environ.get('LOGIN_MAX_FAILURES_PER_IP', '50'))
+LOGIN_THROTTLE_STORE = os.environ.get('LOGIN_THROTTLE_STORE', 'db')
+LOGIN_FLUSH_BATCH = int(os.environ.get('LOGIN_FLUSH_BATCH', '20'))
+LOGIN_FLUSH_SECONDS = float(os.environ.get('LOGIN_FLUSH_SECONDS', '5'))
+LOGIN_THROTTLE_MAX_KEYS = 10000
+LOGIN_ATTEMPTS_RETENTION_HOURS = int(os.environ.get('LOGIN_ATTEMPTS_RETENTION_HOURS', '24'))
+LOGIN_COMPACT_BATCH = 5000
+
+class SlidingWindowLimiter:
+    '''Failure timestamps per key; a key is throttled while it holds `limit` of them inside the window'''
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.window = window
+        self.failures: 'OrderedDict[str, deque]' = OrderedDict()
+        self.blocked_until: Dict[str, float] = {}
+    
+    def _recent(self, key: str, now: float) -> Optional[deque]:
+        stamps = self.failures.get(key)
+        if stamps is None:
+            return None
+        while stamps and stamps[0] <= now - self.window:
+            stamps.popleft()
+        if not stamps:
+            del self.failures[key]
+            return None
+        return stamps
+    
+    def retry_after(self, key: str, now: float) -> float:
+        wait = self.blocked_until.get(key, now) - now
+        if wait <= 0:
+            self.blocked_until.pop(key, None)
+        stamps = self._recent(key, now)
+        if stamps is not None and len(stamps) >= self.limit:
+            wait = max(wait, stamps[-self.limit] + self.window - now)
+        return max(wait, 0.0)
+    
+    def hit(self, key: str, now: float) -> None:
+        stamps = self._recent(key, now)
+        if stamps is None:
+            stamps = self.failures[key] = deque(maxlen=self.limit)
+        self.failures.move_to_end(key)
+        stamps.append(now)
+        while len(self.failures) > LOGIN_THROTTLE_MAX_KEYS:
+            self.failures.popitem(last=False)
+    
+    def block(self, key: str, until: float) -> None:
+        if len(self.blocked_until) >= LOGIN_THROTTLE_MAX_KEYS:
+            now = time.monotonic()
+            self.blocked_until = {k: v for k, v in self.blocked_until.items() if v > now}
+        self.blocked_until[key] = max(self.blocked_until.get(key, until), until)
+    
+    def reset(self, key: str) -> None:
+        self.failures.pop(key, None)
+        self.blocked_until.pop(key, None)
+
+_user_limiter = SlidingWindowLimiter(LOGIN_MAX_FAILURES_PER_USER, LOGIN_WINDOW_SECONDS)
+_ip_limiter = SlidingWindowLimiter(LOGIN_MAX_FAILURES_PER_IP, LOGIN_WINDOW_SECONDS)
+_throttle_lock = threading.Lock()
+_pending_failures: Dict[Tuple[str, str], int] = {}
+_pending_clears: Dict[Tuple[str, str], None] = {}
+_pending_since: Optional[float] = None
+
+def login_retry_after(source_ip: str, username: str) -> int:
+    '''Seconds until this IP/username may try again, 0 when not throttled'''
+    with _throttle_lock:
+        now = time.monotonic()
+        wait = max(_user_limiter.retry_after(username.lower(), now), _ip_limiter.retry_after(source_ip, now))
+    return math.ceil(wait)
+
+def record_login_failure(source_ip: str, username: str) -> None:
+    global _pending_since
+    with _throttle_lock:
+        now = time.monotonic()
+        _user_limiter.hit(username.lower(), now)
+        _ip_limiter.hit(source_ip, now)
+        if LOGIN_THROTTLE_STORE == 'db':
+            key = (source_ip, username)
+            _pending_failures[key] = _pending_failures.get(key, 0) + 1
+            _pending_clears.pop(key, None)
+            _pending_since = now if _pending_since is None else _pending_since
+
+def record_login_success(source_ip: str, username: str) -> None:
+    '''Forget the username's failures; the IP window keeps counting so one good account cannot reset it'''
+    with _throttle_lock:
+        _user_limiter.reset(username.lower())
+        if LOGIN_THROTTLE_STORE == 'db':
+            _pending_failures.pop((source_ip, username), None)
+            _pending_clears[(source_ip, username)] = None
+
+def take_login_batch() -> Tuple[Dict[Tuple[str, str], int], Dict[Tuple[str, str], None]]:
+    '''Hand buffered attempts to the next login round trip once the batch is full or old enough'''
+    global _pending_failures, _pending_clears, _pending_since
+    with _throttle_lock:
+        due = (
+            len(_pending_failures) + len(_pending_clears) >= LOGIN_FLUSH_BATCH
+            or (_pending_since is not None and time.monotonic() - _pending_since >= LOGIN_FLUSH_SECONDS)
+        )
+        if not due:
+            return {}, {}
+        failures, clears = _pending_failures, _pending_clears
+        _pending_failures, _pending_clears, _pending_since = {}, {}, None
+    return failures, clears
+
+def restore_login_batch(failures: Dict[Tuple[str, str], int], clears: Dict[Tuple[str, str], None]) -> None:
+    '''Put an unwritten batch back so the next round trip retries it; attempts buffered since then win'''
+    global _pending_since
+    with _throttle_lock:
+        for key, count in failures.items():
+            if key not in _pending_clears:
+                _pending_failures[key] = _pending_failures.get(key, 0) + count
+        for key in clears:
+            if key not in _pending_failures:
+                _pending_clears[key] = None
+        if (_pending_failures or _pending_clears) and _pending_since is None:
+            _pending_since = time.monotonic()
+
+def apply_shared_blocks(source_ip: str, username: str, row: Tuple) -> None:
+    '''Adopt failures other instances recorded for this IP/username'''
+    user_failures, user_wait, ip_failures, ip_wait = row[:4]
+    with _throttle_lock:
+        now = time.monotonic()
+        if user_failures >= LOGIN_MAX_FAILURES_PER_USER and user_wait:
+            _user_limiter.block(username.lower(), now + float(user_wait))
+        if ip_failures >= LOGIN_MAX_FAILURES_PER_IP and ip_wait:
+            _ip_limiter.block(source_ip, now + float(ip_wait))
+
+# One round trip per login: writes the buffered attempt batch, counts shared failures for this
+# IP/username (each side through its own index) and loads the account with its judge assignments.
+# Rows written by the CTEs are invisible to the statement snapshot, so they are merged in by key.
+LOGIN_QUERY = """
+    WITH cleared AS (
+        DELETE FROM t_p79348767_tournament_site_buil.login_attempts
+        WHERE (ip_address, username) IN (SELECT * FROM unnest(%(clear_ips)s::varchar[], %(clear_names)s::varchar[]))
+        RETURNING ip_address, username
+    ), recorded AS (
+        INSERT INTO t_p79348767_tournament_site_buil.login_attempts (ip_address, username, attempt_count, last_attempt)
+        SELECT ip, name, n, NOW() FROM unnest(%(fail_ips)s::varchar[], %(fail_names)s::varchar[], %(fail_counts)s::int[]) AS f(ip, name, n)
+        ON CONFLICT (ip_address, username)
+        DO UPDATE SET attempt_count = CASE
+                WHEN login_attempts.last_attempt < NOW() - make_interval(secs => %(window)s) THEN EXCLUDED.attempt_count
+                ELSE login_attempts.attempt_count + EXCLUDED.attempt_count
+            END,
+            last_attempt = NOW()
+        RETURNING ip_address, username, attempt_count, last_attempt
+    ), stored AS (
+        SELECT id, ip_address, username, attempt_count, last_attempt
+        FROM t_p79348767_tournament_site_buil.login_attempts
+        WHERE ip_address = %(ip)s AND last_attempt > NOW() - make_interval(secs => %(window)s)
+        UNION
+        SELECT id, ip_address, username, attempt_count, last_attempt
+        FROM t_p79348767_tournament_site_buil.login_attempts
+        WHERE LOWER(username) = LOWER(%(username)s) AND last_attempt > NOW() - make_interval(secs => %(window)s)
+    ), attempts AS (
+        SELECT ip_address, username, attempt_count, last_attempt FROM stored s
+        WHERE NOT EXISTS (SELECT 1 FROM recorded r WHERE r.ip_address = s.ip_address AND r.username = s.username)
+          AND NOT EXISTS (SELECT 1 FROM cleared c WHERE c.ip_address = s.ip_address AND c.username = s.username)
+        UNION ALL
+        SELECT ip_address, username, attempt_count, last_attempt FROM recorded
+        WHERE ip_address = %(ip)s OR LOWER(username) = LOWER(%(username)s)
+    ), throttle AS (
+        SELECT
+            COALESCE(SUM(attempt_count) FILTER (WHERE LOWER(username) = LOWER(%(username)s)), 0) AS user_failures,
+            EXTRACT(EPOCH FROM MAX(last_attempt) FILTER (WHERE LOWER(username) = LOWER(%(username)s))
+                + make_interval(secs => %(window)s) - NOW()) AS user_wait,
+            COALESCE(SUM(attempt_count) FILTER (WHERE ip_address = %(ip)s), 0) AS ip_failures,
+            EXTRACT(EPOCH FROM MAX(last_attempt) FILTER (WHERE ip_address = %(ip)s)
+                + make_interval(secs => %(window)s) - NOW()) AS ip_wait
+        FROM attempts
+    )
+    SELECT t.user_failures, t.user_wait, t.ip_failures, t.ip_wait,
+           u.id, u.username, u.name, u.role, u.city, u.is_active, u.password, u.rating,
+           CASE WHEN u.role = 'judge' THEN ARRAY(
+               SELECT tr.id FROM t_p79348767_tournament_site_buil.tournaments tr
+               WHERE tr.judge_id = u.id ORDER BY tr.id
+           ) ELSE ARRAY[]::integer[] END AS judge_of
+    FROM throttle t
+    LEFT JOIN t_p79348767_tournament_site_buil.users u ON u.username = %(username)s
+"""
+
+def fetch_login_state(source_ip: str, username: str) -> Tuple:
+    '''Run LOGIN_QUERY with the due attempt batch; returns throttle counts followed by the user row'''
+    failures, clears = take_login_batch()
+    try:
+        conn = get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(LOGIN_QUERY, {
+                'clear_ips': [ip for ip, _ in clears], 'clear_names': [name for _, name in clears],
+                'fail_ips': [ip for ip, _ in failures], 'fail_names': [name for _, name in failures],
+                'fail_counts': list(failures.values()),
+                'ip': source_ip, 'username': username, 'window': LOGIN_WINDOW_SECONDS
+            })
+            row = cursor.fetchone()
+            conn.commit()
+            cursor.close()
+        finally:
+            release_connection(conn)
+    except Exception:
+        restore_login_batch(failures, clears)
+        raise
+    return row
+
+# Checked against when the username does not exist, so misses cost the same as wrong passwords
+DUMMY_PASSWORD_HASH = b'$2b$12$C6UzMDM.H6dfI/f/IKcEeO5vRUeJ1GjDh6f9a5tKx3bTzM4j4Nq6W'
+
+def check_password(password: str, password_hash: Optional[str]) -> bool:
+    '''bcrypt releases the GIL while hashing, so concurrent logins on one instance still overlap'''
+    hashed = password_hash.encode('utf-8') if password_hash else DUMMY_PASSWORD_HASH
+    try:
+        return bcrypt.checkpw(password.encode('utf-8'), hashed) and password_hash is not None
+    except ValueError:
+        return False
+
+def is_compaction_run(event: Dict[str, Any]) -> bool:
+    return event.get('task') == 'compact-login-attempts'
+
+def compact_login_attempts() -> Dict[str, Any]:
+    '''Timer trigger: delete login_attempts rows past retention in small batches to keep locks short'''
+    deleted = 0
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        while True:
+            cursor.execute("""
+                DELETE FROM t_p79348767_tournament_site_buil.login_attempts
+                WHERE id IN (
+                    SELECT id FROM t_p79348767_tournament_site_buil.login_attempts
+                    WHERE last_attempt < NOW() - make_interval(hours => %s)
+                    LIMIT %s
+                )
+            """, (LOGIN_ATTEMPTS_RETENTION_HOURS, LOGIN_COMPACT_BATCH))
+            batch = cursor.rowcount
+            conn.commit()
+            deleted += batch
+            if batch < LOGIN_COMPACT_BATCH:
+                break
+        cursor.close()
+    finally:
+        release_connection(conn)
+    return create_response(200, {'deleted': deleted})
+
+def too_many_attempts(retry_after: int, origin: str) -> Dict[str, Any]:
+    return create_response(429, {'error': 'Too many login attempts. Please try again later.', 'retryAfter': retry_after}, origin, {
+        'Retry-After': str(retry_after),
+        'Access-Control-Expose-Headers': 'Retry-After'
+    })
+
+def load_judge_assignments(cursor: Any, user_id: int, role: str) -> List[int]:
+    '''Tournament ids the user judges, carried in the judgeOf claim'''
+    if role != 'judge':
+        return []
+    cursor.execute("""
+        SELECT id FROM t_p79348767_tournament_site_buil.tournaments
+        WHERE judge_id = %s
+        ORDER BY id
+    """, (user_id,))
+    return [row[0] for row in cursor.fetchall()]
+
+TOKEN_LIFETIME = timedelta(hours=2)
+
+def issue_token(user_id: int, username: str, role: str, judge_of: List[int]) -> str:
+    '''Create JWT token with role claims (expires in 2 hours)'''
+    now = datetime.utcnow()
+    token_payload = {
+        'userId': user_id,
+        'username': username,
+        'role': role,
+        'judgeOf': judge_of,
+        'jti': uuid.uuid4().hex,
+        'iat': now,
+        'exp': now + TOKEN_LIFETIME
+    }
+    return jwt.encode(token_payload, get_jwt_secret(), algorithm='HS256')
+
 def refresh_token_handler(event: Dict[str, Any], origin: str) -> Dict[str, Any]:
-    '''Refresh JWT token if still valid'''
+    '''Refresh JWT token if still valid, re-reading role and judge assignments'''
     try:
-        auth_header = event.get('headers', {}).get('X-Auth-Token') or event.get('headers', {}).get('x-auth-token')
+        is_valid, payload, error_msg = verify_token(event)
+        if not is_valid:
+            status_code = 500 if error_msg == 'Server configuration error' else 401
+            return create_response(status_code, {'error': error_msg}, origin)
         
-        if not auth_header:
-            return create_response(401, {'error': 'No token provided'}, origin)
-        
-        jwt_secret = os.environ.get('JWT_SECRET')
-        if not jwt_secret:
-            return create_response(500, {'error': 'JWT not configured'}, origin)
+        conn = get_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT username, role, is_active
+            FROM t_p79348767_tournament_site_buil.users
+            WHERE id = %s
+        """, (payload['userId'],))
+        row = cursor.fetchone()
         
-        # Decode token (will fail if expired or invalid)
-        try:
-            payload = jwt.decode(auth_header, jwt_secret, algorithms=['HS256'])
-        except jwt.ExpiredSignatureError:
-            return create_response(401, {'error': 'Token expired'}, origin)
-        except jwt.InvalidTokenError:
-            return create_response(401, {'error': 'Invalid token'}, origin)
-        
-        # Generate new token with same data but fresh expiration
-        new_payload = {
-            'userId': payload['userId'],
-            'username': payload['username'],
-            'role': payload['role'],
-            'exp': datetime.utcnow() + timedelta(hours=2)
-        }
+        if not row or not row[2]:
+            cursor.close()
+            release_connection(conn)
+            return create_response(403, {'error': 'User is blocked'}, origin)
         
-        new_token = jwt.encode(new_payload, jwt_secret, algorithm='HS256')
+        username, role, _ = row
+        judge_of = load_judge_assignments(cursor, payload['userId'], role)
+        cursor.close()
+        release_connection(conn)
         
         return create_response(200, {
             'success': True,
-            'token': new_token
+            'token': issue_token(payload['userId'], username, role, judge_of)
         }, origin)
         
     except Exception as e:
         return create_response(500, {'error': f'Token refresh failed: {str(e)}'}, origin)
 
+def revoke_token(jti: str, user_id: Optional[int], expires_at: float) -> None:
+    '''Store a revoked jti until the token would expire and drop it on this instance immediately'''
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT INTO t_p79348767_tournament_site_buil.revoked_tokens (jti, user_id, expires_at)
+            VALUES (%s, %s, to_timestamp(%s))
+            ON CONFLICT (jti) DO NOTHING
+        """, (jti, user_id, expires_at))
+        conn.commit()
+        cursor.close()
+    finally:
+        release_connection(conn)
+    remember_revocation(jti)
+
+def logout_handler(event: Dict[str, Any], origin: str) -> Dict[str, Any]:
+    '''Revoke the presented token'''
+    try:
+        is_valid, payload, error_msg = verify_token(event)
+        if not is_valid:
+            return create_response(401, {'error': error_msg}, origin)
+        
+        # Tokens issued before jti claims cannot be revoked individually and simply expire
+        if payload.get('jti'):
+            revoke_token(payload['jti'], payload.get('userId'), payload['exp'])
+        
+        return create_response(200, {'success': True}, origin)
+        
+    except Exception as e:
+        return create_response(500, {'error': f'Logout failed: {str(e)}'}, origin)
+
+def revoke_handler(event: Dict[str, Any], origin: str) -> Dict[str, Any]:
+    '''Admin-only revocation of a token by its jti'''
+    try:
+        is_valid, payload, error_msg = verify_token(event)
+        if not is_valid:
+            return create_response(401, {'error': error_msg}, origin)
+        
+        if not is_admin(payload):
+            return create_response(403, {'error': 'Insufficient permissions'}, origin)
+        
+        body_data = json.loads(event.get('body') or '{}')
+        jti = (body_data.get('jti') or '').strip()
+        if not jti:
+            return create_response(400, {'error': 'jti is required'}, origin)
+        
+        user_id = body_data.get('user_id')
+        if user_id is not None:
+            try:
+                user_id = int(user_id)
+            except (TypeError, ValueError):
+                return create_response(400, {'error': 'user_id must be an integer'}, origin)
+        
+        # Expiry of a foreign token is unknown - keep the entry for the maximum token lifetime
+        revoke_token(jti, user_id, time.time() + TOKEN_LIFETIME.total_seconds())
+        
+        return create_response(200, {'success': True, 'jti': jti}, origin)
+        
+    except Exception as e:
+        return create_response(500, {'error': f'Revoke failed: {str(e)}'}, origin)
+
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     '''
-    Business: User authentication with bcrypt hashing and token refresh
-    Args: event - dict with httpMethod, body containing username and password OR X-Auth-Token for refresh
+    Business: User authentication with bcrypt hashing, token refresh and revocation (/logout, /revoke)
+    Args: event - dict with httpMethod, body containing username and password OR X-Auth-Token for refresh/logout
           context - object with attributes: request_id, function_name
     Returns: HTTP response with user data if credentials are valid
     '''
     method = event.get('httpMethod', 'POST')
+    
+    if is_warm_up(event):
+        return warm_up()
+    
+    if is_compaction_run(event):
+        return compact_login_attempts()
+    
     origin = event.get('headers', {}).get('origin') or event.get('headers', {}).get('Origin')
     path = event.get('path', '/')
     
@@ -106,6 +718,12 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     if method == 'POST' and path.endswith('/refresh'):
         return refresh_token_handler(event, origin)
     
+    if method == 'POST' and path.endswith('/logout'):
+        return logout_handler(event, origin)
+    
+    if method == 'POST' and path.endswith('/revoke'):
+        return revoke_handler(event, origin)
+    
     if method != 'POST':
         return create_response(405, {'error': 'Method not allowed'}, origin)
     
@@ -124,108 +742,36 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         if not username or not password:
             return create_response(400, {'error': 'Username and password are required'}, origin)
         
-        conn = psycopg2.connect(database_url)
-        cursor = conn.cursor()
+        retry_after = login_retry_after(source_ip, username)
+        if retry_after:
+            return too_many_attempts(retry_after, origin)
         
-        # Check for rate limiting
-        current_time = int(time.time())
-        cursor.execute("""
-            SELECT attempt_count, last_attempt 
-            FROM t_p79348767_tournament_site_buil.login_attempts 
-            WHERE ip_address = %s OR username = %s
-            ORDER BY last_attempt DESC LIMIT 1
-        """, (source_ip, username))
-        
-        rate_limit_row = cursor.fetchone()
-        if rate_limit_row:
-            attempt_count, last_attempt = rate_limit_row
-            time_diff = current_time - int(last_attempt.timestamp()) if hasattr(last_attempt, 'timestamp') else 0
-            
-            # Block if 5+ attempts in last 15 minutes (900 seconds)
-            if attempt_count >= 5 and time_diff < 900:
-                time.sleep(2)  # Slow down brute force attempts
-                return create_response(429, {'error': 'Too many login attempts. Please try again later.'}, origin)
-            
-            # Reset counter if more than 15 minutes passed
-            if time_diff >= 900:
-                cursor.execute("""
-                    DELETE FROM t_p79348767_tournament_site_buil.login_attempts 
-                    WHERE ip_address = %s OR username = %s
-                """, (source_ip, username))
-                conn.commit()
+        login_state = fetch_login_state(source_ip, username)
+        apply_shared_blocks(source_ip, username, login_state)
+        retry_after = login_retry_after(source_ip, username)
+        if retry_after:
+            return too_many_attempts(retry_after, origin)
         
-        cursor.execute("""
-            SELECT id, username, name, role, city, is_active, password, rating
-            FROM t_p79348767_tournament_site_buil.users
-            WHERE username = %s
-        """, (username,))
-        
-        row = cursor.fetchone()
+        user_id, db_username, name, role, city, is_active, db_password, rating, judge_of = login_state[4:]
         
-        if not row:
-            # Record failed attempt
-            cursor.execute("""
-                INSERT INTO t_p79348767_tournament_site_buil.login_attempts (ip_address, username, attempt_count, last_attempt)
-                VALUES (%s, %s, 1, NOW())
-                ON CONFLICT (ip_address, username) 
-                DO UPDATE SET attempt_count = login_attempts.attempt_count + 1, last_attempt = NOW()
-            """, (source_ip, username))
-            conn.commit()
-            cursor.close()
-            conn.close()
-            
-            time.sleep(1)  # Slow down enumeration attacks
+        if user_id is None:
+            check_password(password, None)
+            record_login_failure(source_ip, username)
             return create_response(401, {'error': 'Invalid credentials'}, origin)
         
-        user_id, db_username, name, role, city, is_active, db_password, rating = row
-        
         if not is_active:
-            cursor.close()
-            conn.close()
             return create_response(403, {'error': 'User is blocked'}, origin)
         
-        # Verify password using bcrypt
-        password_bytes = password.encode('utf-8')
-        db_password_bytes = db_password.encode('utf-8')
-        
-        if not bcrypt.checkpw(password_bytes, db_password_bytes):
-            # Record failed attempt
-            cursor.execute("""
-                INSERT INTO t_p79348767_tournament_site_buil.login_attempts (ip_address, username, attempt_count, last_attempt)
-                VALUES (%s, %s, 1, NOW())
-                ON CONFLICT (ip_address, username) 
-                DO UPDATE SET attempt_count = login_attempts.attempt_count + 1, last_attempt = NOW()
-            """, (source_ip, username))
-            conn.commit()
-            cursor.close()
-            conn.close()
-            
-            time.sleep(1)  # Slow down brute force attacks
+        if not check_password(password, db_password):
+            record_login_failure(source_ip, username)
             return create_response(401, {'error': 'Invalid credentials'}, origin)
         
-        # Authentication successful - clear failed attempts
-        cursor.execute("""
-            DELETE FROM t_p79348767_tournament_site_buil.login_attempts 
-            WHERE ip_address = %s OR username = %s
-        """, (source_ip, username))
-        conn.commit()
-        cursor.close()
-        conn.close()
+        record_login_success(source_ip, username)
         
-        # Generate JWT token
-        jwt_secret = os.environ.get('JWT_SECRET')
-        if not jwt_secret:
+        if not get_jwt_secret():
             return create_response(500, {'error': 'JWT not configured'}, origin)
         
-        # Create JWT token with user data (expires in 2 hours)
-        token_payload = {
-            'userId': user_id,
-            'username': db_username,
-            'role': role,
-            'exp': datetime.utcnow() + timedelta(hours=2)
-        }
-        
-        token = jwt.encode(token_payload, jwt_secret, algorithm='HS256')
+        token = issue_token(user_id, db_username, role, list(judge_of or []))
         
         return create_response(200, {
             'success': True,
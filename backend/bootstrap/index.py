@@ -0,0 +1,568 @@
+import json
+import os
+import hashlib
+import importlib
+import threading
+import select
+import time
+from typing import Dict, Any, List, Optional, Tuple, Callable
+from collections import OrderedDict
+
+# Lazy imports and warm connections inline (shared module doesn't work in cloud functions)
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', '2'))
+DB_IDLE_PING_SECONDS = float(os.environ.get('DB_IDLE_PING_SECONDS', '30'))
+
+class LazyModule:
+    '''Defers importing a heavy dependency until its first attribute access'''
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def load(self) -> Any:
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.load(), attr)
+
+psycopg2 = LazyModule('psycopg2')
+jwt = LazyModule('jwt')
+_idle_connections: List[Tuple[Any, float]] = []
+_pool_lock = threading.Lock()
+
+def get_connection() -> Any:
+    '''Reuse an idle connection of this warm instance, pinging it after a long idle period'''
+    with _pool_lock:
+        conn, released_at = _idle_connections.pop() if _idle_connections else (None, 0.0)
+    if conn is not None and not conn.closed and time.monotonic() - released_at > DB_IDLE_PING_SECONDS:
+        try:
+            ping_cursor = conn.cursor()
+            ping_cursor.execute('SELECT 1')
+            ping_cursor.close()
+            conn.rollback()
+        except psycopg2.Error:
+            conn.close()
+    if conn is None or conn.closed:
+        conn = psycopg2.connect(os.environ['DATABASE_URL'])
+    return conn
+
+def release_connection(conn: Any) -> None:
+    '''Return a connection to the idle pool in a clean transaction state'''
+    if conn.closed:
+        return
+    try:
+        if conn.autocommit:
+            conn.autocommit = False
+        else:
+            conn.rollback()
+    except psycopg2.Error:
+        conn.close()
+        return
+    with _pool_lock:
+        if len(_idle_connections) < DB_POOL_SIZE:
+            _idle_connections.append((conn, time.monotonic()))
+            return
+    conn.close()
+
+def is_warm_up(event: Dict[str, Any]) -> bool:
+    return bool(event.get('warmup')) or event.get('httpMethod') == 'WARMUP'
+
+def warm_up() -> Dict[str, Any]:
+    '''Init phase: import heavy modules and fill the idle pool before real traffic arrives'''
+    started = time.perf_counter()
+    for module in (psycopg2, jwt):
+        module.load()
+    warmed = 0
+    if os.environ.get('DATABASE_URL'):
+        connections = [get_connection() for _ in range(DB_POOL_SIZE)]
+        for conn in connections:
+            release_connection(conn)
+        warmed = len(connections)
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json'},
+        'isBase64Encoded': False,
+        'body': json.dumps({'warm': True, 'connections': warmed, 'ms': round((time.perf_counter() - started) * 1000, 1)})
+    }
+
+if os.environ.get('PREWARM_ON_IMPORT') == '1':
+    warm_up()
+
+# Auth inline (shared module doesn't work in cloud functions); scripts/check_inline.py keeps copies identical
+AUTH_CACHE_SIZE = int(os.environ.get('AUTH_CACHE_SIZE', '1024'))
+_verified_tokens: 'OrderedDict[bytes, Tuple[Dict[str, Any], float]]' = OrderedDict()
+_auth_lock = threading.Lock()
+
+def get_jwt_secret() -> Optional[str]:
+    return os.environ.get('JWT_SECRET')
+
+def decode_token(token: str) -> Dict[str, Any]:
+    '''HS256 verification memoized by token digest until the token expires (bounded LRU)'''
+    digest = hashlib.sha256(token.encode('utf-8')).digest()
+    now = time.time()
+    with _auth_lock:
+        cached = _verified_tokens.get(digest)
+        if cached is not None:
+            if cached[1] > now:
+                _verified_tokens.move_to_end(digest)
+                return cached[0]
+            del _verified_tokens[digest]
+    payload = jwt.decode(token, get_jwt_secret(), algorithms=['HS256'])
+    with _auth_lock:
+        _verified_tokens[digest] = (payload, float(payload.get('exp', now + 60)))
+        while len(_verified_tokens) > AUTH_CACHE_SIZE:
+            _verified_tokens.popitem(last=False)
+    return payload
+
+def verify_token(event: Dict[str, Any]) -> Tuple[bool, Optional[Dict], Optional[str]]:
+    '''Verify JWT token from request headers'''
+    headers = event.get('headers') or {}
+    token = headers.get('x-auth-token') or headers.get('X-Auth-Token')
+    
+    if not token:
+        return False, None, 'Missing authentication token'
+    
+    if not get_jwt_secret():
+        return False, None, 'Server configuration error'
+    
+    try:
+        payload = decode_token(token)
+    except jwt.ExpiredSignatureError:
+        return False, None, 'Token expired'
+    except jwt.InvalidTokenError:
+        return False, None, 'Invalid token'
+    
+    if is_token_revoked(payload):
+        return False, None, 'Token revoked'
+    
+    return True, payload, None
+
+def create_auth_error(message: str, status_code: int = 401) -> Dict[str, Any]:
+    '''Create authentication error response'''
+    return {
+        'statusCode': status_code,
+        'headers': {
+            'Content-Type': 'application/json',
+            'Access-Control-Allow-Origin': '*'
+        },
+        'isBase64Encoded': False,
+        'body': json.dumps({'error': message, 'success': False})
+    }
+
+def is_admin(claims: Dict[str, Any]) -> bool:
+    return claims.get('role') == 'admin'
+
+def judges_tournament(claims: Dict[str, Any], tournament_id: Any) -> bool:
+    '''Admins manage every tournament, judges the ones listed in their judgeOf claim'''
+    if is_admin(claims):
+        return True
+    try:
+        return int(tournament_id) in (claims.get('judgeOf') or [])
+    except (TypeError, ValueError):
+        return False
+
+# Token revocation: bloom filter of revoked jti values plus an exact set of the latest ones
+REVOCATION_REFRESH_SECONDS = float(os.environ.get('REVOCATION_REFRESH_SECONDS', '15'))
+REVOCATION_REBUILD_SECONDS = 3600
+REVOCATION_RECENT_SIZE = 256
+BLOOM_BITS = 1 << 16
+BLOOM_HASHES = 7
+
+class BloomFilter:
+    '''Fixed-size bloom filter over strings using double hashing of a SHA-256 digest'''
+    def __init__(self, bits: int = BLOOM_BITS, hashes: int = BLOOM_HASHES):
+        self.bits = bits
+        self.hashes = hashes
+        self.array = bytearray(bits // 8)
+
+    def _positions(self, value: str) -> List[int]:
+        digest = hashlib.sha256(value.encode('utf-8')).digest()
+        first = int.from_bytes(digest[:8], 'big')
+        second = int.from_bytes(digest[8:16], 'big') | 1
+        return [(first + i * second) % self.bits for i in range(self.hashes)]
+
+    def add(self, value: str) -> None:
+        for position in self._positions(value):
+            self.array[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value: str) -> bool:
+        return all(self.array[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+_revocation_bloom = BloomFilter()
+_recent_revocations: 'OrderedDict[str, None]' = OrderedDict()
+_revocation_watermark: Optional[Any] = None
+_revocations_refreshed_at = float('-inf')
+_revocations_built_at = float('-inf')
+
+def remember_revocation(jti: str) -> None:
+    with _auth_lock:
+        _revocation_bloom.add(jti)
+        _recent_revocations[jti] = None
+        _recent_revocations.move_to_end(jti)
+        while len(_recent_revocations) > REVOCATION_RECENT_SIZE:
+            _recent_revocations.popitem(last=False)
+
+def refresh_revocations() -> None:
+    '''Pull revocations newer than the watermark; rebuild hourly so expired ids leave the filter'''
+    global _revocation_bloom, _revocation_watermark, _revocations_refreshed_at, _revocations_built_at
+    now = time.monotonic()
+    rebuild = now - _revocations_built_at > REVOCATION_REBUILD_SECONDS
+    watermark = None if rebuild else _revocation_watermark
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        # Overlap the watermark a little so revocations committed out of order are not skipped
+        cursor.execute("""
+            SELECT jti, revoked_at FROM t_p79348767_tournament_site_buil.revoked_tokens
+            WHERE expires_at > NOW()
+              AND (%s::timestamptz IS NULL OR revoked_at > %s::timestamptz - INTERVAL '5 seconds')
+            ORDER BY revoked_at
+        """, (watermark, watermark))
+        rows = cursor.fetchall()
+        cursor.close()
+    finally:
+        release_connection(conn)
+    
+    if rebuild:
+        with _auth_lock:
+            _revocation_bloom = BloomFilter()
+            _recent_revocations.clear()
+        _revocations_built_at = now
+    for jti, revoked_at in rows:
+        remember_revocation(jti)
+        watermark = revoked_at
+    _revocation_watermark = watermark
+    _revocations_refreshed_at = now
+
+def is_token_revoked(claims: Dict[str, Any]) -> bool:
+    '''Exact set and bloom filter answer locally; a bloom hit or a stale filter costs a database lookup'''
+    jti = claims.get('jti')
+    if not jti:
+        return False
+    if time.monotonic() - _revocations_refreshed_at > REVOCATION_REFRESH_SECONDS:
+        try:
+            refresh_revocations()
+        except Exception as e:
+            print(f'Revocation refresh failed: {str(e)}')
+    if jti in _recent_revocations:
+        return True
+    # A miss only proves "not revoked" while the filter is fresh; after a failed refresh check exactly (fail closed)
+    stale = time.monotonic() - _revocations_refreshed_at > REVOCATION_REFRESH_SECONDS
+    if jti not in _revocation_bloom and not stale:
+        return False
+    try:
+        conn = get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                'SELECT 1 FROM t_p79348767_tournament_site_buil.revoked_tokens WHERE jti = %s',
+                (jti,)
+            )
+            revoked = cursor.fetchone() is not None
+            cursor.close()
+        finally:
+            release_connection(conn)
+    except Exception:
+        return True
+    if revoked:
+        remember_revocation(jti)
+    return revoked
+
+# Reference data cache inline (shared module doesn't work in cloud functions)
+# Each warm instance keeps cities/formats/clubs until the TTL runs out. Writers bump the reference_versions
+# row and NOTIFY cache_invalidation at commit: long-lived runtimes (CACHE_LISTEN=1) evict on the notification,
+# short-lived instances fall back to comparing the cached version stamp with the row.
+REFERENCE_CACHE_TTL_SECONDS = float(os.environ.get('REFERENCE_CACHE_TTL_SECONDS', '300'))
+REFERENCE_VERSION_CHECK_SECONDS = float(os.environ.get('REFERENCE_VERSION_CHECK_SECONDS', '5'))
+CACHE_LISTEN = os.environ.get('CACHE_LISTEN') == '1'
+CACHE_CHANNEL = 'cache_invalidation'
+_reference_cache: Dict[str, Dict[str, Any]] = {}
+_published_versions: Dict[str, int] = {}
+_reference_lock = threading.Lock()
+_listener_healthy = threading.Event()
+
+def read_reference_version(cursor: Any, resource: str) -> int:
+    cursor.execute(
+        'SELECT version FROM t_p79348767_tournament_site_buil.reference_versions WHERE resource = %s',
+        (resource,)
+    )
+    row = cursor.fetchone()
+    return row[0] if row else 0
+
+def invalidate_reference(resource: str) -> None:
+    with _reference_lock:
+        _reference_cache.pop(resource, None)
+
+def bump_reference_version(cursor: Any, resource: str) -> int:
+    '''Publish a change: drop the local copy, bump the version and notify listening instances'''
+    cursor.execute('SELECT t_p79348767_tournament_site_buil.publish_invalidation(%s, NULL)', (resource,))
+    version = cursor.fetchone()[0]
+    invalidate_reference(resource)
+    return version
+
+def apply_invalidation(payload: str) -> None:
+    '''Evict the key a notification names ({"t": type, "id": id, "v": version}) unless the copy is newer'''
+    message = json.loads(payload)
+    key = message['t'] if message.get('id') is None else f"{message['t']}:{message['id']}"
+    with _reference_lock:
+        _published_versions[key] = max(_published_versions.get(key, 0), message['v'])
+        entry = _reference_cache.get(key)
+        if entry and entry['version'] < message['v']:
+            del _reference_cache[key]
+
+def listen_for_invalidations() -> None:
+    '''LISTEN on a dedicated connection; while it is up, cached entries skip the version check'''
+    while True:
+        conn = None
+        try:
+            conn = psycopg2.connect(os.environ['DATABASE_URL'])
+            conn.autocommit = True
+            cursor = conn.cursor()
+            cursor.execute(f'LISTEN {CACHE_CHANNEL}')
+            # Notifications sent while nobody listened are lost, so start over from empty caches
+            with _reference_lock:
+                _reference_cache.clear()
+            _listener_healthy.set()
+            while True:
+                if select.select([conn], [], [], 30) == ([], [], []):
+                    cursor.execute('SELECT 1')
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    apply_invalidation(conn.notifies.pop(0).payload)
+        except Exception as e:
+            _listener_healthy.clear()
+            print(f'Invalidation listener reconnecting: {str(e)}')
+            if conn is not None and not conn.closed:
+                conn.close()
+            time.sleep(1)
+
+def start_invalidation_listener() -> None:
+    threading.Thread(target=listen_for_invalidations, name='cache-invalidation', daemon=True).start()
+
+def cached_reference(cursor: Any, resource: str, loader: Callable[[Any], Any]) -> Tuple[Any, int]:
+    '''Cached value and its version; reloads after the TTL or when another instance published a newer version'''
+    now = time.monotonic()
+    with _reference_lock:
+        entry = _reference_cache.get(resource)
+    if entry and now - entry['loaded_at'] < REFERENCE_CACHE_TTL_SECONDS:
+        if _listener_healthy.is_set() or now - entry['checked_at'] < REFERENCE_VERSION_CHECK_SECONDS:
+            return entry['value'], entry['version']
+        if read_reference_version(cursor, resource) == entry['version']:
+            entry['checked_at'] = now
+            return entry['value'], entry['version']
+    # Version first: a write landing between the two reads only causes one extra reload later
+    version = read_reference_version(cursor, resource)
+    value = loader(cursor)
+    with _reference_lock:
+        # A notification newer than what we read arrived meanwhile: serve this copy but do not keep it
+        if _published_versions.get(resource, 0) <= version:
+            _reference_cache[resource] = {'value': value, 'version': version, 'loaded_at': now, 'checked_at': now}
+    return value, version
+
+if CACHE_LISTEN:
+    start_invalidation_listener()
+
+BOOTSTRAP_TOURNAMENTS_PAGE = int(os.environ.get('BOOTSTRAP_TOURNAMENTS_PAGE', '20'))
+# One worker per pooled connection, so every part runs on a connection the pool keeps
+BOOTSTRAP_WORKERS = max(1, DB_POOL_SIZE)
+_bootstrap_pool = None
+
+def load_cities(cursor: Any) -> List[Dict[str, Any]]:
+    cursor.execute('SELECT id, name, created_at FROM cities ORDER BY name')
+    return [{'id': str(row[0]), 'name': row[1], 'created_at': row[2].isoformat() if row[2] else None} for row in cursor.fetchall()]
+
+def load_formats(cursor: Any) -> List[Dict[str, Any]]:
+    cursor.execute('SELECT id, name, coefficient, created_at FROM tournament_formats ORDER BY name')
+    return [{'id': str(row[0]), 'name': row[1], 'coefficient': float(row[2]), 'created_at': row[3].isoformat() if row[3] else None} for row in cursor.fetchall()]
+
+def load_clubs(cursor: Any) -> List[Dict[str, Any]]:
+    cursor.execute('SELECT id, name, city, created_at FROM clubs ORDER BY name')
+    return [{
+        'id': row[0],
+        'name': row[1],
+        'city': row[2],
+        'created_at': row[3].isoformat() if row[3] else None
+    } for row in cursor.fetchall()]
+
+def load_current_user(cursor: Any, user_id: int) -> Optional[Dict[str, Any]]:
+    cursor.execute("""
+        SELECT id, username, name, role, city, is_active, rating, tournaments, wins, losses, draws, revision
+        FROM t_p79348767_tournament_site_buil.users
+        WHERE id = %s
+    """, (user_id,))
+    row = cursor.fetchone()
+    if not row:
+        return None
+    return {
+        'id': row[0],
+        'username': row[1],
+        'name': row[2],
+        'role': row[3],
+        'city': row[4],
+        'is_active': row[5],
+        'rating': row[6],
+        'tournaments': row[7],
+        'wins': row[8],
+        'losses': row[9],
+        'draws': row[10],
+        'revision': row[11]
+    }
+
+def load_tournaments_page(cursor: Any) -> Dict[str, Any]:
+    '''Newest tournaments in the tournaments GET shape, one row past the page to tell whether more exist'''
+    cursor.execute("""
+        SELECT t.id, t.name, t.format, t.status, t.swiss_rounds, t.top_rounds,
+               t.created_at, t.updated_at, t.city, t.club, t.tournament_date, t.is_rated, t.judge_id, p.participants, t.current_round, t.confirmed, p.dropped_players, t.t_seating, p.drop_rounds
+        FROM (
+            SELECT * FROM t_p79348767_tournament_site_buil.tournaments
+            WHERE deleted_at IS NULL
+            ORDER BY created_at DESC
+            LIMIT %s
+        ) t
+        LEFT JOIN t_p79348767_tournament_site_buil.tournament_participant_arrays p ON p.tournament_id = t.id
+        ORDER BY t.created_at DESC
+    """, (BOOTSTRAP_TOURNAMENTS_PAGE + 1,))
+    rows = cursor.fetchall()
+    tournaments = [{
+        'id': row[0],
+        'name': row[1],
+        'format': row[2],
+        'status': row[3],
+        'swiss_rounds': row[4],
+        'top_rounds': row[5],
+        'created_at': row[6].isoformat() if row[6] else None,
+        'updated_at': row[7].isoformat() if row[7] else None,
+        'city': row[8],
+        'club': row[9],
+        'tournament_date': row[10].isoformat() if row[10] else None,
+        'is_rated': row[11],
+        'judge_id': row[12],
+        'participants': row[13] if row[13] else [],
+        'current_round': row[14],
+        'confirmed': row[15],
+        'droppedPlayers': row[16] if row[16] else [],
+        'hasSeating': row[17],
+        'dropRounds': row[18] if row[18] else {}
+    } for row in rows[:BOOTSTRAP_TOURNAMENTS_PAGE]]
+    return {'items': tournaments, 'has_more': len(rows) > BOOTSTRAP_TOURNAMENTS_PAGE}
+
+def load_references(cursor: Any) -> Dict[str, Tuple[Any, int]]:
+    '''The three reference lists on one connection; they are version-checked cache hits most of the time'''
+    return {
+        'cities': cached_reference(cursor, 'cities', load_cities),
+        'formats': cached_reference(cursor, 'formats', load_formats),
+        'clubs': cached_reference(cursor, 'clubs', load_clubs)
+    }
+
+def run_query(loader: Callable[[Any], Any]) -> Any:
+    '''Run one loader on its own pooled connection so the bootstrap parts can go in parallel'''
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        try:
+            return loader(cursor)
+        finally:
+            cursor.close()
+    finally:
+        release_connection(conn)
+
+def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    '''
+    Business: Everything the app needs at startup in one call - cities, formats, clubs, current user, first page of tournaments
+    Args: event - dict with httpMethod, headers (optional X-Auth-Token, If-None-Match)
+          context - object with attributes: request_id, function_name
+    Returns: HTTP response with the combined payload and an ETag over all of its parts
+    '''
+    global _bootstrap_pool
+    method: str = event.get('httpMethod', 'GET')
+    
+    if is_warm_up(event):
+        return warm_up()
+    
+    if method == 'OPTIONS':
+        return {
+            'statusCode': 200,
+            'headers': {
+                'Access-Control-Allow-Origin': '*',
+                'Access-Control-Allow-Methods': 'GET, OPTIONS',
+                'Access-Control-Allow-Headers': 'Content-Type, X-Auth-Token, If-None-Match',
+                'Access-Control-Expose-Headers': 'ETag',
+                'Access-Control-Max-Age': '86400'
+            },
+            'isBase64Encoded': False,
+            'body': ''
+        }
+    
+    if method != 'GET':
+        return {
+            'statusCode': 405,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'isBase64Encoded': False,
+            'body': json.dumps({'error': 'Method not allowed'})
+        }
+    
+    headers = {key.lower(): value for key, value in (event.get('headers') or {}).items()}
+    # Anonymous visitors still get everything public; a bad token only drops the profile
+    claims = None
+    if headers.get('x-auth-token'):
+        is_valid, claims, _ = verify_token(event)
+        claims = claims if is_valid else None
+    
+    try:
+        if _bootstrap_pool is None:
+            from concurrent.futures import ThreadPoolExecutor
+            _bootstrap_pool = ThreadPoolExecutor(max_workers=BOOTSTRAP_WORKERS, thread_name_prefix='bootstrap')
+        
+        parts = {
+            'references': _bootstrap_pool.submit(run_query, load_references),
+            'tournaments': _bootstrap_pool.submit(run_query, load_tournaments_page)
+        }
+        if claims:
+            parts['user'] = _bootstrap_pool.submit(run_query, lambda cursor: load_current_user(cursor, claims['userId']))
+        results = {name: future.result() for name, future in parts.items()}
+    except Exception as e:
+        return {
+            'statusCode': 500,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'isBase64Encoded': False,
+            'body': json.dumps({'error': f'Bootstrap failed: {str(e)}'})
+        }
+    
+    references = results['references']
+    (cities, cities_version), (formats, formats_version), (clubs, clubs_version) = references['cities'], references['formats'], references['clubs']
+    user = results.get('user')
+    tournaments = results['tournaments']
+    tournaments_json = json.dumps(tournaments, sort_keys=True)
+    
+    # Versions stand in for the reference lists; the user row has its revision; the page is hashed as is
+    etag_source = '|'.join([
+        f'cities-{cities_version}', f'formats-{formats_version}', f'clubs-{clubs_version}',
+        f'user-{user["id"]}-{user["revision"]}' if user else 'anonymous',
+        hashlib.sha1(tournaments_json.encode('utf-8')).hexdigest()
+    ])
+    etag = '"' + hashlib.sha1(etag_source.encode('utf-8')).hexdigest() + '"'
+    response_headers = {
+        'Content-Type': 'application/json',
+        'Access-Control-Allow-Origin': '*',
+        'Access-Control-Expose-Headers': 'ETag',
+        'ETag': etag,
+        'Cache-Control': 'private, max-age=0, must-revalidate'
+    }
+    
+    if headers.get('if-none-match') == etag:
+        return {'statusCode': 304, 'headers': response_headers, 'isBase64Encoded': False, 'body': ''}
+    
+    return {
+        'statusCode': 200,
+        'headers': response_headers,
+        'isBase64Encoded': False,
+        'body': json.dumps({
+            'cities': cities,
+            'formats': formats,
+            'clubs': clubs,
+            'user': user,
+            'tournaments': tournaments
+        })
+    }
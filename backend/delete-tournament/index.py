@@ -1,20 +1,488 @@
 '''
-Business: Удаление турнира и всех его парингов (для администраторов и судей турнира)
-Args: event - dict с httpMethod, queryStringParameters (id) или body (tournament_id), headers (X-User-Id)
+Business: Удаление турнира (для администраторов и судей турнира): турнир сразу скрывается,
+          паринги и результаты удаляет пачками фоновая задача backend/jobs; GET ?job_id= показывает прогресс
+Args: event - dict с httpMethod, queryStringParameters (id или job_id) или body (tournament_id), headers (X-Auth-Token)
       context - object с атрибутами request_id, function_name
-Returns: HTTP response dict с результатом удаления
+Returns: HTTP response dict с задачей удаления или её прогрессом
 '''
 
 import json
 import os
-import psycopg2
-from typing import Dict, Any
+import hashlib
+import importlib
+import threading
+import re
+import time
+import random
+import functools
+from typing import Dict, Any, List, Optional, Tuple
+from collections import OrderedDict
 
+# Lazy imports and warm connections inline (shared module doesn't work in cloud functions)
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', '2'))
+DB_IDLE_PING_SECONDS = float(os.environ.get('DB_IDLE_PING_SECONDS', '30'))
+
+class LazyModule:
+    '''Defers importing a heavy dependency until its first attribute access'''
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def load(self) -> Any:
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.load(), attr)
+
+psycopg2 = LazyModule('psycopg2')
+jwt = LazyModule('jwt')
+_idle_connections: List[Tuple[Any, float]] = []
+_pool_lock = threading.Lock()
+
+def get_connection() -> Any:
+    '''Reuse an idle connection of this warm instance, pinging it after a long idle period'''
+    with _pool_lock:
+        conn, released_at = _idle_connections.pop() if _idle_connections else (None, 0.0)
+    if conn is not None and not conn.closed and time.monotonic() - released_at > DB_IDLE_PING_SECONDS:
+        try:
+            ping_cursor = conn.cursor()
+            ping_cursor.execute('SELECT 1')
+            ping_cursor.close()
+            conn.rollback()
+        except psycopg2.Error:
+            conn.close()
+    if conn is None or conn.closed:
+        conn = psycopg2.connect(os.environ['DATABASE_URL'])
+    return conn
+
+def release_connection(conn: Any) -> None:
+    '''Return a connection to the idle pool in a clean transaction state'''
+    if conn.closed:
+        return
+    try:
+        if conn.autocommit:
+            conn.autocommit = False
+        else:
+            conn.rollback()
+    except psycopg2.Error:
+        conn.close()
+        return
+    with _pool_lock:
+        if len(_idle_connections) < DB_POOL_SIZE:
+            _idle_connections.append((conn, time.monotonic()))
+            return
+    conn.close()
+
+def is_warm_up(event: Dict[str, Any]) -> bool:
+    return bool(event.get('warmup')) or event.get('httpMethod') == 'WARMUP'
+
+def warm_up() -> Dict[str, Any]:
+    '''Init phase: import heavy modules and fill the idle pool before real traffic arrives'''
+    started = time.perf_counter()
+    for module in (psycopg2, jwt):
+        module.load()
+    warmed = 0
+    if os.environ.get('DATABASE_URL'):
+        connections = [get_connection() for _ in range(DB_POOL_SIZE)]
+        for conn in connections:
+            release_connection(conn)
+        warmed = len(connections)
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json'},
+        'isBase64Encoded': False,
+        'body': json.dumps({'warm': True, 'connections': warmed, 'ms': round((time.perf_counter() - started) * 1000, 1)})
+    }
+
+if os.environ.get('PREWARM_ON_IMPORT') == '1':
+    warm_up()
+
+# Auth inline (shared module doesn't work in cloud functions); scripts/check_inline.py keeps copies identical
+AUTH_CACHE_SIZE = int(os.environ.get('AUTH_CACHE_SIZE', '1024'))
+_verified_tokens: 'OrderedDict[bytes, Tuple[Dict[str, Any], float]]' = OrderedDict()
+_auth_lock = threading.Lock()
+
+def get_jwt_secret() -> Optional[str]:
+    return os.environ.get('JWT_SECRET')
+
+def decode_token(token: str) -> Dict[str, Any]:
+    '''HS256 verification memoized by token digest until the token expires (bounded LRU)'''
+    digest = hashlib.sha256(token.encode('utf-8')).digest()
+    now = time.time()
+    with _auth_lock:
+        cached = _verified_tokens.get(digest)
+        if cached is not None:
+            if cached[1] > now:
+                _verified_tokens.move_to_end(digest)
+                return cached[0]
+            del _verified_tokens[digest]
+    payload = jwt.decode(token, get_jwt_secret(), algorithms=['HS256'])
+    with _auth_lock:
+        _verified_tokens[digest] = (payload, float(payload.get('exp', now + 60)))
+        while len(_verified_tokens) > AUTH_CACHE_SIZE:
+            _verified_tokens.popitem(last=False)
+    return payload
+
+def verify_token(event: Dict[str, Any]) -> Tuple[bool, Optional[Dict], Optional[str]]:
+    '''Verify JWT token from request headers'''
+    headers = event.get('headers') or {}
+    token = headers.get('x-auth-token') or headers.get('X-Auth-Token')
+    
+    if not token:
+        return False, None, 'Missing authentication token'
+    
+    if not get_jwt_secret():
+        return False, None, 'Server configuration error'
+    
+    try:
+        payload = decode_token(token)
+    except jwt.ExpiredSignatureError:
+        return False, None, 'Token expired'
+    except jwt.InvalidTokenError:
+        return False, None, 'Invalid token'
+    
+    if is_token_revoked(payload):
+        return False, None, 'Token revoked'
+    
+    return True, payload, None
+
+def create_auth_error(message: str, status_code: int = 401) -> Dict[str, Any]:
+    '''Create authentication error response'''
+    return {
+        'statusCode': status_code,
+        'headers': {
+            'Content-Type': 'application/json',
+            'Access-Control-Allow-Origin': '*'
+        },
+        'isBase64Encoded': False,
+        'body': json.dumps({'error': message, 'success': False})
+    }
+
+def is_admin(claims: Dict[str, Any]) -> bool:
+    return claims.get('role') == 'admin'
+
+def judges_tournament(claims: Dict[str, Any], tournament_id: Any) -> bool:
+    '''Admins manage every tournament, judges the ones listed in their judgeOf claim'''
+    if is_admin(claims):
+        return True
+    try:
+        return int(tournament_id) in (claims.get('judgeOf') or [])
+    except (TypeError, ValueError):
+        return False
+
+# Token revocation: bloom filter of revoked jti values plus an exact set of the latest ones
+REVOCATION_REFRESH_SECONDS = float(os.environ.get('REVOCATION_REFRESH_SECONDS', '15'))
+REVOCATION_REBUILD_SECONDS = 3600
+REVOCATION_RECENT_SIZE = 256
+BLOOM_BITS = 1 << 16
+BLOOM_HASHES = 7
+
+class BloomFilter:
+    '''Fixed-size bloom filter over strings using double hashing of a SHA-256 digest'''
+    def __init__(self, bits: int = BLOOM_BITS, hashes: int = BLOOM_HASHES):
+        self.bits = bits
+        self.hashes = hashes
+        self.array = bytearray(bits // 8)
+
+    def _positions(self, value: str) -> List[int]:
+        digest = hashlib.sha256(value.encode('utf-8')).digest()
+        first = int.from_bytes(digest[:8], 'big')
+        second = int.from_bytes(digest[8:16], 'big') | 1
+        return [(first + i * second) % self.bits for i in range(self.hashes)]
+
+    def add(self, value: str) -> None:
+        for position in self._positions(value):
+            self.array[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value: str) -> bool:
+        return all(self.array[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+_revocation_bloom = BloomFilter()
+_recent_revocations: 'OrderedDict[str, None]' = OrderedDict()
+_revocation_watermark: Optional[Any] = None
+_revocations_refreshed_at = float('-inf')
+_revocations_built_at = float('-inf')
+
+def remember_revocation(jti: str) -> None:
+    with _auth_lock:
+        _revocation_bloom.add(jti)
+        _recent_revocations[jti] = None
+        _recent_revocations.move_to_end(jti)
+        while len(_recent_revocations) > REVOCATION_RECENT_SIZE:
+            _recent_revocations.popitem(last=False)
+
+def refresh_revocations() -> None:
+    '''Pull revocations newer than the watermark; rebuild hourly so expired ids leave the filter'''
+    global _revocation_bloom, _revocation_watermark, _revocations_refreshed_at, _revocations_built_at
+    now = time.monotonic()
+    rebuild = now - _revocations_built_at > REVOCATION_REBUILD_SECONDS
+    watermark = None if rebuild else _revocation_watermark
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        # Overlap the watermark a little so revocations committed out of order are not skipped
+        cursor.execute("""
+            SELECT jti, revoked_at FROM t_p79348767_tournament_site_buil.revoked_tokens
+            WHERE expires_at > NOW()
+              AND (%s::timestamptz IS NULL OR revoked_at > %s::timestamptz - INTERVAL '5 seconds')
+            ORDER BY revoked_at
+        """, (watermark, watermark))
+        rows = cursor.fetchall()
+        cursor.close()
+    finally:
+        release_connection(conn)
+    
+    if rebuild:
+        with _auth_lock:
+            _revocation_bloom = BloomFilter()
+            _recent_revocations.clear()
+        _revocations_built_at = now
+    for jti, revoked_at in rows:
+        remember_revocation(jti)
+        watermark = revoked_at
+    _revocation_watermark = watermark
+    _revocations_refreshed_at = now
+
+def is_token_revoked(claims: Dict[str, Any]) -> bool:
+    '''Exact set and bloom filter answer locally; a bloom hit or a stale filter costs a database lookup'''
+    jti = claims.get('jti')
+    if not jti:
+        return False
+    if time.monotonic() - _revocations_refreshed_at > REVOCATION_REFRESH_SECONDS:
+        try:
+            refresh_revocations()
+        except Exception as e:
+            print(f'Revocation refresh failed: {str(e)}')
+    if jti in _recent_revocations:
+        return True
+    # A miss only proves "not revoked" while the filter is fresh; after a failed refresh check exactly (fail closed)
+    stale = time.monotonic() - _revocations_refreshed_at > REVOCATION_REFRESH_SECONDS
+    if jti not in _revocation_bloom and not stale:
+        return False
+    try:
+        conn = get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                'SELECT 1 FROM t_p79348767_tournament_site_buil.revoked_tokens WHERE jti = %s',
+                (jti,)
+            )
+            revoked = cursor.fetchone() is not None
+            cursor.close()
+        finally:
+            release_connection(conn)
+    except Exception:
+        return True
+    if revoked:
+        remember_revocation(jti)
+    return revoked
+
+# Slow-query capture inline (shared module doesn't work in cloud functions)
+SQL_STATS_SAMPLE_RATE = float(os.environ.get('SQL_STATS_SAMPLE_RATE', '0'))
+SQL_SLOW_MS = float(os.environ.get('SQL_SLOW_MS', '200'))
+SQL_STATS_MAX_SAMPLES = 500
+
+_SQL_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b|(?i:\btrue\b|\bfalse\b)")
+_SQL_LIST_RE = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+_sql_stats: Dict[str, Dict[str, Any]] = {}
+_sql_trace: List[Dict[str, Any]] = []
+_sql_sampling = False
+
+def fingerprint_sql(query: str) -> str:
+    '''Normalize SQL so f-string variants of one statement share a fingerprint'''
+    normalized = _SQL_LITERAL_RE.sub('?', query)
+    normalized = _SQL_LIST_RE.sub('(?+)', normalized)
+    return ' '.join(normalized.split())
+
+def explain_sql(cursor: Any, query: Any, params: Any) -> Optional[Any]:
+    '''Capture EXPLAIN plan for a slow statement without disturbing the caller's transaction'''
+    text = query.decode('utf-8') if isinstance(query, bytes) else str(query)
+    if text.lstrip().split(' ', 1)[0].upper() not in ('SELECT', 'WITH', 'INSERT', 'UPDATE', 'DELETE'):
+        return None
+    conn = cursor.connection
+    explain_cursor = conn.cursor()
+    try:
+        if not conn.autocommit:
+            explain_cursor.execute('SAVEPOINT sql_stats_explain')
+        explain_cursor.execute('EXPLAIN (FORMAT JSON) ' + text, params)
+        plan = explain_cursor.fetchone()[0]
+        if not conn.autocommit:
+            explain_cursor.execute('RELEASE SAVEPOINT sql_stats_explain')
+        return plan
+    except psycopg2.Error:
+        if not conn.autocommit:
+            explain_cursor.execute('ROLLBACK TO SAVEPOINT sql_stats_explain')
+        return None
+    finally:
+        explain_cursor.close()
+
+def record_sql(cursor: Any, query: Any, params: Any, duration_ms: float) -> None:
+    '''Add one statement execution to the per-fingerprint distributions'''
+    text = query.decode('utf-8') if isinstance(query, bytes) else str(query)
+    fingerprint = fingerprint_sql(text)
+    rows = max(cursor.rowcount, 0)
+    entry = _sql_stats.setdefault(fingerprint, {'calls': 0, 'total_ms': 0.0, 'durations': [], 'rows': [], 'explain': None})
+    entry['calls'] += 1
+    entry['total_ms'] += duration_ms
+    if len(entry['durations']) < SQL_STATS_MAX_SAMPLES:
+        entry['durations'].append(duration_ms)
+        entry['rows'].append(rows)
+    else:
+        slot = random.randrange(entry['calls'])
+        if slot < SQL_STATS_MAX_SAMPLES:
+            entry['durations'][slot] = duration_ms
+            entry['rows'][slot] = rows
+    trace_item: Dict[str, Any] = {'fingerprint': fingerprint, 'ms': round(duration_ms, 2), 'rows': rows}
+    if duration_ms >= SQL_SLOW_MS:
+        plan = explain_sql(cursor, query, params)
+        if plan is not None:
+            entry['explain'] = plan
+            trace_item['explain'] = plan
+    _sql_trace.append(trace_item)
+
+_stats_cursor_class = None
+
+def stats_cursor_class() -> Any:
+    '''Cursor class that records duration and row count of every statement (built lazily with psycopg2)'''
+    global _stats_cursor_class
+    if _stats_cursor_class is None:
+        class StatsCursor(psycopg2.extensions.cursor):
+            def execute(self, query, vars=None):
+                started = time.perf_counter()
+                result = super().execute(query, vars)
+                record_sql(self, query, vars, (time.perf_counter() - started) * 1000)
+                return result
+        _stats_cursor_class = StatsCursor
+    return _stats_cursor_class
+
+def open_cursor(conn: Any) -> Any:
+    '''Open a cursor, instrumented only when the current invocation is sampled'''
+    if _sql_sampling:
+        return conn.cursor(cursor_factory=stats_cursor_class())
+    return conn.cursor()
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[int(round(q * (len(ordered) - 1)))] if ordered else 0.0
+
+def sql_stats_report(limit: int = 10) -> List[Dict[str, Any]]:
+    '''Top-N fingerprints by total DB time collected in this instance'''
+    grand_total = sum(entry['total_ms'] for entry in _sql_stats.values()) or 1.0
+    ranked = sorted(_sql_stats.items(), key=lambda item: item[1]['total_ms'], reverse=True)
+    return [{
+        'fingerprint': fingerprint,
+        'calls': entry['calls'],
+        'total_ms': round(entry['total_ms'], 2),
+        'share': round(entry['total_ms'] / grand_total, 4),
+        'mean_ms': round(entry['total_ms'] / entry['calls'], 2),
+        'p50_ms': round(_percentile(entry['durations'], 0.5), 2),
+        'p95_ms': round(_percentile(entry['durations'], 0.95), 2),
+        'max_ms': round(max(entry['durations']), 2),
+        'rows_mean': round(sum(entry['rows']) / len(entry['rows']), 1),
+        'rows_max': max(entry['rows']),
+        'explain': entry['explain']
+    } for fingerprint, entry in ranked[:limit]]
+
+def with_sql_stats(func):
+    '''Sample handler invocations and log their statements as one SQL_STATS line'''
+    @functools.wraps(func)
+    def wrapper(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+        global _sql_sampling
+        _sql_sampling = SQL_STATS_SAMPLE_RATE > 0 and random.random() < SQL_STATS_SAMPLE_RATE
+        if not _sql_sampling:
+            return func(event, context)
+        _sql_trace.clear()
+        try:
+            return func(event, context)
+        finally:
+            _sql_sampling = False
+            print('SQL_STATS ' + json.dumps({
+                'function': getattr(context, 'function_name', None),
+                'request_id': getattr(context, 'request_id', None),
+                'statements': _sql_trace
+            }, default=str))
+    return wrapper
+
+# Job queue inline (shared module doesn't work in cloud functions); workers live in backend/jobs
+JOB_MAX_ATTEMPTS = int(os.environ.get('JOB_MAX_ATTEMPTS', '5'))
+
+def enqueue_job(cur: Any, kind: str, payload: Dict[str, Any], serialization_key: Optional[str] = None) -> int:
+    '''Queue a job; an identical one still waiting in the queue is reused instead of piling up duplicates'''
+    encoded = json.dumps(payload, sort_keys=True)
+    cur.execute("""
+        SELECT id FROM t_p79348767_tournament_site_buil.jobs
+        WHERE kind = %s AND status = 'queued' AND payload = %s::jsonb
+          AND serialization_key IS NOT DISTINCT FROM %s
+        ORDER BY id
+        LIMIT 1
+    """, (kind, encoded, serialization_key))
+    row = cur.fetchone()
+    if row:
+        return row[0]
+    cur.execute("""
+        INSERT INTO t_p79348767_tournament_site_buil.jobs (kind, payload, serialization_key, max_attempts)
+        VALUES (%s, %s::jsonb, %s, %s)
+        RETURNING id
+    """, (kind, encoded, serialization_key, JOB_MAX_ATTEMPTS))
+    return cur.fetchone()[0]
+
+def read_job(cur: Any, job_id: int) -> Optional[Dict[str, Any]]:
+    '''Status, progress and result of one job in API shape'''
+    cur.execute("""
+        SELECT id, kind, status, progress, result, attempts, last_error, run_after, created_at, finished_at
+        FROM t_p79348767_tournament_site_buil.jobs
+        WHERE id = %s
+    """, (job_id,))
+    row = cur.fetchone()
+    if not row:
+        return None
+    return {
+        'job_id': row[0],
+        'kind': row[1],
+        'status': row[2],
+        'progress': row[3],
+        'result': row[4],
+        'attempts': row[5],
+        'last_error': row[6],
+        'run_after': row[7].isoformat() if row[7] else None,
+        'created_at': row[8].isoformat() if row[8] else None,
+        'finished_at': row[9].isoformat() if row[9] else None
+    }
+
+def can_manage_tournament(cursor: Any, claims: Dict[str, Any], tournament_id: int) -> bool:
+    '''Admin or the tournament's judge; judgeOf may lag behind a fresh assignment, so fall back to the row'''
+    if judges_tournament(claims, tournament_id):
+        return True
+    if claims.get('role') != 'judge':
+        return False
+    cursor.execute(
+        'SELECT judge_id FROM t_p79348767_tournament_site_buil.tournaments WHERE id = %s',
+        (tournament_id,)
+    )
+    row = cursor.fetchone()
+    return bool(row) and row[0] == claims.get('userId')
+
+def json_response(status_code: int, payload: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'statusCode': status_code,
+        'headers': {
+            'Content-Type': 'application/json',
+            'Access-Control-Allow-Origin': '*'
+        },
+        'isBase64Encoded': False,
+        'body': json.dumps(payload, default=str)
+    }
+
+@with_sql_stats
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     method: str = event.get('httpMethod', 'GET')
     
+    if is_warm_up(event):
+        return warm_up()
+    
     print(f'🔍 DELETE tournament request: method={method}')
-    print(f'📋 Headers: {event.get("headers", {})}')
     print(f'📋 Query params: {event.get("queryStringParameters", {})}')
     
     # Handle CORS OPTIONS request
@@ -23,43 +491,46 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             'statusCode': 200,
             'headers': {
                 'Access-Control-Allow-Origin': '*',
-                'Access-Control-Allow-Methods': 'DELETE, OPTIONS',
-                'Access-Control-Allow-Headers': 'Content-Type, X-User-Id, X-Auth-Token',
+                'Access-Control-Allow-Methods': 'GET, DELETE, OPTIONS',
+                'Access-Control-Allow-Headers': 'Content-Type, X-Auth-Token',
                 'Access-Control-Max-Age': '86400'
             },
             'body': ''
         }
     
-    if method != 'DELETE':
-        return {
-            'statusCode': 405,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
-            'isBase64Encoded': False,
-            'body': json.dumps({'error': 'Method not allowed'})
-        }
+    if method not in ['GET', 'DELETE']:
+        return json_response(405, {'error': 'Method not allowed'})
     
-    # Получаем user_id из заголовков
-    headers = event.get('headers', {})
-    user_id = headers.get('x-user-id') or headers.get('X-User-Id')
+    # Роль и назначения судьи берём из claims токена
+    is_valid, user_data, error_msg = verify_token(event)
+    if not is_valid:
+        return create_auth_error(error_msg or 'Unauthorized')
     
-    print(f'👤 User ID from headers: {user_id}')
+    user_id = user_data.get('userId')
+    print(f'👤 User ID from token: {user_id}')
     
-    if not user_id:
-        return {
-            'statusCode': 401,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
-            'isBase64Encoded': False,
-            'body': json.dumps({'error': 'Unauthorized'})
-        }
+    query_params = event.get('queryStringParameters', {}) or {}
+    
+    # Прогресс фоновой очистки
+    if method == 'GET':
+        if user_data.get('role') not in ['admin', 'judge']:
+            return create_auth_error('Insufficient permissions', 403)
+        try:
+            job_id = int(query_params.get('job_id'))
+        except (TypeError, ValueError):
+            return json_response(400, {'error': 'job_id is required'})
+        conn = get_connection()
+        cur = open_cursor(conn)
+        try:
+            job = read_job(cur, job_id)
+        finally:
+            cur.close()
+            release_connection(conn)
+        if not job or job['kind'] != 'purge-tournament':
+            return json_response(404, {'error': 'Job not found'})
+        return json_response(200, job)
     
     # Получаем tournament_id из query параметров или body
-    query_params = event.get('queryStringParameters', {}) or {}
     tournament_id = query_params.get('id')
     
     if not tournament_id:
@@ -69,100 +540,47 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             body_data = json.loads(body_str)
             tournament_id = body_data.get('tournament_id')
     
-    if not tournament_id:
-        return {
-            'statusCode': 400,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
-            'isBase64Encoded': False,
-            'body': json.dumps({'error': 'tournament_id is required'})
-        }
-    
-    # Подключение к БД
-    dsn = os.environ.get('DATABASE_URL')
-    conn = psycopg2.connect(dsn)
-    cur = conn.cursor()
+    try:
+        tournament_id = int(tournament_id)
+    except (TypeError, ValueError):
+        tournament_id = None
     
-    # Проверка прав пользователя (администратор или судья турнира)
-    cur.execute(
-        f"SELECT role FROM t_p79348767_tournament_site_buil.users WHERE id = {user_id}"
-    )
-    result = cur.fetchone()
+    if not tournament_id:
+        return json_response(400, {'error': 'tournament_id is required'})
     
-    if not result:
-        cur.close()
-        conn.close()
-        return {
-            'statusCode': 403,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
-            'isBase64Encoded': False,
-            'body': json.dumps({'error': 'User not found'})
-        }
+    forbidden = json_response(403, {'error': 'Only tournament judge or administrator can delete this tournament'})
     
-    user_role = result[0]
+    # Игроки не могут удалять турниры - отказываем без обращения к БД
+    if not judges_tournament(user_data, tournament_id) and user_data.get('role') != 'judge':
+        return forbidden
     
-    # Если не админ, проверяем что пользователь - судья этого турнира
-    if user_role != 'admin':
-        cur.execute(
-            f"SELECT judge_id FROM t_p79348767_tournament_site_buil.tournaments WHERE id = {tournament_id}"
-        )
-        tournament_result = cur.fetchone()
+    # Подключение к БД
+    conn = get_connection()
+    cur = open_cursor(conn)
+    try:
+        # Судья, назначенный после выдачи токена, ещё не попал в judgeOf - сверяем с турниром
+        if not can_manage_tournament(cur, user_data, tournament_id):
+            return forbidden
         
-        if not tournament_result or tournament_result[0] != int(user_id):
-            cur.close()
-            conn.close()
-            return {
-                'statusCode': 403,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*'
-                },
-                'isBase64Encoded': False,
-                'body': json.dumps({'error': 'Only tournament judge or administrator can delete this tournament'})
-            }
-    
-    # Удаление результатов турнира
-    cur.execute(
-        f"DELETE FROM t_p79348767_tournament_site_buil.tournament_results WHERE tournament_id = {tournament_id}"
-    )
-    print(f'✅ Deleted tournament_results for tournament {tournament_id}')
-    
-    # Удаление парингов турнира
-    cur.execute(
-        f"DELETE FROM t_p79348767_tournament_site_buil.games WHERE tournament_id = {tournament_id}"
-    )
-    print(f'✅ Deleted games for tournament {tournament_id}')
-    
-    # Удаление игроков турнира
-    cur.execute(
-        f"DELETE FROM t_p79348767_tournament_site_buil.players WHERE tournament_id = {tournament_id}"
-    )
-    print(f'✅ Deleted players for tournament {tournament_id}')
-    
-    # Удаление турнира
-    cur.execute(
-        f"DELETE FROM t_p79348767_tournament_site_buil.tournaments WHERE id = {tournament_id}"
-    )
-    print(f'✅ Deleted tournament {tournament_id}')
-    
-    conn.commit()
-    cur.close()
-    conn.close()
+        # Мягкое удаление: турнир сразу пропадает из списков, строки удалит фоновая задача
+        cur.execute("""
+            UPDATE t_p79348767_tournament_site_buil.tournaments
+            SET deleted_at = COALESCE(deleted_at, NOW())
+            WHERE id = %s
+            RETURNING id
+        """, (tournament_id,))
+        if not cur.fetchone():
+            return json_response(404, {'error': 'Tournament not found'})
+        
+        job_id = enqueue_job(cur, 'purge-tournament', {'tournament_id': tournament_id}, f'tournament:{tournament_id}')
+        conn.commit()
+        print(f'✅ Tournament {tournament_id} hidden, purge job {job_id} queued')
+    finally:
+        cur.close()
+        release_connection(conn)
     
-    return {
-        'statusCode': 200,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*'
-        },
-        'isBase64Encoded': False,
-        'body': json.dumps({
-            'success': True,
-            'message': f'Tournament {tournament_id} and all its games deleted successfully'
-        })
-    }
\ No newline at end of file
+    return json_response(202, {
+        'success': True,
+        'job_id': job_id,
+        'message': f'Tournament {tournament_id} deleted; games and results are being purged in the background'
+    })
@@ -1,8 +1,503 @@
 import json
 import os
-import psycopg2
-from typing import Dict, Any
+import hashlib
+import importlib
+import threading
+import select
+import re
+import time
+import random
+import functools
+from typing import Dict, Any, List, Optional, Tuple, Callable
+from collections import OrderedDict
 
+# Lazy imports and warm connections inline (shared module doesn't work in cloud functions)
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', '2'))
+DB_IDLE_PING_SECONDS = float(os.environ.get('DB_IDLE_PING_SECONDS', '30'))
+
+class LazyModule:
+    '''Defers importing a heavy dependency until its first attribute access'''
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def load(self) -> Any:
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.load(), attr)
+
+psycopg2 = LazyModule('psycopg2')
+jwt = LazyModule('jwt')
+_idle_connections: List[Tuple[Any, float]] = []
+_pool_lock = threading.Lock()
+
+def get_connection() -> Any:
+    '''Reuse an idle connection of this warm instance, pinging it after a long idle period'''
+    with _pool_lock:
+        conn, released_at = _idle_connections.pop() if _idle_connections else (None, 0.0)
+    if conn is not None and not conn.closed and time.monotonic() - released_at > DB_IDLE_PING_SECONDS:
+        try:
+            ping_cursor = conn.cursor()
+            ping_cursor.execute('SELECT 1')
+            ping_cursor.close()
+            conn.rollback()
+        except psycopg2.Error:
+            conn.close()
+    if conn is None or conn.closed:
+        conn = psycopg2.connect(os.environ['DATABASE_URL'])
+    return conn
+
+def release_connection(conn: Any) -> None:
+    '''Return a connection to the idle pool in a clean transaction state'''
+    if conn.closed:
+        return
+    try:
+        if conn.autocommit:
+            conn.autocommit = False
+        else:
+            conn.rollback()
+    except psycopg2.Error:
+        conn.close()
+        return
+    with _pool_lock:
+        if len(_idle_connections) < DB_POOL_SIZE:
+            _idle_connections.append((conn, time.monotonic()))
+            return
+    conn.close()
+
+def is_warm_up(event: Dict[str, Any]) -> bool:
+    return bool(event.get('warmup')) or event.get('httpMethod') == 'WARMUP'
+
+def warm_up() -> Dict[str, Any]:
+    '''Init phase: import heavy modules and fill the idle pool before real traffic arrives'''
+    started = time.perf_counter()
+    for module in (psycopg2, jwt):
+        module.load()
+    warmed = 0
+    if os.environ.get('DATABASE_URL'):
+        connections = [get_connection() for _ in range(DB_POOL_SIZE)]
+        for conn in connections:
+            release_connection(conn)
+        warmed = len(connections)
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json'},
+        'isBase64Encoded': False,
+        'body': json.dumps({'warm': True, 'connections': warmed, 'ms': round((time.perf_counter() - started) * 1000, 1)})
+    }
+
+if os.environ.get('PREWARM_ON_IMPORT') == '1':
+    warm_up()
+
+# Auth inline (shared module doesn't work in cloud functions); scripts/check_inline.py keeps copies identical
+AUTH_CACHE_SIZE = int(os.environ.get('AUTH_CACHE_SIZE', '1024'))
+_verified_tokens: 'OrderedDict[bytes, Tuple[Dict[str, Any], float]]' = OrderedDict()
+_auth_lock = threading.Lock()
+
+def get_jwt_secret() -> Optional[str]:
+    return os.environ.get('JWT_SECRET')
+
+def decode_token(token: str) -> Dict[str, Any]:
+    '''HS256 verification memoized by token digest until the token expires (bounded LRU)'''
+    digest = hashlib.sha256(token.encode('utf-8')).digest()
+    now = time.time()
+    with _auth_lock:
+        cached = _verified_tokens.get(digest)
+        if cached is not None:
+            if cached[1] > now:
+                _verified_tokens.move_to_end(digest)
+                return cached[0]
+            del _verified_tokens[digest]
+    payload = jwt.decode(token, get_jwt_secret(), algorithms=['HS256'])
+    with _auth_lock:
+        _verified_tokens[digest] = (payload, float(payload.get('exp', now + 60)))
+        while len(_verified_tokens) > AUTH_CACHE_SIZE:
+            _verified_tokens.popitem(last=False)
+    return payload
+
+def verify_token(event: Dict[str, Any]) -> Tuple[bool, Optional[Dict], Optional[str]]:
+    '''Verify JWT token from request headers'''
+    headers = event.get('headers') or {}
+    token = headers.get('x-auth-token') or headers.get('X-Auth-Token')
+    
+    if not token:
+        return False, None, 'Missing authentication token'
+    
+    if not get_jwt_secret():
+        return False, None, 'Server configuration error'
+    
+    try:
+        payload = decode_token(token)
+    except jwt.ExpiredSignatureError:
+        return False, None, 'Token expired'
+    except jwt.InvalidTokenError:
+        return False, None, 'Invalid token'
+    
+    if is_token_revoked(payload):
+        return False, None, 'Token revoked'
+    
+    return True, payload, None
+
+def create_auth_error(message: str, status_code: int = 401) -> Dict[str, Any]:
+    '''Create authentication error response'''
+    return {
+        'statusCode': status_code,
+        'headers': {
+            'Content-Type': 'application/json',
+            'Access-Control-Allow-Origin': '*'
+        },
+        'isBase64Encoded': False,
+        'body': json.dumps({'error': message, 'success': False})
+    }
+
+def is_admin(claims: Dict[str, Any]) -> bool:
+    return claims.get('role') == 'admin'
+
+def judges_tournament(claims: Dict[str, Any], tournament_id: Any) -> bool:
+    '''Admins manage every tournament, judges the ones listed in their judgeOf claim'''
+    if is_admin(claims):
+        return True
+    try:
+        return int(tournament_id) in (claims.get('judgeOf') or [])
+    except (TypeError, ValueError):
+        return False
+
+# Token revocation: bloom filter of revoked jti values plus an exact set of the latest ones
+REVOCATION_REFRESH_SECONDS = float(os.environ.get('REVOCATION_REFRESH_SECONDS', '15'))
+REVOCATION_REBUILD_SECONDS = 3600
+REVOCATION_RECENT_SIZE = 256
+BLOOM_BITS = 1 << 16
+BLOOM_HASHES = 7
+
+class BloomFilter:
+    '''Fixed-size bloom filter over strings using double hashing of a SHA-256 digest'''
+    def __init__(self, bits: int = BLOOM_BITS, hashes: int = BLOOM_HASHES):
+        self.bits = bits
+        self.hashes = hashes
+        self.array = bytearray(bits // 8)
+
+    def _positions(self, value: str) -> List[int]:
+        digest = hashlib.sha256(value.encode('utf-8')).digest()
+        first = int.from_bytes(digest[:8], 'big')
+        second = int.from_bytes(digest[8:16], 'big') | 1
+        return [(first + i * second) % self.bits for i in range(self.hashes)]
+
+    def add(self, value: str) -> None:
+        for position in self._positions(value):
+            self.array[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value: str) -> bool:
+        return all(self.array[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+_revocation_bloom = BloomFilter()
+_recent_revocations: 'OrderedDict[str, None]' = OrderedDict()
+_revocation_watermark: Optional[Any] = None
+_revocations_refreshed_at = float('-inf')
+_revocations_built_at = float('-inf')
+
+def remember_revocation(jti: str) -> None:
+    with _auth_lock:
+        _revocation_bloom.add(jti)
+        _recent_revocations[jti] = None
+        _recent_revocations.move_to_end(jti)
+        while len(_recent_revocations) > REVOCATION_RECENT_SIZE:
+            _recent_revocations.popitem(last=False)
+
+def refresh_revocations() -> None:
+    '''Pull revocations newer than the watermark; rebuild hourly so expired ids leave the filter'''
+    global _revocation_bloom, _revocation_watermark, _revocations_refreshed_at, _revocations_built_at
+    now = time.monotonic()
+    rebuild = now - _revocations_built_at > REVOCATION_REBUILD_SECONDS
+    watermark = None if rebuild else _revocation_watermark
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        # Overlap the watermark a little so revocations committed out of order are not skipped
+        cursor.execute("""
+            SELECT jti, revoked_at FROM t_p79348767_tournament_site_buil.revoked_tokens
+            WHERE expires_at > NOW()
+              AND (%s::timestamptz IS NULL OR revoked_at > %s::timestamptz - INTERVAL '5 seconds')
+            ORDER BY revoked_at
+        """, (watermark, watermark))
+        rows = cursor.fetchall()
+        cursor.close()
+    finally:
+        release_connection(conn)
+    
+    if rebuild:
+        with _auth_lock:
+            _revocation_bloom = BloomFilter()
+            _recent_revocations.clear()
+        _revocations_built_at = now
+    for jti, revoked_at in rows:
+        remember_revocation(jti)
+        watermark = revoked_at
+    _revocation_watermark = watermark
+    _revocations_refreshed_at = now
+
+def is_token_revoked(claims: Dict[str, Any]) -> bool:
+    '''Exact set and bloom filter answer locally; a bloom hit or a stale filter costs a database lookup'''
+    jti = claims.get('jti')
+    if not jti:
+        return False
+    if time.monotonic() - _revocations_refreshed_at > REVOCATION_REFRESH_SECONDS:
+        try:
+            refresh_revocations()
+        except Exception as e:
+            print(f'Revocation refresh failed: {str(e)}')
+    if jti in _recent_revocations:
+        return True
+    # A miss only proves "not revoked" while the filter is fresh; after a failed refresh check exactly (fail closed)
+    stale = time.monotonic() - _revocations_refreshed_at > REVOCATION_REFRESH_SECONDS
+    if jti not in _revocation_bloom and not stale:
+        return False
+    try:
+        conn = get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                'SELECT 1 FROM t_p79348767_tournament_site_buil.revoked_tokens WHERE jti = %s',
+                (jti,)
+            )
+            revoked = cursor.fetchone() is not None
+            cursor.close()
+        finally:
+            release_connection(conn)
+    except Exception:
+        return True
+    if revoked:
+        remember_revocation(jti)
+    return revoked
+
+# Slow-query capture inline (shared module doesn't work in cloud functions)
+SQL_STATS_SAMPLE_RATE = float(os.environ.get('SQL_STATS_SAMPLE_RATE', '0'))
+SQL_SLOW_MS = float(os.environ.get('SQL_SLOW_MS', '200'))
+SQL_STATS_MAX_SAMPLES = 500
+
+_SQL_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b|(?i:\btrue\b|\bfalse\b)")
+_SQL_LIST_RE = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+_sql_stats: Dict[str, Dict[str, Any]] = {}
+_sql_trace: List[Dict[str, Any]] = []
+_sql_sampling = False
+
+def fingerprint_sql(query: str) -> str:
+    '''Normalize SQL so f-string variants of one statement share a fingerprint'''
+    normalized = _SQL_LITERAL_RE.sub('?', query)
+    normalized = _SQL_LIST_RE.sub('(?+)', normalized)
+    return ' '.join(normalized.split())
+
+def explain_sql(cursor: Any, query: Any, params: Any) -> Optional[Any]:
+    '''Capture EXPLAIN plan for a slow statement without disturbing the caller's transaction'''
+    text = query.decode('utf-8') if isinstance(query, bytes) else str(query)
+    if text.lstrip().split(' ', 1)[0].upper() not in ('SELECT', 'WITH', 'INSERT', 'UPDATE', 'DELETE'):
+        return None
+    conn = cursor.connection
+    explain_cursor = conn.cursor()
+    try:
+        if not conn.autocommit:
+            explain_cursor.execute('SAVEPOINT sql_stats_explain')
+        explain_cursor.execute('EXPLAIN (FORMAT JSON) ' + text, params)
+        plan = explain_cursor.fetchone()[0]
+        if not conn.autocommit:
+            explain_cursor.execute('RELEASE SAVEPOINT sql_stats_explain')
+        return plan
+    except psycopg2.Error:
+        if not conn.autocommit:
+            explain_cursor.execute('ROLLBACK TO SAVEPOINT sql_stats_explain')
+        return None
+    finally:
+        explain_cursor.close()
+
+def record_sql(cursor: Any, query: Any, params: Any, duration_ms: float) -> None:
+    '''Add one statement execution to the per-fingerprint distributions'''
+    text = query.decode('utf-8') if isinstance(query, bytes) else str(query)
+    fingerprint = fingerprint_sql(text)
+    rows = max(cursor.rowcount, 0)
+    entry = _sql_stats.setdefault(fingerprint, {'calls': 0, 'total_ms': 0.0, 'durations': [], 'rows': [], 'explain': None})
+    entry['calls'] += 1
+    entry['total_ms'] += duration_ms
+    if len(entry['durations']) < SQL_STATS_MAX_SAMPLES:
+        entry['durations'].append(duration_ms)
+        entry['rows'].append(rows)
+    else:
+        slot = random.randrange(entry['calls'])
+        if slot < SQL_STATS_MAX_SAMPLES:
+            entry['durations'][slot] = duration_ms
+            entry['rows'][slot] = rows
+    trace_item: Dict[str, Any] = {'fingerprint': fingerprint, 'ms': round(duration_ms, 2), 'rows': rows}
+    if duration_ms >= SQL_SLOW_MS:
+        plan = explain_sql(cursor, query, params)
+        if plan is not None:
+            entry['explain'] = plan
+            trace_item['explain'] = plan
+    _sql_trace.append(trace_item)
+
+_stats_cursor_class = None
+
+def stats_cursor_class() -> Any:
+    '''Cursor class that records duration and row count of every statement (built lazily with psycopg2)'''
+    global _stats_cursor_class
+    if _stats_cursor_class is None:
+        class StatsCursor(psycopg2.extensions.cursor):
+            def execute(self, query, vars=None):
+                started = time.perf_counter()
+                result = super().execute(query, vars)
+                record_sql(self, query, vars, (time.perf_counter() - started) * 1000)
+                return result
+        _stats_cursor_class = StatsCursor
+    return _stats_cursor_class
+
+def open_cursor(conn: Any) -> Any:
+    '''Open a cursor, instrumented only when the current invocation is sampled'''
+    if _sql_sampling:
+        return conn.cursor(cursor_factory=stats_cursor_class())
+    return conn.cursor()
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[int(round(q * (len(ordered) - 1)))] if ordered else 0.0
+
+def sql_stats_report(limit: int = 10) -> List[Dict[str, Any]]:
+    '''Top-N fingerprints by total DB time collected in this instance'''
+    grand_total = sum(entry['total_ms'] for entry in _sql_stats.values()) or 1.0
+    ranked = sorted(_sql_stats.items(), key=lambda item: item[1]['total_ms'], reverse=True)
+    return [{
+        'fingerprint': fingerprint,
+        'calls': entry['calls'],
+        'total_ms': round(entry['total_ms'], 2),
+        'share': round(entry['total_ms'] / grand_total, 4),
+        'mean_ms': round(entry['total_ms'] / entry['calls'], 2),
+        'p50_ms': round(_percentile(entry['durations'], 0.5), 2),
+        'p95_ms': round(_percentile(entry['durations'], 0.95), 2),
+        'max_ms': round(max(entry['durations']), 2),
+        'rows_mean': round(sum(entry['rows']) / len(entry['rows']), 1),
+        'rows_max': max(entry['rows']),
+        'explain': entry['explain']
+    } for fingerprint, entry in ranked[:limit]]
+
+def with_sql_stats(func):
+    '''Sample handler invocations and log their statements as one SQL_STATS line'''
+    @functools.wraps(func)
+    def wrapper(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+        global _sql_sampling
+        _sql_sampling = SQL_STATS_SAMPLE_RATE > 0 and random.random() < SQL_STATS_SAMPLE_RATE
+        if not _sql_sampling:
+            return func(event, context)
+        _sql_trace.clear()
+        try:
+            return func(event, context)
+        finally:
+            _sql_sampling = False
+            print('SQL_STATS ' + json.dumps({
+                'function': getattr(context, 'function_name', None),
+                'request_id': getattr(context, 'request_id', None),
+                'statements': _sql_trace
+            }, default=str))
+    return wrapper
+
+# Reference data cache inline (shared module doesn't work in cloud functions)
+# Each warm instance keeps cities/formats/clubs until the TTL runs out. Writers bump the reference_versions
+# row and NOTIFY cache_invalidation at commit: long-lived runtimes (CACHE_LISTEN=1) evict on the notification,
+# short-lived instances fall back to comparing the cached version stamp with the row.
+REFERENCE_CACHE_TTL_SECONDS = float(os.environ.get('REFERENCE_CACHE_TTL_SECONDS', '300'))
+REFERENCE_VERSION_CHECK_SECONDS = float(os.environ.get('REFERENCE_VERSION_CHECK_SECONDS', '5'))
+CACHE_LISTEN = os.environ.get('CACHE_LISTEN') == '1'
+CACHE_CHANNEL = 'cache_invalidation'
+_reference_cache: Dict[str, Dict[str, Any]] = {}
+_published_versions: Dict[str, int] = {}
+_reference_lock = threading.Lock()
+_listener_healthy = threading.Event()
+
+def read_reference_version(cursor: Any, resource: str) -> int:
+    cursor.execute(
+        'SELECT version FROM t_p79348767_tournament_site_buil.reference_versions WHERE resource = %s',
+        (resource,)
+    )
+    row = cursor.fetchone()
+    return row[0] if row else 0
+
+def invalidate_reference(resource: str) -> None:
+    with _reference_lock:
+        _reference_cache.pop(resource, None)
+
+def bump_reference_version(cursor: Any, resource: str) -> int:
+    '''Publish a change: drop the local copy, bump the version and notify listening instances'''
+    cursor.execute('SELECT t_p79348767_tournament_site_buil.publish_invalidation(%s, NULL)', (resource,))
+    version = cursor.fetchone()[0]
+    invalidate_reference(resource)
+    return version
+
+def apply_invalidation(payload: str) -> None:
+    '''Evict the key a notification names ({"t": type, "id": id, "v": version}) unless the copy is newer'''
+    message = json.loads(payload)
+    key = message['t'] if message.get('id') is None else f"{message['t']}:{message['id']}"
+    with _reference_lock:
+        _published_versions[key] = max(_published_versions.get(key, 0), message['v'])
+        entry = _reference_cache.get(key)
+        if entry and entry['version'] < message['v']:
+            del _reference_cache[key]
+
+def listen_for_invalidations() -> None:
+    '''LISTEN on a dedicated connection; while it is up, cached entries skip the version check'''
+    while True:
+        conn = None
+        try:
+            conn = psycopg2.connect(os.environ['DATABASE_URL'])
+            conn.autocommit = True
+            cursor = conn.cursor()
+            cursor.execute(f'LISTEN {CACHE_CHANNEL}')
+            # Notifications sent while nobody listened are lost, so start over from empty caches
+            with _reference_lock:
+                _reference_cache.clear()
+            _listener_healthy.set()
+            while True:
+                if select.select([conn], [], [], 30) == ([], [], []):
+                    cursor.execute('SELECT 1')
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    apply_invalidation(conn.notifies.pop(0).payload)
+        except Exception as e:
+            _listener_healthy.clear()
+            print(f'Invalidation listener reconnecting: {str(e)}')
+            if conn is not None and not conn.closed:
+                conn.close()
+            time.sleep(1)
+
+def start_invalidation_listener() -> None:
+    threading.Thread(target=listen_for_invalidations, name='cache-invalidation', daemon=True).start()
+
+def cached_reference(cursor: Any, resource: str, loader: Callable[[Any], Any]) -> Tuple[Any, int]:
+    '''Cached value and its version; reloads after the TTL or when another instance published a newer version'''
+    now = time.monotonic()
+    with _reference_lock:
+        entry = _reference_cache.get(resource)
+    if entry and now - entry['loaded_at'] < REFERENCE_CACHE_TTL_SECONDS:
+        if _listener_healthy.is_set() or now - entry['checked_at'] < REFERENCE_VERSION_CHECK_SECONDS:
+            return entry['value'], entry['version']
+        if read_reference_version(cursor, resource) == entry['version']:
+            entry['checked_at'] = now
+            return entry['value'], entry['version']
+    # Version first: a write landing between the two reads only causes one extra reload later
+    version = read_reference_version(cursor, resource)
+    value = loader(cursor)
+    with _reference_lock:
+        # A notification newer than what we read arrived meanwhile: serve this copy but do not keep it
+        if _published_versions.get(resource, 0) <= version:
+            _reference_cache[resource] = {'value': value, 'version': version, 'loaded_at': now, 'checked_at': now}
+    return value, version
+
+if CACHE_LISTEN:
+    start_invalidation_listener()
+
+def load_formats(cursor: Any) -> List[Dict[str, Any]]:
+    cursor.execute('SELECT id, name, coefficient, created_at FROM tournament_formats ORDER BY name')
+    return [{'id': str(row[0]), 'name': row[1], 'coefficient': float(row[2]), 'created_at': row[3].isoformat() if row[3] else None} for row in cursor.fetchall()]
+
+@with_sql_stats
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     '''
     Business: Управление форматами турниров - получение, добавление, изменение и удаление
@@ -12,13 +507,16 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     '''
     method: str = event.get('httpMethod', 'GET')
     
+    if is_warm_up(event):
+        return warm_up()
+    
     if method == 'OPTIONS':
         return {
             'statusCode': 200,
             'headers': {
                 'Access-Control-Allow-Origin': '*',
                 'Access-Control-Allow-Methods': 'GET, POST, PUT, DELETE, OPTIONS',
-                'Access-Control-Allow-Headers': 'Content-Type, X-User-Id',
+                'Access-Control-Allow-Headers': 'Content-Type, X-Auth-Token, X-User-Id',
                 'Access-Control-Max-Age': '86400'
             },
             'body': ''
@@ -32,33 +530,25 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             'body': json.dumps({'error': 'DATABASE_URL not configured'})
         }
     
-    conn = psycopg2.connect(dsn)
+    conn = get_connection()
     conn.autocommit = True
-    cur = conn.cursor()
+    cur = open_cursor(conn)
     
     try:
         if method == 'GET':
-            cur.execute('SELECT id, name, coefficient, created_at FROM tournament_formats ORDER BY name')
-            rows = cur.fetchall()
-            formats = [{'id': str(row[0]), 'name': row[1], 'coefficient': float(row[2]), 'created_at': row[3].isoformat() if row[3] else None} for row in rows]
+            formats, version = cached_reference(cur, 'formats', load_formats)
             
             return {
                 'statusCode': 200,
-                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*', 'ETag': f'"formats-{version}"'},
                 'isBase64Encoded': False,
                 'body': json.dumps({'formats': formats})
             }
         
         elif method == 'POST':
-            headers = event.get('headers', {})
-            token = headers.get('X-Auth-Token') or headers.get('x-auth-token')
-            if not token:
-                return {
-                    'statusCode': 401,
-                    'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-                    'isBase64Encoded': False,
-                    'body': json.dumps({'error': 'Missing authentication token', 'success': False})
-                }
+            is_valid, user_data, error_msg = verify_token(event)
+            if not is_valid:
+                return create_auth_error(error_msg or 'Unauthorized')
             
             body_data = json.loads(event.get('body', '{}'))
             name = body_data.get('name', '').strip()
@@ -84,6 +574,7 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             
             cur.execute(f"INSERT INTO tournament_formats (name, coefficient) VALUES ('{escaped_name}', {coefficient}) RETURNING id")
             format_id = cur.fetchone()[0]
+            bump_reference_version(cur, 'formats')
             
             return {
                 'statusCode': 201,
@@ -93,15 +584,9 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             }
         
         elif method == 'PUT':
-            headers = event.get('headers', {})
-            token = headers.get('X-Auth-Token') or headers.get('x-auth-token')
-            if not token:
-                return {
-                    'statusCode': 401,
-                    'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-                    'isBase64Encoded': False,
-                    'body': json.dumps({'error': 'Missing authentication token', 'success': False})
-                }
+            is_valid, user_data, error_msg = verify_token(event)
+            if not is_valid:
+                return create_auth_error(error_msg or 'Unauthorized')
             
             body_data = json.loads(event.get('body', '{}'))
             format_id = body_data.get('id')
@@ -117,6 +602,7 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             
             escaped_name = name.replace("'", "''")
             cur.execute(f"UPDATE tournament_formats SET name = '{escaped_name}', coefficient = {coefficient} WHERE id = {int(format_id)}")
+            bump_reference_version(cur, 'formats')
             
             return {
                 'statusCode': 200,
@@ -126,15 +612,9 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             }
         
         elif method == 'DELETE':
-            headers = event.get('headers', {})
-            token = headers.get('X-Auth-Token') or headers.get('x-auth-token')
-            if not token:
-                return {
-                    'statusCode': 401,
-                    'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-                    'isBase64Encoded': False,
-                    'body': json.dumps({'error': 'Missing authentication token', 'success': False})
-                }
+            is_valid, user_data, error_msg = verify_token(event)
+            if not is_valid:
+                return create_auth_error(error_msg or 'Unauthorized')
             
             params = event.get('queryStringParameters', {})
             format_id = params.get('id')
@@ -147,6 +627,7 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 }
             
             cur.execute(f'DELETE FROM tournament_formats WHERE id = {int(format_id)}')
+            bump_reference_version(cur, 'formats')
             
             return {
                 'statusCode': 200,
@@ -163,4 +644,4 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     
     finally:
         cur.close()
-        conn.close()
\ No newline at end of file
+        release_connection(conn)
\ No newline at end of file
@@ -1,17 +1,268 @@
 import json
 import os
-import psycopg2
-from typing import Dict, Any
+import base64
+import importlib
+import threading
+import select
+import time
+from typing import Dict, Any, List, Tuple, Callable
+
+# Lazy imports and warm connections inline (shared module doesn't work in cloud functions)
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', '2'))
+DB_IDLE_PING_SECONDS = float(os.environ.get('DB_IDLE_PING_SECONDS', '30'))
+
+class LazyModule:
+    '''Defers importing a heavy dependency until its first attribute access'''
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def load(self) -> Any:
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.load(), attr)
+
+psycopg2 = LazyModule('psycopg2')
+_idle_connections: List[Tuple[Any, float]] = []
+_pool_lock = threading.Lock()
+
+def get_connection() -> Any:
+    '''Reuse an idle connection of this warm instance, pinging it after a long idle period'''
+    with _pool_lock:
+        conn, released_at = _idle_connections.pop() if _idle_connections else (None, 0.0)
+    if conn is not None and not conn.closed and time.monotonic() - released_at > DB_IDLE_PING_SECONDS:
+        try:
+            ping_cursor = conn.cursor()
+            ping_cursor.execute('SELECT 1')
+            ping_cursor.close()
+            conn.rollback()
+        except psycopg2.Error:
+            conn.close()
+    if conn is None or conn.closed:
+        conn = psycopg2.connect(os.environ['DATABASE_URL'])
+    return conn
+
+def release_connection(conn: Any) -> None:
+    '''Return a connection to the idle pool in a clean transaction state'''
+    if conn.closed:
+        return
+    try:
+        if conn.autocommit:
+            conn.autocommit = False
+        else:
+            conn.rollback()
+    except psycopg2.Error:
+        conn.close()
+        return
+    with _pool_lock:
+        if len(_idle_connections) < DB_POOL_SIZE:
+            _idle_connections.append((conn, time.monotonic()))
+            return
+    conn.close()
+
+def is_warm_up(event: Dict[str, Any]) -> bool:
+    return bool(event.get('warmup')) or event.get('httpMethod') == 'WARMUP'
+
+def warm_up() -> Dict[str, Any]:
+    '''Init phase: import heavy modules and fill the idle pool before real traffic arrives'''
+    started = time.perf_counter()
+    for module in (psycopg2,):
+        module.load()
+    warmed = 0
+    if os.environ.get('DATABASE_URL'):
+        connections = [get_connection() for _ in range(DB_POOL_SIZE)]
+        for conn in connections:
+            release_connection(conn)
+        warmed = len(connections)
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json'},
+        'isBase64Encoded': False,
+        'body': json.dumps({'warm': True, 'connections': warmed, 'ms': round((time.perf_counter() - started) * 1000, 1)})
+    }
+
+if os.environ.get('PREWARM_ON_IMPORT') == '1':
+    warm_up()
+
+# Reference data cache inline (shared module doesn't work in cloud functions)
+# Each warm instance keeps cities/formats/clubs until the TTL runs out. Writers bump the reference_versions
+# row and NOTIFY cache_invalidation at commit: long-lived runtimes (CACHE_LISTEN=1) evict on the notification,
+# short-lived instances fall back to comparing the cached version stamp with the row.
+REFERENCE_CACHE_TTL_SECONDS = float(os.environ.get('REFERENCE_CACHE_TTL_SECONDS', '300'))
+REFERENCE_VERSION_CHECK_SECONDS = float(os.environ.get('REFERENCE_VERSION_CHECK_SECONDS', '5'))
+CACHE_LISTEN = os.environ.get('CACHE_LISTEN') == '1'
+CACHE_CHANNEL = 'cache_invalidation'
+_reference_cache: Dict[str, Dict[str, Any]] = {}
+_published_versions: Dict[str, int] = {}
+_reference_lock = threading.Lock()
+_listener_healthy = threading.Event()
+
+def read_reference_version(cursor: Any, resource: str) -> int:
+    cursor.execute(
+        'SELECT version FROM t_p79348767_tournament_site_buil.reference_versions WHERE resource = %s',
+        (resource,)
+    )
+    row = cursor.fetchone()
+    return row[0] if row else 0
+
+def invalidate_reference(resource: str) -> None:
+    with _reference_lock:
+        _reference_cache.pop(resource, None)
+
+def bump_reference_version(cursor: Any, resource: str) -> int:
+    '''Publish a change: drop the local copy, bump the version and notify listening instances'''
+    cursor.execute('SELECT t_p79348767_tournament_site_buil.publish_invalidation(%s, NULL)', (resource,))
+    version = cursor.fetchone()[0]
+    invalidate_reference(resource)
+    return version
+
+def apply_invalidation(payload: str) -> None:
+    '''Evict the key a notification names ({"t": type, "id": id, "v": version}) unless the copy is newer'''
+    message = json.loads(payload)
+    key = message['t'] if message.get('id') is None else f"{message['t']}:{message['id']}"
+    with _reference_lock:
+        _published_versions[key] = max(_published_versions.get(key, 0), message['v'])
+        entry = _reference_cache.get(key)
+        if entry and entry['version'] < message['v']:
+            del _reference_cache[key]
+
+def listen_for_invalidations() -> None:
+    '''LISTEN on a dedicated connection; while it is up, cached entries skip the version check'''
+    while True:
+        conn = None
+        try:
+            conn = psycopg2.connect(os.environ['DATABASE_URL'])
+            conn.autocommit = True
+            cursor = conn.cursor()
+            cursor.execute(f'LISTEN {CACHE_CHANNEL}')
+            # Notifications sent while nobody listened are lost, so start over from empty caches
+            with _reference_lock:
+                _reference_cache.clear()
+            _listener_healthy.set()
+            while True:
+                if select.select([conn], [], [], 30) == ([], [], []):
+                    cursor.execute('SELECT 1')
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    apply_invalidation(conn.notifies.pop(0).payload)
+        except Exception as e:
+            _listener_healthy.clear()
+            print(f'Invalidation listener reconnecting: {str(e)}')
+            if conn is not None and not conn.closed:
+                conn.close()
+            time.sleep(1)
+
+def start_invalidation_listener() -> None:
+    threading.Thread(target=listen_for_invalidations, name='cache-invalidation', daemon=True).start()
+
+def cached_reference(cursor: Any, resource: str, loader: Callable[[Any], Any]) -> Tuple[Any, int]:
+    '''Cached value and its version; reloads after the TTL or when another instance published a newer version'''
+    now = time.monotonic()
+    with _reference_lock:
+        entry = _reference_cache.get(resource)
+    if entry and now - entry['loaded_at'] < REFERENCE_CACHE_TTL_SECONDS:
+        if _listener_healthy.is_set() or now - entry['checked_at'] < REFERENCE_VERSION_CHECK_SECONDS:
+            return entry['value'], entry['version']
+        if read_reference_version(cursor, resource) == entry['version']:
+            entry['checked_at'] = now
+            return entry['value'], entry['version']
+    # Version first: a write landing between the two reads only causes one extra reload later
+    version = read_reference_version(cursor, resource)
+    value = loader(cursor)
+    with _reference_lock:
+        # A notification newer than what we read arrived meanwhile: serve this copy but do not keep it
+        if _published_versions.get(resource, 0) <= version:
+            _reference_cache[resource] = {'value': value, 'version': version, 'loaded_at': now, 'checked_at': now}
+    return value, version
+
+if CACHE_LISTEN:
+    start_invalidation_listener()
+
+def load_clubs(cursor: Any) -> List[Dict[str, Any]]:
+    cursor.execute('SELECT id, name, city, created_at FROM clubs ORDER BY name')
+    return [{
+        'id': row[0],
+        'name': row[1],
+        'city': row[2],
+        'created_at': row[3].isoformat() if row[3] else None
+    } for row in cursor.fetchall()]
+
+CLUBS_DEFAULT_LIMIT = 20
+CLUBS_MAX_LIMIT = 100
+
+def encode_cursor(name: str, club_id: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps([name, club_id]).encode('utf-8')).decode('ascii')
+
+def decode_cursor(cursor_token: str) -> Tuple[str, int]:
+    name, club_id = json.loads(base64.urlsafe_b64decode(cursor_token.encode('ascii')).decode('utf-8'))
+    return str(name), int(club_id)
+
+def list_clubs(cursor: Any, params: Dict[str, Any]) -> Dict[str, Any]:
+    '''Club directory page: exact city filter (idx_clubs_city), name prefix, keyset pagination by name'''
+    headers = {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'}
+    try:
+        limit = min(max(int(params.get('limit') or CLUBS_DEFAULT_LIMIT), 1), CLUBS_MAX_LIMIT)
+        after = decode_cursor(params['cursor']) if params.get('cursor') else None
+    except (ValueError, TypeError):
+        return {'statusCode': 400, 'headers': headers, 'body': json.dumps({'error': 'Invalid limit or cursor'}), 'isBase64Encoded': False}
+    
+    conditions = []
+    values: List[Any] = []
+    if params.get('city'):
+        conditions.append('city = %s')
+        values.append(params['city'].strip())
+    if params.get('q'):
+        prefix = params['q'].strip().lower().replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        conditions.append('LOWER(name) LIKE %s')
+        values.append(prefix + '%')
+    if after:
+        conditions.append('(name, id) > (%s, %s)')
+        values.extend(after)
+    where = f'WHERE {" AND ".join(conditions)}' if conditions else ''
+    
+    # Counters are kept up to date by the tournaments trigger (V0052), no aggregation here
+    cursor.execute(f"""
+        SELECT id, name, city, created_at, tournaments_count, players_count
+        FROM clubs
+        {where}
+        ORDER BY name, id
+        LIMIT %s
+    """, (*values, limit + 1))
+    rows = cursor.fetchall()
+    
+    clubs = [{
+        'id': row[0],
+        'name': row[1],
+        'city': row[2],
+        'created_at': row[3].isoformat() if row[3] else None,
+        'tournaments_count': row[4],
+        'players_count': row[5]
+    } for row in rows[:limit]]
+    next_cursor = encode_cursor(rows[limit - 1][1], rows[limit - 1][0]) if len(rows) > limit else None
+    
+    return {
+        'statusCode': 200,
+        'headers': headers,
+        'body': json.dumps({'clubs': clubs, 'next_cursor': next_cursor}),
+        'isBase64Encoded': False
+    }
 
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     '''
-    Business: Get all clubs from database
-    Args: event - dict with httpMethod
+    Business: Get clubs from database - full list, or a filtered page with tournament/player counts
+    Args: event - dict with httpMethod, queryStringParameters (city, q, limit, cursor)
           context - object with request_id attribute
-    Returns: HTTP response with list of clubs
+    Returns: HTTP response with list of clubs (plain array without parameters, page object with them)
     '''
     method: str = event.get('httpMethod', 'GET')
     
+    if is_warm_up(event):
+        return warm_up()
+    
     if method == 'OPTIONS':
         return {
             'statusCode': 200,
@@ -36,31 +287,30 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             'isBase64Encoded': False
         }
     
-    dsn = os.environ.get('DATABASE_URL')
+    params = event.get('queryStringParameters') or {}
     
-    conn = psycopg2.connect(dsn)
+    conn = get_connection()
     cur = conn.cursor()
     
-    cur.execute('SELECT id, name, city, created_at FROM clubs ORDER BY name')
-    rows = cur.fetchall()
+    if any(params.get(key) for key in ('city', 'q', 'limit', 'cursor')):
+        try:
+            return list_clubs(cur, params)
+        finally:
+            cur.close()
+            release_connection(conn)
     
-    clubs = []
-    for row in rows:
-        clubs.append({
-            'id': row[0],
-            'name': row[1],
-            'city': row[2],
-            'created_at': row[3].isoformat() if row[3] else None
-        })
+    # Without parameters keep the plain array club pickers already consume
+    clubs, version = cached_reference(cur, 'clubs', load_clubs)
     
     cur.close()
-    conn.close()
+    release_connection(conn)
     
     return {
         'statusCode': 200,
         'headers': {
             'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*'
+            'Access-Control-Allow-Origin': '*',
+            'ETag': f'"clubs-{version}"'
         },
         'body': json.dumps(clubs),
         'isBase64Encoded': False
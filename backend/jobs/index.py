@@ -0,0 +1,882 @@
+import json
+import os
+import io
+import csv
+import hashlib
+import importlib
+import threading
+import time
+import random
+from typing import Dict, Any, List, Optional, Tuple, Callable
+from collections import OrderedDict
+
+# Lazy imports and warm connections inline (shared module doesn't work in cloud functions)
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', '2'))
+DB_IDLE_PING_SECONDS = float(os.environ.get('DB_IDLE_PING_SECONDS', '30'))
+
+class LazyModule:
+    '''Defers importing a heavy dependency until its first attribute access'''
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def load(self) -> Any:
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.load(), attr)
+
+psycopg2 = LazyModule('psycopg2')
+jwt = LazyModule('jwt')
+_idle_connections: List[Tuple[Any, float]] = []
+_pool_lock = threading.Lock()
+
+def get_connection() -> Any:
+    '''Reuse an idle connection of this warm instance, pinging it after a long idle period'''
+    with _pool_lock:
+        conn, released_at = _idle_connections.pop() if _idle_connections else (None, 0.0)
+    if conn is not None and not conn.closed and time.monotonic() - released_at > DB_IDLE_PING_SECONDS:
+        try:
+            ping_cursor = conn.cursor()
+            ping_cursor.execute('SELECT 1')
+            ping_cursor.close()
+            conn.rollback()
+        except psycopg2.Error:
+            conn.close()
+    if conn is None or conn.closed:
+        conn = psycopg2.connect(os.environ['DATABASE_URL'])
+    return conn
+
+def release_connection(conn: Any) -> None:
+    '''Return a connection to the idle pool in a clean transaction state'''
+    if conn.closed:
+        return
+    try:
+        if conn.autocommit:
+            conn.autocommit = False
+        else:
+            conn.rollback()
+    except psycopg2.Error:
+        conn.close()
+        return
+    with _pool_lock:
+        if len(_idle_connections) < DB_POOL_SIZE:
+            _idle_connections.append((conn, time.monotonic()))
+            return
+    conn.close()
+
+def is_warm_up(event: Dict[str, Any]) -> bool:
+    return bool(event.get('warmup')) or event.get('httpMethod') == 'WARMUP'
+
+def warm_up() -> Dict[str, Any]:
+    '''Init phase: import heavy modules and fill the idle pool before real traffic arrives'''
+    started = time.perf_counter()
+    for module in (psycopg2, jwt):
+        module.load()
+    warmed = 0
+    if os.environ.get('DATABASE_URL'):
+        connections = [get_connection() for _ in range(DB_POOL_SIZE)]
+        for conn in connections:
+            release_connection(conn)
+        warmed = len(connections)
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json'},
+        'isBase64Encoded': False,
+        'body': json.dumps({'warm': True, 'connections': warmed, 'ms': round((time.perf_counter() - started) * 1000, 1)})
+    }
+
+if os.environ.get('PREWARM_ON_IMPORT') == '1':
+    warm_up()
+# Auth inline (shared module doesn't work in cloud functions); scripts/check_inline.py keeps copies identical
+AUTH_CACHE_SIZE = int(os.environ.get('AUTH_CACHE_SIZE', '1024'))
+_verified_tokens: 'OrderedDict[bytes, Tuple[Dict[str, Any], float]]' = OrderedDict()
+_auth_lock = threading.Lock()
+
+def get_jwt_secret() -> Optional[str]:
+    return os.environ.get('JWT_SECRET')
+
+def decode_token(token: str) -> Dict[str, Any]:
+    '''HS256 verification memoized by token digest until the token expires (bounded LRU)'''
+    digest = hashlib.sha256(token.encode('utf-8')).digest()
+    now = time.time()
+    with _auth_lock:
+        cached = _verified_tokens.get(digest)
+        if cached is not None:
+            if cached[1] > now:
+                _verified_tokens.move_to_end(digest)
+                return cached[0]
+            del _verified_tokens[digest]
+    payload = jwt.decode(token, get_jwt_secret(), algorithms=['HS256'])
+    with _auth_lock:
+        _verified_tokens[digest] = (payload, float(payload.get('exp', now + 60)))
+        while len(_verified_tokens) > AUTH_CACHE_SIZE:
+            _verified_tokens.popitem(last=False)
+    return payload
+
+def verify_token(event: Dict[str, Any]) -> Tuple[bool, Optional[Dict], Optional[str]]:
+    '''Verify JWT token from request headers'''
+    headers = event.get('headers') or {}
+    token = headers.get('x-auth-token') or headers.get('X-Auth-Token')
+    
+    if not token:
+        return False, None, 'Missing authentication token'
+    
+    if not get_jwt_secret():
+        return False, None, 'Server configuration error'
+    
+    try:
+        payload = decode_token(token)
+    except jwt.ExpiredSignatureError:
+        return False, None, 'Token expired'
+    except jwt.InvalidTokenError:
+        return False, None, 'Invalid token'
+    
+    if is_token_revoked(payload):
+        return False, None, 'Token revoked'
+    
+    return True, payload, None
+
+def create_auth_error(message: str, status_code: int = 401) -> Dict[str, Any]:
+    '''Create authentication error response'''
+    return {
+        'statusCode': status_code,
+        'headers': {
+            'Content-Type': 'application/json',
+            'Access-Control-Allow-Origin': '*'
+        },
+        'isBase64Encoded': False,
+        'body': json.dumps({'error': message, 'success': False})
+    }
+
+def is_admin(claims: Dict[str, Any]) -> bool:
+    return claims.get('role') == 'admin'
+
+def judges_tournament(claims: Dict[str, Any], tournament_id: Any) -> bool:
+    '''Admins manage every tournament, judges the ones listed in their judgeOf claim'''
+    if is_admin(claims):
+        return True
+    try:
+        return int(tournament_id) in (claims.get('judgeOf') or [])
+    except (TypeError, ValueError):
+        return False
+
+# Token revocation: bloom filter of revoked jti values plus an exact set of the latest ones
+REVOCATION_REFRESH_SECONDS = float(os.environ.get('REVOCATION_REFRESH_SECONDS', '15'))
+REVOCATION_REBUILD_SECONDS = 3600
+REVOCATION_RECENT_SIZE = 256
+BLOOM_BITS = 1 << 16
+BLOOM_HASHES = 7
+
+class BloomFilter:
+    '''Fixed-size bloom filter over strings using double hashing of a SHA-256 digest'''
+    def __init__(self, bits: int = BLOOM_BITS, hashes: int = BLOOM_HASHES):
+        self.bits = bits
+        self.hashes = hashes
+        self.array = bytearray(bits // 8)
+
+    def _positions(self, value: str) -> List[int]:
+        digest = hashlib.sha256(value.encode('utf-8')).digest()
+        first = int.from_bytes(digest[:8], 'big')
+        second = int.from_bytes(digest[8:16], 'big') | 1
+        return [(first + i * second) % self.bits for i in range(self.hashes)]
+
+    def add(self, value: str) -> None:
+        for position in self._positions(value):
+            self.array[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value: str) -> bool:
+        return all(self.array[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+_revocation_bloom = BloomFilter()
+_recent_revocations: 'OrderedDict[str, None]' = OrderedDict()
+_revocation_watermark: Optional[Any] = None
+_revocations_refreshed_at = float('-inf')
+_revocations_built_at = float('-inf')
+
+def remember_revocation(jti: str) -> None:
+    with _auth_lock:
+        _revocation_bloom.add(jti)
+        _recent_revocations[jti] = None
+        _recent_revocations.move_to_end(jti)
+        while len(_recent_revocations) > REVOCATION_RECENT_SIZE:
+            _recent_revocations.popitem(last=False)
+
+def refresh_revocations() -> None:
+    '''Pull revocations newer than the watermark; rebuild hourly so expired ids leave the filter'''
+    global _revocation_bloom, _revocation_watermark, _revocations_refreshed_at, _revocations_built_at
+    now = time.monotonic()
+    rebuild = now - _revocations_built_at > REVOCATION_REBUILD_SECONDS
+    watermark = None if rebuild else _revocation_watermark
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        # Overlap the watermark a little so revocations committed out of order are not skipped
+        cursor.execute("""
+            SELECT jti, revoked_at FROM t_p79348767_tournament_site_buil.revoked_tokens
+            WHERE expires_at > NOW()
+              AND (%s::timestamptz IS NULL OR revoked_at > %s::timestamptz - INTERVAL '5 seconds')
+            ORDER BY revoked_at
+        """, (watermark, watermark))
+        rows = cursor.fetchall()
+        cursor.close()
+    finally:
+        release_connection(conn)
+    
+    if rebuild:
+        with _auth_lock:
+            _revocation_bloom = BloomFilter()
+            _recent_revocations.clear()
+        _revocations_built_at = now
+    for jti, revoked_at in rows:
+        remember_revocation(jti)
+        watermark = revoked_at
+    _revocation_watermark = watermark
+    _revocations_refreshed_at = now
+
+def is_token_revoked(claims: Dict[str, Any]) -> bool:
+    '''Exact set and bloom filter answer locally; a bloom hit or a stale filter costs a database lookup'''
+    jti = claims.get('jti')
+    if not jti:
+        return False
+    if time.monotonic() - _revocations_refreshed_at > REVOCATION_REFRESH_SECONDS:
+        try:
+            refresh_revocations()
+        except Exception as e:
+            print(f'Revocation refresh failed: {str(e)}')
+    if jti in _recent_revocations:
+        return True
+    # A miss only proves "not revoked" while the filter is fresh; after a failed refresh check exactly (fail closed)
+    stale = time.monotonic() - _revocations_refreshed_at > REVOCATION_REFRESH_SECONDS
+    if jti not in _revocation_bloom and not stale:
+        return False
+    try:
+        conn = get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                'SELECT 1 FROM t_p79348767_tournament_site_buil.revoked_tokens WHERE jti = %s',
+                (jti,)
+            )
+            revoked = cursor.fetchone() is not None
+            cursor.close()
+        finally:
+            release_connection(conn)
+    except Exception:
+        return True
+    if revoked:
+        remember_revocation(jti)
+    return revoked
+
+
+# Job queue inline (shared module doesn't work in cloud functions); workers live in backend/jobs
+JOB_MAX_ATTEMPTS = int(os.environ.get('JOB_MAX_ATTEMPTS', '5'))
+
+def enqueue_job(cur: Any, kind: str, payload: Dict[str, Any], serialization_key: Optional[str] = None) -> int:
+    '''Queue a job; an identical one still waiting in the queue is reused instead of piling up duplicates'''
+    encoded = json.dumps(payload, sort_keys=True)
+    cur.execute("""
+        SELECT id FROM t_p79348767_tournament_site_buil.jobs
+        WHERE kind = %s AND status = 'queued' AND payload = %s::jsonb
+          AND serialization_key IS NOT DISTINCT FROM %s
+        ORDER BY id
+        LIMIT 1
+    """, (kind, encoded, serialization_key))
+    row = cur.fetchone()
+    if row:
+        return row[0]
+    cur.execute("""
+        INSERT INTO t_p79348767_tournament_site_buil.jobs (kind, payload, serialization_key, max_attempts)
+        VALUES (%s, %s::jsonb, %s, %s)
+        RETURNING id
+    """, (kind, encoded, serialization_key, JOB_MAX_ATTEMPTS))
+    return cur.fetchone()[0]
+
+def read_job(cur: Any, job_id: int) -> Optional[Dict[str, Any]]:
+    '''Status, progress and result of one job in API shape'''
+    cur.execute("""
+        SELECT id, kind, status, progress, result, attempts, last_error, run_after, created_at, finished_at
+        FROM t_p79348767_tournament_site_buil.jobs
+        WHERE id = %s
+    """, (job_id,))
+    row = cur.fetchone()
+    if not row:
+        return None
+    return {
+        'job_id': row[0],
+        'kind': row[1],
+        'status': row[2],
+        'progress': row[3],
+        'result': row[4],
+        'attempts': row[5],
+        'last_error': row[6],
+        'run_after': row[7].isoformat() if row[7] else None,
+        'created_at': row[8].isoformat() if row[8] else None,
+        'finished_at': row[9].isoformat() if row[9] else None
+    }
+
+# Workers: claim with FOR UPDATE SKIP LOCKED, hold a lease while running, back off on failure
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', '2'))
+JOB_TIME_BUDGET_SECONDS = float(os.environ.get('JOB_TIME_BUDGET_SECONDS', '25'))
+JOB_LEASE_SECONDS = 60
+JOB_BACKOFF_BASE_SECONDS = 30
+JOB_BACKOFF_MAX_SECONDS = 3600
+PURGE_BATCH_SIZE = int(os.environ.get('PURGE_BATCH_SIZE', '500'))
+STATS_BATCH_SIZE = int(os.environ.get('STATS_BATCH_SIZE', '500'))
+# Dependent tables in purge order; the tournament row itself goes last
+PURGE_TABLES = ('tournament_results', 'games', 'tournament_participants')
+
+class Reschedule(Exception):
+    '''Raised when a job runs out of time: it returns to the queue with its checkpointed progress, uncounted'''
+
+class JobContext:
+    '''What a job function sees: its payload, progress saved so far and the worker's deadline'''
+    def __init__(self, conn: Any, job_id: int, payload: Dict[str, Any], progress: Dict[str, Any], deadline: float):
+        self.conn = conn
+        self.job_id = job_id
+        self.payload = payload
+        self.progress = progress
+        self.deadline = deadline
+
+    def checkpoint(self) -> None:
+        '''Commit the work done so far together with the progress, and extend the lease'''
+        cur = self.conn.cursor()
+        cur.execute("""
+            UPDATE t_p79348767_tournament_site_buil.jobs
+            SET progress = %s::jsonb, locked_until = NOW() + make_interval(secs => %s), updated_at = NOW()
+            WHERE id = %s
+        """, (json.dumps(self.progress), JOB_LEASE_SECONDS, self.job_id))
+        cur.close()
+        self.conn.commit()
+
+    def check_time(self) -> None:
+        if time.monotonic() > self.deadline:
+            raise Reschedule()
+
+def calculate_elo_change(player_rating: int, opponent_rating: int, result: float, k_factor: int = 32) -> int:
+    expected_score = 1.0 / (1.0 + pow(10, (opponent_rating - player_rating) / 400.0))
+    return round(k_factor * (result - expected_score))
+
+def rate_tournament(cur: Any, tournament_id: int) -> Tuple[Optional[Dict[int, int]], int]:
+    '''Store Elo changes for every game, round by round from the pre-tournament ratings; returns the ratings after
+    the last round (None when the tournament was skipped) and the number of games written'''
+    cur.execute("""
+        SELECT id, round_number, player1_id, player2_id, result, is_bye
+        FROM t_p79348767_tournament_site_buil.games
+        WHERE tournament_id = %s
+        ORDER BY round_number, id
+    """, (tournament_id,))
+    games = cur.fetchall()
+    
+    # The client writes final ratings right after confirming, so a confirmed tournament starts from the
+    # snapshot taken at confirmation (V0064). Tournaments confirmed before V0064 have none, and current ratings
+    # include later tournaments too, so their stored changes are left as they are
+    player_ids = {game[2] for game in games} | {game[3] for game in games if game[3]}
+    cur.execute("""
+        SELECT u.id, u.rating, tp.rating_before, t.status
+        FROM t_p79348767_tournament_site_buil.users u
+        JOIN t_p79348767_tournament_site_buil.tournaments t ON t.id = %s
+        LEFT JOIN t_p79348767_tournament_site_buil.tournament_participants tp
+            ON tp.tournament_id = t.id AND tp.player_id = u.id
+        WHERE u.id = ANY(%s)
+    """, (tournament_id, list(player_ids)))
+    players = cur.fetchall()
+    if any(status == 'confirmed' and rating_before is None for _, _, rating_before, status in players):
+        return None, 0
+    current_ratings = {
+        player_id: (rating_before if status == 'confirmed' else rating) or 1200
+        for player_id, rating, rating_before, status in players
+    }
+    
+    scores = {'win1': (1.0, 0.0), 'win2': (0.0, 1.0), 'draw': (0.5, 0.5)}
+    game_ids: List[int] = []
+    player1_changes: List[int] = []
+    player2_changes: List[int] = []
+    for game_id, round_num, p1_id, p2_id, result, is_bye in games:
+        p1_change = p2_change = 0
+        # Byes and games without a result leave ratings unchanged
+        if not is_bye and p2_id and result in scores:
+            p1_rating = current_ratings.get(p1_id, 1200)
+            p2_rating = current_ratings.get(p2_id, 1200)
+            p1_change = calculate_elo_change(p1_rating, p2_rating, scores[result][0])
+            p2_change = calculate_elo_change(p2_rating, p1_rating, scores[result][1])
+            # Same floor as the client's confirmation, so the stored changes add up to the ratings it wrote
+            current_ratings[p1_id] = max(0, p1_rating + p1_change)
+            current_ratings[p2_id] = max(0, p2_rating + p2_change)
+        game_ids.append(game_id)
+        player1_changes.append(p1_change)
+        player2_changes.append(p2_change)
+    
+    cur.execute("""
+        UPDATE t_p79348767_tournament_site_buil.games g
+        SET player1_rating_change = c.player1_change,
+            player2_rating_change = c.player2_change
+        FROM unnest(%s::integer[], %s::integer[], %s::integer[]) AS c(game_id, player1_change, player2_change)
+        WHERE g.id = c.game_id
+    """, (game_ids, player1_changes, player2_changes))
+    return current_ratings, len(game_ids)
+
+def recalculate_ratings_job(job: JobContext) -> Dict[str, Any]:
+    '''Elo changes for every game of the tournament, round by round from the players' pre-tournament ratings'''
+    cur = job.conn.cursor()
+    ratings, updated_games = rate_tournament(cur, int(job.payload['tournament_id']))
+    cur.close()
+    if ratings is None:
+        return {'updated_games': 0, 'skipped': 'confirmed without a rating snapshot'}
+    return {'updated_games': updated_games}
+
+def replay_player_rating_job(job: JobContext) -> Dict[str, Any]:
+    '''A merged player's rating from 1200 through their confirmed tournaments in date order. Tournaments moved over
+    by the merge are re-rated from the replayed rating when they have a snapshot; the others keep their stored changes'''
+    player_id = int(job.payload['player_id'])
+    moved = {int(tournament_id) for tournament_id in job.payload.get('tournament_ids') or []}
+    cur = job.conn.cursor()
+    cur.execute("""
+        SELECT t.id, NOT EXISTS (
+            SELECT 1 FROM t_p79348767_tournament_site_buil.tournament_participants other
+            WHERE other.tournament_id = t.id AND other.rating_before IS NULL
+        ), COALESCE((
+            SELECT SUM(CASE WHEN g.player1_id = %(player)s THEN g.player1_rating_change ELSE g.player2_rating_change END)
+            FROM t_p79348767_tournament_site_buil.games g
+            WHERE g.tournament_id = t.id AND (g.player1_id = %(player)s OR g.player2_id = %(player)s)
+        ), 0)
+        FROM t_p79348767_tournament_site_buil.tournament_participants tp
+        JOIN t_p79348767_tournament_site_buil.tournaments t ON t.id = tp.tournament_id
+        WHERE tp.player_id = %(player)s AND t.status = 'confirmed' AND t.deleted_at IS NULL
+        ORDER BY COALESCE(t.tournament_date, t.created_at::date), t.id
+    """, {'player': player_id})
+    rating = 1200
+    rerated = []
+    for tournament_id, snapshotted, stored_change in cur.fetchall():
+        if tournament_id in moved and snapshotted:
+            cur.execute("""
+                UPDATE t_p79348767_tournament_site_buil.tournament_participants
+                SET rating_before = %s
+                WHERE tournament_id = %s AND player_id = %s
+            """, (rating, tournament_id, player_id))
+            ratings, _ = rate_tournament(cur, tournament_id)
+            if ratings is not None:
+                rating = ratings.get(player_id, rating)
+                rerated.append(tournament_id)
+                continue
+        rating = max(0, rating + stored_change)
+    cur.execute(
+        'UPDATE t_p79348767_tournament_site_buil.users SET rating = %s WHERE id = %s',
+        (rating, player_id)
+    )
+    cur.close()
+    return {'rating': rating, 'rerated_tournaments': rerated}
+
+def export_tournament_job(job: JobContext) -> Dict[str, Any]:
+    '''Standings and games of one tournament as two CSV documents'''
+    tournament_id = int(job.payload['tournament_id'])
+    cur = job.conn.cursor()
+    cur.execute("""
+        SELECT tr.place, u.name, tr.points, tr.wins, tr.losses, tr.draws, tr.buchholz, tr.sum_buchholz
+        FROM t_p79348767_tournament_site_buil.tournament_results tr
+        JOIN t_p79348767_tournament_site_buil.users u ON u.id = tr.player_id
+        WHERE tr.tournament_id = %s
+        ORDER BY tr.place
+    """, (tournament_id,))
+    standings = io.StringIO()
+    writer = csv.writer(standings)
+    writer.writerow(['place', 'name', 'points', 'wins', 'losses', 'draws', 'buchholz', 'sum_buchholz'])
+    writer.writerows(cur.fetchall())
+    
+    cur.execute("""
+        SELECT g.round_number, p1.name, p2.name, g.result, g.player1_rating_change, g.player2_rating_change
+        FROM t_p79348767_tournament_site_buil.games g
+        JOIN t_p79348767_tournament_site_buil.users p1 ON p1.id = g.player1_id
+        LEFT JOIN t_p79348767_tournament_site_buil.users p2 ON p2.id = g.player2_id
+        WHERE g.tournament_id = %s
+        ORDER BY g.round_number, g.id
+    """, (tournament_id,))
+    games = io.StringIO()
+    writer = csv.writer(games)
+    writer.writerow(['round', 'player1', 'player2', 'result', 'player1_rating_change', 'player2_rating_change'])
+    writer.writerows(cur.fetchall())
+    cur.close()
+    return {
+        'filename': f'tournament-{tournament_id}',
+        'content_type': 'text/csv',
+        'standings_csv': standings.getvalue(),
+        'games_csv': games.getvalue()
+    }
+
+def rebuild_stats_job(job: JobContext) -> Dict[str, Any]:
+    '''Recount players' tournaments and W/L/D from confirmed tournaments, a batch of users per commit'''
+    only_ids = [int(user_id) for user_id in job.payload.get('user_ids') or []]
+    cur = job.conn.cursor()
+    while True:
+        job.check_time()
+        cur.execute("""
+            SELECT id FROM t_p79348767_tournament_site_buil.users
+            WHERE id > %s AND (cardinality(%s::integer[]) = 0 OR id = ANY(%s::integer[]))
+            ORDER BY id
+            LIMIT %s
+        """, (job.progress.get('last_id', 0), only_ids, only_ids, STATS_BATCH_SIZE))
+        batch = [row[0] for row in cur.fetchall()]
+        if not batch:
+            break
+        cur.execute("""
+            UPDATE t_p79348767_tournament_site_buil.users u
+            SET tournaments = s.tournaments, wins = s.wins, losses = s.losses, draws = s.draws
+            FROM (
+                SELECT b.id, c.tournaments, r.wins, r.losses, r.draws
+                FROM unnest(%s::integer[]) AS b(id)
+                CROSS JOIN LATERAL (
+                    SELECT COUNT(*) AS tournaments
+                    FROM t_p79348767_tournament_site_buil.tournament_participants tp
+                    JOIN t_p79348767_tournament_site_buil.tournaments t ON t.id = tp.tournament_id
+                    WHERE tp.player_id = b.id AND t.status = 'confirmed' AND t.deleted_at IS NULL
+                ) c
+                CROSS JOIN LATERAL (
+                    SELECT COALESCE(SUM(tr.wins), 0) AS wins, COALESCE(SUM(tr.losses), 0) AS losses, COALESCE(SUM(tr.draws), 0) AS draws
+                    FROM t_p79348767_tournament_site_buil.tournament_results tr
+                    JOIN t_p79348767_tournament_site_buil.tournaments t ON t.id = tr.tournament_id
+                    WHERE tr.player_id = b.id AND t.status = 'confirmed' AND t.deleted_at IS NULL
+                ) r
+            ) s
+            WHERE u.id = s.id
+              AND (u.tournaments, u.wins, u.losses, u.draws) IS DISTINCT FROM (s.tournaments, s.wins, s.losses, s.draws)
+        """, (batch,))
+        job.progress['updated'] = job.progress.get('updated', 0) + cur.rowcount
+        job.progress['checked'] = job.progress.get('checked', 0) + len(batch)
+        job.progress['last_id'] = batch[-1]
+        job.checkpoint()
+    cur.close()
+    return {'checked': job.progress.get('checked', 0), 'updated': job.progress.get('updated', 0)}
+
+def purge_tournament_job(job: JobContext) -> Dict[str, Any]:
+    '''Delete a soft-deleted tournament's rows in bounded batches, one commit each, then the tournament'''
+    tournament_id = int(job.payload['tournament_id'])
+    cur = job.conn.cursor()
+    if 'total' not in job.progress:
+        job.progress['total'] = {}
+        for table in PURGE_TABLES:
+            cur.execute(
+                f"SELECT COUNT(*) FROM t_p79348767_tournament_site_buil.{table} WHERE tournament_id = %s",
+                (tournament_id,)
+            )
+            job.progress['total'][table] = cur.fetchone()[0]
+        job.progress['deleted'] = {table: 0 for table in PURGE_TABLES}
+        job.checkpoint()
+    
+    for table in PURGE_TABLES:
+        while True:
+            job.check_time()
+            cur.execute(f"""
+                DELETE FROM t_p79348767_tournament_site_buil.{table}
+                WHERE ctid = ANY(ARRAY(
+                    SELECT ctid FROM t_p79348767_tournament_site_buil.{table}
+                    WHERE tournament_id = %s
+                    LIMIT %s
+                ))
+            """, (tournament_id, PURGE_BATCH_SIZE))
+            batch = cur.rowcount
+            job.progress['deleted'][table] = job.progress['deleted'].get(table, 0) + batch
+            job.checkpoint()
+            if batch < PURGE_BATCH_SIZE:
+                break
+    
+    # Only a tournament still marked deleted goes; one restored meanwhile keeps its row
+    cur.execute(
+        "DELETE FROM t_p79348767_tournament_site_buil.tournaments WHERE id = %s AND deleted_at IS NOT NULL",
+        (tournament_id,)
+    )
+    job.progress['tournament_deleted'] = cur.rowcount > 0
+    cur.close()
+    return {'deleted': job.progress['deleted'], 'tournament_deleted': job.progress['tournament_deleted']}
+
+JOB_FUNCTIONS: Dict[str, Callable[[JobContext], Optional[Dict[str, Any]]]] = {
+    'recalculate-ratings': recalculate_ratings_job,
+    'replay-player-rating': replay_player_rating_job,
+    'export-tournament': export_tournament_job,
+    'rebuild-stats': rebuild_stats_job,
+    'purge-tournament': purge_tournament_job
+}
+
+def claim_job(cur: Any, kinds: List[str]) -> Optional[Tuple[Any, ...]]:
+    '''Oldest ready job; an earlier unfinished job with the same serialization key holds later ones back'''
+    cur.execute("""
+        UPDATE t_p79348767_tournament_site_buil.jobs
+        SET status = 'running', attempts = attempts + 1,
+            locked_until = NOW() + make_interval(secs => %s), updated_at = NOW()
+        WHERE id = (
+            SELECT j.id FROM t_p79348767_tournament_site_buil.jobs j
+            WHERE j.status IN ('queued', 'running') AND j.run_after <= NOW()
+              AND (j.locked_until IS NULL OR j.locked_until < NOW())
+              AND j.kind = ANY(%s)
+              AND (j.serialization_key IS NULL OR NOT EXISTS (
+                  SELECT 1 FROM t_p79348767_tournament_site_buil.jobs earlier
+                  WHERE earlier.serialization_key = j.serialization_key
+                    AND earlier.id < j.id
+                    AND earlier.status IN ('queued', 'running')
+              ))
+            ORDER BY j.run_after, j.id
+            LIMIT 1
+            FOR UPDATE OF j SKIP LOCKED
+        )
+        RETURNING id, kind, payload, progress, attempts, max_attempts
+    """, (JOB_LEASE_SECONDS, kinds))
+    return cur.fetchone()
+
+def backoff_seconds(attempts: int) -> float:
+    '''Exponential backoff with jitter so failing jobs do not retry in lockstep'''
+    delay = min(JOB_BACKOFF_BASE_SECONDS * 2 ** (attempts - 1), JOB_BACKOFF_MAX_SECONDS)
+    return delay * random.uniform(0.5, 1.0)
+
+def run_job(conn: Any, job: Tuple[Any, ...], deadline: float) -> str:
+    '''Run one claimed job; its writes commit together with the done status'''
+    job_id, kind, payload, progress, attempts, max_attempts = job
+    context = JobContext(conn, job_id, payload or {}, progress or {}, deadline)
+    cur = conn.cursor()
+    try:
+        function = JOB_FUNCTIONS.get(kind)
+        if function is None:
+            raise ValueError(f'Unknown job kind: {kind}')
+        result = function(context)
+        cur.execute("""
+            UPDATE t_p79348767_tournament_site_buil.jobs
+            SET status = 'done', result = %s::jsonb, progress = %s::jsonb,
+                locked_until = NULL, finished_at = NOW(), updated_at = NOW()
+            WHERE id = %s
+        """, (json.dumps(result), json.dumps(context.progress), job_id))
+        conn.commit()
+        return 'done'
+    except Reschedule:
+        conn.rollback()
+        cur.execute("""
+            UPDATE t_p79348767_tournament_site_buil.jobs
+            SET status = 'queued', attempts = attempts - 1, locked_until = NULL, updated_at = NOW()
+            WHERE id = %s
+        """, (job_id,))
+        conn.commit()
+        return 'rescheduled'
+    except Exception as e:
+        conn.rollback()
+        final = attempts >= max_attempts
+        print(f'Job {job_id} ({kind}) failed, attempt {attempts}/{max_attempts}: {str(e)}')
+        cur.execute("""
+            UPDATE t_p79348767_tournament_site_buil.jobs
+            SET status = %s, last_error = %s, locked_until = NULL, updated_at = NOW(),
+                run_after = NOW() + make_interval(secs => %s),
+                finished_at = CASE WHEN %s THEN NOW() END
+            WHERE id = %s
+        """, ('failed' if final else 'queued', str(e), 0 if final else backoff_seconds(attempts), final, job_id))
+        conn.commit()
+        return 'failed' if final else 'retrying'
+    finally:
+        cur.close()
+
+def work(budget_seconds: float, kinds: List[str]) -> Dict[str, int]:
+    '''One worker: claim and run jobs until the queue is drained or the budget is spent'''
+    deadline = time.monotonic() + budget_seconds
+    outcomes: Dict[str, int] = {}
+    conn = get_connection()
+    try:
+        while time.monotonic() < deadline:
+            cur = conn.cursor()
+            job = claim_job(cur, kinds)
+            conn.commit()
+            cur.close()
+            if not job:
+                break
+            outcome = run_job(conn, job, deadline)
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+    finally:
+        release_connection(conn)
+    return outcomes
+
+def run_workers(workers: int, budget_seconds: float, kinds: List[str]) -> Dict[str, int]:
+    '''Workers in spawned processes (nothing inherited from the pool), threads where processes are unavailable'''
+    # Imported here: only the worker timer pays for them, not every cold start
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+    arguments = ([budget_seconds] * workers, [kinds] * workers)
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+            results = list(pool.map(work, *arguments))
+    except Exception as e:
+        print(f'Process pool unavailable, running workers in threads: {str(e)}')
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(work, *arguments))
+    totals: Dict[str, int] = {}
+    for outcomes in results:
+        for outcome, count in outcomes.items():
+            totals[outcome] = totals.get(outcome, 0) + count
+    return totals
+
+# Outbox dispatcher: pending events become derived-data jobs, coalesced per tournament within a batch
+OUTBOX_BATCH_SIZE = int(os.environ.get('OUTBOX_BATCH_SIZE', '500'))
+OUTBOX_RETENTION_HOURS = int(os.environ.get('OUTBOX_RETENTION_HOURS', '24'))
+GAME_EVENTS = ('result-entered', 'round-deleted', 'pairings-published')
+
+def plan_outbox_jobs(cur: Any, events: List[Tuple[Any, ...]]) -> List[Tuple[str, Dict[str, Any], str]]:
+    '''One job per tournament and kind however many events asked for it'''
+    tournament_ids = sorted({event[1] for event in events if event[1] is not None})
+    cur.execute(
+        'SELECT id, status FROM t_p79348767_tournament_site_buil.tournaments WHERE id = ANY(%s) AND deleted_at IS NULL',
+        (tournament_ids,)
+    )
+    confirmed = {row[0] for row in cur.fetchall() if row[1] == 'confirmed'}
+    
+    # Player totals (tournaments, W/L/D) have one writer, the client's confirmation; rebuild-stats only
+    # sees tournaments with saved results, so it stays a manual repair and is never queued from events
+    ratings: set = set()
+    for _, tournament_id, event_type, payload in events:
+        if tournament_id not in confirmed:
+            continue
+        changed = (payload or {}).get('changed') or []
+        just_confirmed = event_type == 'tournament-updated' and 'status' in changed
+        # Ratings follow results once the tournament counts
+        if event_type in GAME_EVENTS or just_confirmed:
+            ratings.add(tournament_id)
+    
+    return [('recalculate-ratings', {'tournament_id': tournament_id}, f'tournament:{tournament_id}')
+            for tournament_id in sorted(ratings)]
+
+def dispatch_outbox() -> Dict[str, int]:
+    '''Drain pending outbox events in batches; SKIP LOCKED lets overlapping timer runs split the work'''
+    dispatched = 0
+    queued = 0
+    conn = get_connection()
+    try:
+        cur = conn.cursor()
+        while True:
+            cur.execute("""
+                SELECT id, tournament_id, event_type, payload
+                FROM t_p79348767_tournament_site_buil.outbox
+                WHERE dispatched_at IS NULL
+                ORDER BY id
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+            """, (OUTBOX_BATCH_SIZE,))
+            events = cur.fetchall()
+            if not events:
+                break
+            for kind, payload, serialization_key in plan_outbox_jobs(cur, events):
+                enqueue_job(cur, kind, payload, serialization_key)
+                queued += 1
+            cur.execute(
+                'UPDATE t_p79348767_tournament_site_buil.outbox SET dispatched_at = NOW() WHERE id = ANY(%s)',
+                ([event[0] for event in events],)
+            )
+            conn.commit()
+            dispatched += len(events)
+            if len(events) < OUTBOX_BATCH_SIZE:
+                break
+        
+        cur.execute("""
+            DELETE FROM t_p79348767_tournament_site_buil.outbox
+            WHERE id IN (
+                SELECT id FROM t_p79348767_tournament_site_buil.outbox
+                WHERE dispatched_at < NOW() - make_interval(hours => %s)
+                LIMIT %s
+            )
+        """, (OUTBOX_RETENTION_HOURS, OUTBOX_BATCH_SIZE))
+        conn.commit()
+        cur.close()
+    finally:
+        release_connection(conn)
+    return {'events': dispatched, 'jobs': queued}
+
+def is_worker_run(event: Dict[str, Any]) -> bool:
+    return event.get('task') == 'run-jobs'
+
+def json_response(status_code: int, payload: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'statusCode': status_code,
+        'headers': {
+            'Content-Type': 'application/json',
+            'Access-Control-Allow-Origin': '*'
+        },
+        'isBase64Encoded': False,
+        'body': json.dumps(payload, default=str)
+    }
+
+def can_manage_tournament(cursor: Any, claims: Dict[str, Any], tournament_id: int) -> bool:
+    '''Admin or the tournament's judge; judgeOf may lag behind a fresh assignment, so fall back to the row'''
+    if judges_tournament(claims, tournament_id):
+        return True
+    if claims.get('role') != 'judge':
+        return False
+    cursor.execute(
+        'SELECT judge_id FROM t_p79348767_tournament_site_buil.tournaments WHERE id = %s',
+        (tournament_id,)
+    )
+    row = cursor.fetchone()
+    return bool(row) and row[0] == claims.get('userId')
+
+def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    '''
+    Business: Background jobs - the timer dispatches the outbox and runs workers over the queue,
+              GET ?id= reports a job, POST queues one
+    Args: event - {"task": "run-jobs"} from the timer trigger, or httpMethod with queryStringParameters (id)
+          or body (kind: export-tournament | recalculate-ratings with tournament_id, rebuild-stats with user_ids)
+          context - execution context
+    Returns: dispatched outbox events and worker outcome counts, job status with progress and result, or 202 with job_id
+    '''
+    if is_warm_up(event):
+        return warm_up()
+    
+    if is_worker_run(event):
+        kinds = event.get('kinds') or list(JOB_FUNCTIONS)
+        dispatched = dispatch_outbox()
+        return json_response(200, {'outbox': dispatched, 'outcomes': run_workers(JOB_WORKERS, JOB_TIME_BUDGET_SECONDS, kinds)})
+    
+    method = event.get('httpMethod', 'GET')
+    if method == 'OPTIONS':
+        return {
+            'statusCode': 200,
+            'headers': {
+                'Access-Control-Allow-Origin': '*',
+                'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
+                'Access-Control-Allow-Headers': 'Content-Type, X-Auth-Token',
+                'Access-Control-Max-Age': '86400'
+            },
+            'isBase64Encoded': False,
+            'body': ''
+        }
+    
+    if method not in ['GET', 'POST']:
+        return json_response(405, {'error': 'Method not allowed'})
+    
+    is_valid, claims, error_msg = verify_token(event)
+    if not is_valid:
+        return create_auth_error(error_msg or 'Unauthorized')
+    
+    conn = get_connection()
+    cur = conn.cursor()
+    try:
+        if method == 'GET':
+            try:
+                job_id = int((event.get('queryStringParameters') or {}).get('id'))
+            except (TypeError, ValueError):
+                return json_response(400, {'error': 'id is required'})
+            job = read_job(cur, job_id)
+            return json_response(200, job) if job else json_response(404, {'error': 'Job not found'})
+        
+        data = json.loads(event.get('body') or '{}')
+        kind = data.get('kind')
+        if kind == 'rebuild-stats':
+            if not is_admin(claims):
+                return create_auth_error('Insufficient permissions', 403)
+            job_id = enqueue_job(cur, kind, {'user_ids': sorted(int(user_id) for user_id in data.get('user_ids') or [])}, 'stats')
+        elif kind in ['export-tournament', 'recalculate-ratings']:
+            try:
+                tournament_id = int(data.get('tournament_id'))
+            except (TypeError, ValueError):
+                return json_response(400, {'error': 'tournament_id is required'})
+            if not can_manage_tournament(cur, claims, tournament_id):
+                return create_auth_error('Insufficient permissions', 403)
+            job_id = enqueue_job(cur, kind, {'tournament_id': tournament_id}, f'tournament:{tournament_id}')
+        else:
+            return json_response(400, {'error': 'kind must be export-tournament, recalculate-ratings or rebuild-stats'})
+        conn.commit()
+        return json_response(202, {'success': True, 'job_id': job_id})
+    finally:
+        cur.close()
+        release_connection(conn)
@@ -0,0 +1,341 @@
+import json
+import os
+import sys
+import importlib
+import threading
+import time
+from urllib.parse import urlsplit, parse_qsl
+from typing import Dict, Any, List, Optional, Tuple, Set
+
+# Lazy imports and warm connections inline (shared module doesn't work in cloud functions)
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', '2'))
+DB_IDLE_PING_SECONDS = float(os.environ.get('DB_IDLE_PING_SECONDS', '30'))
+
+class LazyModule:
+    '''Defers importing a heavy dependency until its first attribute access'''
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def load(self) -> Any:
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.load(), attr)
+
+psycopg2 = LazyModule('psycopg2')
+# Only the self-hosted server runs an event loop; serverless requests never pay for importing asyncio
+asyncio = LazyModule('asyncio')
+_idle_connections: List[Tuple[Any, float]] = []
+_pool_lock = threading.Lock()
+
+def get_connection() -> Any:
+    '''Reuse an idle connection of this warm instance, pinging it after a long idle period'''
+    with _pool_lock:
+        conn, released_at = _idle_connections.pop() if _idle_connections else (None, 0.0)
+    if conn is not None and not conn.closed and time.monotonic() - released_at > DB_IDLE_PING_SECONDS:
+        try:
+            ping_cursor = conn.cursor()
+            ping_cursor.execute('SELECT 1')
+            ping_cursor.close()
+            conn.rollback()
+        except psycopg2.Error:
+            conn.close()
+    if conn is None or conn.closed:
+        conn = psycopg2.connect(os.environ['DATABASE_URL'])
+    return conn
+
+def release_connection(conn: Any) -> None:
+    '''Return a connection to the idle pool in a clean transaction state'''
+    if conn.closed:
+        return
+    try:
+        if conn.autocommit:
+            conn.autocommit = False
+        else:
+            conn.rollback()
+    except psycopg2.Error:
+        conn.close()
+        return
+    with _pool_lock:
+        if len(_idle_connections) < DB_POOL_SIZE:
+            _idle_connections.append((conn, time.monotonic()))
+            return
+    conn.close()
+
+def is_warm_up(event: Dict[str, Any]) -> bool:
+    return bool(event.get('warmup')) or event.get('httpMethod') == 'WARMUP'
+
+def warm_up() -> Dict[str, Any]:
+    '''Init phase: import heavy modules and fill the idle pool before real traffic arrives'''
+    started = time.perf_counter()
+    for module in (psycopg2,):
+        module.load()
+    warmed = 0
+    if os.environ.get('DATABASE_URL'):
+        connections = [get_connection() for _ in range(DB_POOL_SIZE)]
+        for conn in connections:
+            release_connection(conn)
+        warmed = len(connections)
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json'},
+        'isBase64Encoded': False,
+        'body': json.dumps({'warm': True, 'connections': warmed, 'ms': round((time.perf_counter() - started) * 1000, 1)})
+    }
+
+if os.environ.get('PREWARM_ON_IMPORT') == '1':
+    warm_up()
+
+# Live feed: outbox rows of a tournament as SSE events. Outbox inserts NOTIFY tournament_events with the whole
+# (small) event, so the self-hosted server pushes it to every client of the room without querying.
+LIVE_CHANNEL = 'tournament_events'
+LIVE_BACKLOG_LIMIT = 500
+LIVE_RETRY_MS = int(os.environ.get('LIVE_RETRY_MS', '3000'))
+LIVE_HEARTBEAT_SECONDS = 15
+LIVE_CLIENT_BUFFER_BYTES = 256 * 1024
+# Outbox ids come from a sequence at insert time, so a long transaction can commit an id below one a client
+# already saw. Every resume re-reads the events created within this window; clients drop ids they already have
+LIVE_RESUME_OVERLAP_SECONDS = int(os.environ.get('LIVE_RESUME_OVERLAP_SECONDS', '60'))
+
+def sse_event_name(event_type: str, payload: Dict[str, Any]) -> str:
+    '''Outbox event type to the live event a screen reacts to'''
+    if event_type in ('pairings-published', 'round-deleted'):
+        return 'pairings'
+    if event_type == 'result-entered':
+        return 'result'
+    if event_type == 'tournament-updated':
+        return 'round' if 'current_round' in (payload.get('changed') or []) else 'tournament'
+    return 'standings'
+
+def format_event(event_id: int, tournament_id: int, event_type: str, payload: Dict[str, Any], created_at: Any) -> bytes:
+    data = json.dumps({'type': event_type, 'tournament_id': tournament_id, 'payload': payload, 'at': str(created_at)})
+    return f'id: {event_id}\nevent: {sse_event_name(event_type, payload)}\ndata: {data}\n\n'.encode('utf-8')
+
+def parse_last_event_id(headers: Dict[str, Any], params: Dict[str, Any]) -> Optional[int]:
+    '''EventSource resends the last id it saw as Last-Event-ID; a last_event_id parameter does the same for polling'''
+    value = headers.get('last-event-id') or headers.get('Last-Event-ID') or params.get('last_event_id')
+    try:
+        return int(value) if value not in (None, '') else None
+    except (TypeError, ValueError):
+        return None
+
+def read_events(cursor: Any, tournament_id: int, last_event_id: Optional[int]) -> Tuple[List[bytes], int]:
+    '''Events after last_event_id plus the overlap window (none for a fresh client), ending on the id to resume from'''
+    if last_event_id is None:
+        cursor.execute(
+            'SELECT COALESCE(MAX(id), 0) FROM t_p79348767_tournament_site_buil.outbox WHERE tournament_id = %s',
+            (tournament_id,)
+        )
+        resume_id = cursor.fetchone()[0]
+        return [f'id: {resume_id}\n\n'.encode('utf-8')], resume_id
+    cursor.execute("""
+        SELECT id, tournament_id, event_type, payload, created_at
+        FROM t_p79348767_tournament_site_buil.outbox
+        WHERE tournament_id = %s
+          AND (id > %s OR created_at > NOW() - make_interval(secs => %s))
+        ORDER BY id
+        LIMIT %s
+    """, (tournament_id, last_event_id, LIVE_RESUME_OVERLAP_SECONDS, LIVE_BACKLOG_LIMIT))
+    rows = cursor.fetchall()
+    chunks = [format_event(*row) for row in rows]
+    resume_id = max([last_event_id] + [row[0] for row in rows])
+    # Re-read events can all be older than the cursor; the last id sent must never move it back
+    if not rows or rows[-1][0] < resume_id:
+        chunks.append(f'id: {resume_id}\n\n'.encode('utf-8'))
+    return chunks, resume_id
+
+def load_backlog(tournament_id: int, last_event_id: Optional[int]) -> Tuple[List[bytes], int]:
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        result = read_events(cursor, tournament_id, last_event_id)
+        cursor.close()
+    finally:
+        release_connection(conn)
+    return result
+
+class LiveHub:
+    '''Self-hosted fan-out: one LISTEN connection feeds every SSE client, grouped into rooms by tournament'''
+    def __init__(self, loop: 'asyncio.AbstractEventLoop'):
+        self.loop = loop
+        self.rooms: Dict[int, Set['asyncio.StreamWriter']] = {}
+        self.last_ids: Dict[int, int] = {}
+        self.listen_conn: Any = None
+
+    def connect(self) -> None:
+        conn = psycopg2.connect(os.environ['DATABASE_URL'])
+        conn.autocommit = True
+        cursor = conn.cursor()
+        cursor.execute(f'LISTEN {LIVE_CHANNEL}')
+        cursor.close()
+        self.listen_conn = conn
+        self.loop.add_reader(conn.fileno(), self.on_notify)
+
+    def on_notify(self) -> None:
+        try:
+            self.listen_conn.poll()
+        except psycopg2.Error as e:
+            print(f'Live listener lost: {str(e)}')
+            self.loop.remove_reader(self.listen_conn.fileno())
+            self.loop.create_task(self.reconnect())
+            return
+        while self.listen_conn.notifies:
+            message = json.loads(self.listen_conn.notifies.pop(0).payload)
+            self.broadcast(message['tid'], message['id'], format_event(
+                message['id'], message['tid'], message['type'], message['payload'], message['at']
+            ))
+
+    async def reconnect(self) -> None:
+        '''Listen again, then replay from each room's last id whatever was published while nobody listened'''
+        while True:
+            await asyncio.sleep(1)
+            try:
+                await self.loop.run_in_executor(None, self.connect)
+                break
+            except Exception as e:
+                print(f'Live listener reconnect failed: {str(e)}')
+        for tournament_id, last_id in list(self.last_ids.items()):
+            chunks, resume_id = await self.loop.run_in_executor(None, load_backlog, tournament_id, last_id)
+            for chunk in chunks:
+                self.broadcast(tournament_id, None, chunk)
+            self.last_ids[tournament_id] = max(self.last_ids.get(tournament_id, 0), resume_id)
+
+    def broadcast(self, tournament_id: int, event_id: Optional[int], chunk: bytes) -> None:
+        if event_id is not None:
+            self.last_ids[tournament_id] = max(self.last_ids.get(tournament_id, 0), event_id)
+        for writer in list(self.rooms.get(tournament_id, ())):
+            self.send(tournament_id, writer, chunk)
+
+    def send(self, tournament_id: int, writer: 'asyncio.StreamWriter', chunk: bytes) -> None:
+        # A client that cannot keep up is dropped; EventSource reconnects and resumes from Last-Event-ID
+        if writer.transport.get_write_buffer_size() > LIVE_CLIENT_BUFFER_BYTES:
+            self.leave(tournament_id, writer)
+            writer.close()
+            return
+        writer.write(chunk)
+
+    def leave(self, tournament_id: int, writer: 'asyncio.StreamWriter') -> None:
+        room = self.rooms.get(tournament_id)
+        if room is not None:
+            room.discard(writer)
+            if not room:
+                del self.rooms[tournament_id]
+
+    async def serve_client(self, reader: 'asyncio.StreamReader', writer: 'asyncio.StreamWriter') -> None:
+        tournament_id = None
+        try:
+            request_line = (await reader.readline()).decode('latin-1').split()
+            headers: Dict[str, str] = {}
+            while True:
+                line = (await reader.readline()).decode('latin-1').strip()
+                if not line:
+                    break
+                name, _, value = line.partition(':')
+                headers[name.strip().lower()] = value.strip()
+            params = dict(parse_qsl(urlsplit(request_line[1] if len(request_line) > 1 else '/').query))
+            try:
+                tournament_id = int(params.get('tournament_id'))
+            except (TypeError, ValueError):
+                writer.write(b'HTTP/1.1 400 Bad Request\r\nAccess-Control-Allow-Origin: *\r\nContent-Length: 0\r\n\r\n')
+                return
+            
+            writer.write((
+                'HTTP/1.1 200 OK\r\n'
+                'Content-Type: text/event-stream\r\n'
+                'Cache-Control: no-cache\r\n'
+                'Connection: keep-alive\r\n'
+                'Access-Control-Allow-Origin: *\r\n\r\n'
+                f'retry: {LIVE_RETRY_MS}\n\n'
+            ).encode('utf-8'))
+            # Join the room before reading the backlog so no event falls between the two (duplicates are harmless)
+            self.rooms.setdefault(tournament_id, set()).add(writer)
+            chunks, _ = await self.loop.run_in_executor(
+                None, load_backlog, tournament_id, parse_last_event_id(headers, params)
+            )
+            for chunk in chunks:
+                writer.write(chunk)
+            
+            while not reader.at_eof():
+                try:
+                    await asyncio.wait_for(reader.read(1024), LIVE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    writer.write(b': ping\n\n')
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            if tournament_id is not None:
+                self.leave(tournament_id, writer)
+            writer.close()
+
+async def serve(host: str, port: int) -> None:
+    loop = asyncio.get_running_loop()
+    hub = LiveHub(loop)
+    await loop.run_in_executor(None, hub.connect)
+    server = await asyncio.start_server(hub.serve_client, host, port)
+    print(f'Live feed on {host}:{port}')
+    async with server:
+        await server.serve_forever()
+
+def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    '''
+    Business: Live feed of a tournament as Server-Sent Events (pairings, result, round, standings). Serverless responses
+              carry the events after Last-Event-ID plus a retry hint, so EventSource reconnects and resumes; the
+              self-hosted server (python backend/live/index.py --port 8080) keeps streams open instead
+    Args: event - dict with httpMethod, queryStringParameters (tournament_id, last_event_id), headers (Last-Event-ID)
+          context - execution context
+    Returns: text/event-stream response
+    '''
+    if is_warm_up(event):
+        return warm_up()
+    
+    method = event.get('httpMethod', 'GET')
+    if method == 'OPTIONS':
+        return {
+            'statusCode': 200,
+            'headers': {
+                'Access-Control-Allow-Origin': '*',
+                'Access-Control-Allow-Methods': 'GET, OPTIONS',
+                'Access-Control-Allow-Headers': 'Content-Type, Last-Event-ID',
+                'Access-Control-Max-Age': '86400'
+            },
+            'isBase64Encoded': False,
+            'body': ''
+        }
+    
+    params = event.get('queryStringParameters') or {}
+    try:
+        tournament_id = int(params.get('tournament_id'))
+    except (TypeError, ValueError):
+        return {
+            'statusCode': 400,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'isBase64Encoded': False,
+            'body': json.dumps({'error': 'tournament_id is required'})
+        }
+    
+    chunks, _ = load_backlog(tournament_id, parse_last_event_id(event.get('headers') or {}, params))
+    body = f'retry: {LIVE_RETRY_MS}\n\n'.encode('utf-8') + b''.join(chunks)
+    return {
+        'statusCode': 200,
+        'headers': {
+            'Content-Type': 'text/event-stream',
+            'Cache-Control': 'no-cache',
+            'Access-Control-Allow-Origin': '*'
+        },
+        'isBase64Encoded': False,
+        'body': body.decode('utf-8')
+    }
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Self-hosted live feed server')
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8080)
+    args = parser.parse_args()
+    if not os.environ.get('DATABASE_URL'):
+        sys.exit('DATABASE_URL is required')
+    asyncio.run(serve(args.host, args.port))
@@ -1,18 +1,451 @@
 import json
 import os
-import psycopg2
-from typing import Dict, Any, List, Tuple
+import hashlib
+import importlib
+import sys
+import io
+import time
+import marshal
+import threading
+import functools
+import collections
+from typing import Dict, Any, List, Optional, Tuple
+from collections import OrderedDict
 from collections import defaultdict
 
+# Lazy imports and warm connections inline (shared module doesn't work in cloud functions)
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', '2'))
+DB_IDLE_PING_SECONDS = float(os.environ.get('DB_IDLE_PING_SECONDS', '30'))
+
+class LazyModule:
+    '''Defers importing a heavy dependency until its first attribute access'''
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def load(self) -> Any:
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.load(), attr)
+
+psycopg2 = LazyModule('psycopg2')
+jwt = LazyModule('jwt')
+cProfile = LazyModule('cProfile')
+pstats = LazyModule('pstats')
+_idle_connections: List[Tuple[Any, float]] = []
+_pool_lock = threading.Lock()
+
+def get_connection() -> Any:
+    '''Reuse an idle connection of this warm instance, pinging it after a long idle period'''
+    with _pool_lock:
+        conn, released_at = _idle_connections.pop() if _idle_connections else (None, 0.0)
+    if conn is not None and not conn.closed and time.monotonic() - released_at > DB_IDLE_PING_SECONDS:
+        try:
+            ping_cursor = conn.cursor()
+            ping_cursor.execute('SELECT 1')
+            ping_cursor.close()
+            conn.rollback()
+        except psycopg2.Error:
+            conn.close()
+    if conn is None or conn.closed:
+        conn = psycopg2.connect(os.environ['DATABASE_URL'])
+    return conn
+
+def release_connection(conn: Any) -> None:
+    '''Return a connection to the idle pool in a clean transaction state'''
+    if conn.closed:
+        return
+    try:
+        if conn.autocommit:
+            conn.autocommit = False
+        else:
+            conn.rollback()
+    except psycopg2.Error:
+        conn.close()
+        return
+    with _pool_lock:
+        if len(_idle_connections) < DB_POOL_SIZE:
+            _idle_connections.append((conn, time.monotonic()))
+            return
+    conn.close()
+
+def is_warm_up(event: Dict[str, Any]) -> bool:
+    return bool(event.get('warmup')) or event.get('httpMethod') == 'WARMUP'
+
+def warm_up() -> Dict[str, Any]:
+    '''Init phase: import heavy modules and fill the idle pool before real traffic arrives'''
+    started = time.perf_counter()
+    for module in (psycopg2, jwt):
+        module.load()
+    warmed = 0
+    if os.environ.get('DATABASE_URL'):
+        connections = [get_connection() for _ in range(DB_POOL_SIZE)]
+        for conn in connections:
+            release_connection(conn)
+        warmed = len(connections)
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json'},
+        'isBase64Encoded': False,
+        'body': json.dumps({'warm': True, 'connections': warmed, 'ms': round((time.perf_counter() - started) * 1000, 1)})
+    }
+
+if os.environ.get('PREWARM_ON_IMPORT') == '1':
+    warm_up()
+
+# Auth inline (shared module doesn't work in cloud functions); scripts/check_inline.py keeps copies identical
+AUTH_CACHE_SIZE = int(os.environ.get('AUTH_CACHE_SIZE', '1024'))
+_verified_tokens: 'OrderedDict[bytes, Tuple[Dict[str, Any], float]]' = OrderedDict()
+_auth_lock = threading.Lock()
+
+def get_jwt_secret() -> Optional[str]:
+    return os.environ.get('JWT_SECRET')
+
+def decode_token(token: str) -> Dict[str, Any]:
+    '''HS256 verification memoized by token digest until the token expires (bounded LRU)'''
+    digest = hashlib.sha256(token.encode('utf-8')).digest()
+    now = time.time()
+    with _auth_lock:
+        cached = _verified_tokens.get(digest)
+        if cached is not None:
+            if cached[1] > now:
+                _verified_tokens.move_to_end(digest)
+                return cached[0]
+            del _verified_tokens[digest]
+    payload = jwt.decode(token, get_jwt_secret(), algorithms=['HS256'])
+    with _auth_lock:
+        _verified_tokens[digest] = (payload, float(payload.get('exp', now + 60)))
+        while len(_verified_tokens) > AUTH_CACHE_SIZE:
+            _verified_tokens.popitem(last=False)
+    return payload
+
+def verify_token(event: Dict[str, Any]) -> Tuple[bool, Optional[Dict], Optional[str]]:
+    '''Verify JWT token from request headers'''
+    headers = event.get('headers') or {}
+    token = headers.get('x-auth-token') or headers.get('X-Auth-Token')
+    
+    if not token:
+        return False, None, 'Missing authentication token'
+    
+    if not get_jwt_secret():
+        return False, None, 'Server configuration error'
+    
+    try:
+        payload = decode_token(token)
+    except jwt.ExpiredSignatureError:
+        return False, None, 'Token expired'
+    except jwt.InvalidTokenError:
+        return False, None, 'Invalid token'
+    
+    if is_token_revoked(payload):
+        return False, None, 'Token revoked'
+    
+    return True, payload, None
+
+def create_auth_error(message: str, status_code: int = 401) -> Dict[str, Any]:
+    '''Create authentication error response'''
+    return {
+        'statusCode': status_code,
+        'headers': {
+            'Content-Type': 'application/json',
+            'Access-Control-Allow-Origin': '*'
+        },
+        'isBase64Encoded': False,
+        'body': json.dumps({'error': message, 'success': False})
+    }
+
+def is_admin(claims: Dict[str, Any]) -> bool:
+    return claims.get('role') == 'admin'
+
+def judges_tournament(claims: Dict[str, Any], tournament_id: Any) -> bool:
+    '''Admins manage every tournament, judges the ones listed in their judgeOf claim'''
+    if is_admin(claims):
+        return True
+    try:
+        return int(tournament_id) in (claims.get('judgeOf') or [])
+    except (TypeError, ValueError):
+        return False
+
+# Token revocation: bloom filter of revoked jti values plus an exact set of the latest ones
+REVOCATION_REFRESH_SECONDS = float(os.environ.get('REVOCATION_REFRESH_SECONDS', '15'))
+REVOCATION_REBUILD_SECONDS = 3600
+REVOCATION_RECENT_SIZE = 256
+BLOOM_BITS = 1 << 16
+BLOOM_HASHES = 7
+
+class BloomFilter:
+    '''Fixed-size bloom filter over strings using double hashing of a SHA-256 digest'''
+    def __init__(self, bits: int = BLOOM_BITS, hashes: int = BLOOM_HASHES):
+        self.bits = bits
+        self.hashes = hashes
+        self.array = bytearray(bits // 8)
+
+    def _positions(self, value: str) -> List[int]:
+        digest = hashlib.sha256(value.encode('utf-8')).digest()
+        first = int.from_bytes(digest[:8], 'big')
+        second = int.from_bytes(digest[8:16], 'big') | 1
+        return [(first + i * second) % self.bits for i in range(self.hashes)]
+
+    def add(self, value: str) -> None:
+        for position in self._positions(value):
+            self.array[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value: str) -> bool:
+        return all(self.array[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+_revocation_bloom = BloomFilter()
+_recent_revocations: 'OrderedDict[str, None]' = OrderedDict()
+_revocation_watermark: Optional[Any] = None
+_revocations_refreshed_at = float('-inf')
+_revocations_built_at = float('-inf')
+
+def remember_revocation(jti: str) -> None:
+    with _auth_lock:
+        _revocation_bloom.add(jti)
+        _recent_revocations[jti] = None
+        _recent_revocations.move_to_end(jti)
+        while len(_recent_revocations) > REVOCATION_RECENT_SIZE:
+            _recent_revocations.popitem(last=False)
+
+def refresh_revocations() -> None:
+    '''Pull revocations newer than the watermark; rebuild hourly so expired ids leave the filter'''
+    global _revocation_bloom, _revocation_watermark, _revocations_refreshed_at, _revocations_built_at
+    now = time.monotonic()
+    rebuild = now - _revocations_built_at > REVOCATION_REBUILD_SECONDS
+    watermark = None if rebuild else _revocation_watermark
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        # Overlap the watermark a little so revocations committed out of order are not skipped
+        cursor.execute("""
+            SELECT jti, revoked_at FROM t_p79348767_tournament_site_buil.revoked_tokens
+            WHERE expires_at > NOW()
+              AND (%s::timestamptz IS NULL OR revoked_at > %s::timestamptz - INTERVAL '5 seconds')
+            ORDER BY revoked_at
+        """, (watermark, watermark))
+        rows = cursor.fetchall()
+        cursor.close()
+    finally:
+        release_connection(conn)
+    
+    if rebuild:
+        with _auth_lock:
+            _revocation_bloom = BloomFilter()
+            _recent_revocations.clear()
+        _revocations_built_at = now
+    for jti, revoked_at in rows:
+        remember_revocation(jti)
+        watermark = revoked_at
+    _revocation_watermark = watermark
+    _revocations_refreshed_at = now
+
+def is_token_revoked(claims: Dict[str, Any]) -> bool:
+    '''Exact set and bloom filter answer locally; a bloom hit or a stale filter costs a database lookup'''
+    jti = claims.get('jti')
+    if not jti:
+        return False
+    if time.monotonic() - _revocations_refreshed_at > REVOCATION_REFRESH_SECONDS:
+        try:
+            refresh_revocations()
+        except Exception as e:
+            print(f'Revocation refresh failed: {str(e)}')
+    if jti in _recent_revocations:
+        return True
+    # A miss only proves "not revoked" while the filter is fresh; after a failed refresh check exactly (fail closed)
+    stale = time.monotonic() - _revocations_refreshed_at > REVOCATION_REFRESH_SECONDS
+    if jti not in _revocation_bloom and not stale:
+        return False
+    try:
+        conn = get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                'SELECT 1 FROM t_p79348767_tournament_site_buil.revoked_tokens WHERE jti = %s',
+                (jti,)
+            )
+            revoked = cursor.fetchone() is not None
+            cursor.close()
+        finally:
+            release_connection(conn)
+    except Exception:
+        return True
+    if revoked:
+        remember_revocation(jti)
+    return revoked
+
+# Job queue inline (shared module doesn't work in cloud functions); workers live in backend/jobs
+JOB_MAX_ATTEMPTS = int(os.environ.get('JOB_MAX_ATTEMPTS', '5'))
+
+def enqueue_job(cur: Any, kind: str, payload: Dict[str, Any], serialization_key: Optional[str] = None) -> int:
+    '''Queue a job; an identical one still waiting in the queue is reused instead of piling up duplicates'''
+    encoded = json.dumps(payload, sort_keys=True)
+    cur.execute("""
+        SELECT id FROM t_p79348767_tournament_site_buil.jobs
+        WHERE kind = %s AND status = 'queued' AND payload = %s::jsonb
+          AND serialization_key IS NOT DISTINCT FROM %s
+        ORDER BY id
+        LIMIT 1
+    """, (kind, encoded, serialization_key))
+    row = cur.fetchone()
+    if row:
+        return row[0]
+    cur.execute("""
+        INSERT INTO t_p79348767_tournament_site_buil.jobs (kind, payload, serialization_key, max_attempts)
+        VALUES (%s, %s::jsonb, %s, %s)
+        RETURNING id
+    """, (kind, encoded, serialization_key, JOB_MAX_ATTEMPTS))
+    return cur.fetchone()[0]
+
+def read_job(cur: Any, job_id: int) -> Optional[Dict[str, Any]]:
+    '''Status, progress and result of one job in API shape'''
+    cur.execute("""
+        SELECT id, kind, status, progress, result, attempts, last_error, run_after, created_at, finished_at
+        FROM t_p79348767_tournament_site_buil.jobs
+        WHERE id = %s
+    """, (job_id,))
+    row = cur.fetchone()
+    if not row:
+        return None
+    return {
+        'job_id': row[0],
+        'kind': row[1],
+        'status': row[2],
+        'progress': row[3],
+        'result': row[4],
+        'attempts': row[5],
+        'last_error': row[6],
+        'run_after': row[7].isoformat() if row[7] else None,
+        'created_at': row[8].isoformat() if row[8] else None,
+        'finished_at': row[9].isoformat() if row[9] else None
+    }
+
+# On-demand profiling inline (shared module doesn't work in cloud functions)
+PROFILE_ENABLED = os.environ.get('PROFILE_HANDLER') == '1'
+PROFILE_MODE = os.environ.get('PROFILE_MODE', 'cprofile')
+PROFILE_STORE = os.environ.get('PROFILE_STORE', 'dir')
+PROFILE_DIR = os.environ.get('PROFILE_DIR', '/tmp/profiles')
+PROFILE_SAMPLE_INTERVAL = float(os.environ.get('PROFILE_SAMPLE_INTERVAL', '0.005'))
+
+def requested_profile_mode(event: Dict[str, Any]) -> Optional[str]:
+    '''Profiling mode for this invocation: PROFILE_HANDLER env or X-Profile header from an admin'''
+    if PROFILE_ENABLED:
+        return PROFILE_MODE
+    headers = event.get('headers') or {}
+    requested = headers.get('X-Profile') or headers.get('x-profile')
+    if not requested:
+        return None
+    is_valid, user_data, _ = verify_token(event)
+    if not is_valid or user_data.get('role') != 'admin':
+        return None
+    return requested if requested in ('cprofile', 'sample') else PROFILE_MODE
+
+class StackSampler(threading.Thread):
+    '''Samples one thread's stack into folded (flame graph) lines'''
+    def __init__(self, thread_id: int, interval: float):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: collections.Counter = collections.Counter()
+        self.stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def folded(self) -> str:
+        return '\n'.join(f'{stack} {count}' for stack, count in self.stacks.most_common())
+
+def store_profile(function_name: str, request_id: str, mode: str, duration_ms: float, report: str, raw: Optional[bytes]) -> None:
+    '''Persist a profile keyed by request_id in PROFILE_DIR or the handler_profiles table'''
+    if PROFILE_STORE == 'db':
+        conn = psycopg2.connect(os.environ['DATABASE_URL'])
+        try:
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT INTO t_p79348767_tournament_site_buil.handler_profiles
+                (request_id, function_name, mode, duration_ms, report, raw)
+                VALUES (%s, %s, %s, %s, %s, %s)
+            """, (request_id, function_name, mode, duration_ms, report, psycopg2.Binary(raw) if raw else None))
+            conn.commit()
+            cursor.close()
+        finally:
+            conn.close()
+        return
+    
+    target_dir = os.path.join(PROFILE_DIR, function_name)
+    os.makedirs(target_dir, exist_ok=True)
+    extension = 'txt' if mode == 'cprofile' else 'folded'
+    with open(os.path.join(target_dir, f'{request_id}.{extension}'), 'w', encoding='utf-8') as f:
+        f.write(report)
+    if raw:
+        with open(os.path.join(target_dir, f'{request_id}.prof'), 'wb') as f:
+            f.write(raw)
+
+def with_profiling(func):
+    '''Run the handler under cProfile or the stack sampler when profiling is requested'''
+    @functools.wraps(func)
+    def wrapper(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+        mode = requested_profile_mode(event)
+        if not mode:
+            return func(event, context)
+        
+        request_id = str(getattr(context, 'request_id', None) or int(time.time() * 1000))
+        function_name = str(getattr(context, 'function_name', None) or 'handler')
+        started = time.perf_counter()
+        raw = None
+        if mode == 'sample':
+            sampler = StackSampler(threading.get_ident(), PROFILE_SAMPLE_INTERVAL)
+            sampler.start()
+            try:
+                response = func(event, context)
+            finally:
+                sampler.stopped.set()
+                sampler.join()
+            report = sampler.folded()
+        else:
+            profiler = cProfile.Profile()
+            try:
+                response = profiler.runcall(func, event, context)
+            finally:
+                stream = io.StringIO()
+                pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(40)
+                report = stream.getvalue()
+                profiler.create_stats()
+                raw = marshal.dumps(profiler.stats)
+        duration_ms = (time.perf_counter() - started) * 1000
+        
+        try:
+            store_profile(function_name, request_id, mode, duration_ms, report, raw)
+        except Exception as e:
+            print(f'Profile store failed: {str(e)}')
+        
+        response.setdefault('headers', {})['X-Profile-Id'] = request_id
+        return response
+    return wrapper
+
+@with_profiling
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     '''
-    Business: Recalculate Elo ratings for all tournament games and update rating changes in database
+    Business: Queue Elo recalculation of all tournament games; the jobs worker writes the rating changes
     Args: event - dict with httpMethod, body containing tournament_id
           context - execution context
-    Returns: HTTP response dict with updated games count
+    Returns: HTTP 202 response dict with job_id (progress via jobs GET ?id=)
     '''
     method = event.get('httpMethod', 'POST')
     
+    if is_warm_up(event):
+        return warm_up()
+    
     # Handle CORS OPTIONS request
     if method == 'OPTIONS':
         return {
@@ -20,7 +453,7 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             'headers': {
                 'Access-Control-Allow-Origin': '*',
                 'Access-Control-Allow-Methods': 'POST, OPTIONS',
-                'Access-Control-Allow-Headers': 'Content-Type',
+                'Access-Control-Allow-Headers': 'Content-Type, X-Auth-Token, X-Profile',
                 'Access-Control-Max-Age': '86400'
             },
             'isBase64Encoded': False,
@@ -68,110 +501,18 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 'body': json.dumps({'error': 'Database connection not configured'})
             }
         
-        # Connect to database
-        conn = psycopg2.connect(database_url)
+        # backend/jobs does the calculation; the request only queues it
+        conn = get_connection()
         cursor = conn.cursor()
-        
-        # Get all games for the tournament ordered by round
-        cursor.execute("""
-            SELECT id, round_number, player1_id, player2_id, result, is_bye
-            FROM t_p79348767_tournament_site_buil.games
-            WHERE tournament_id = %s
-            ORDER BY round_number, id
-        """, (tournament_id,))
-        
-        games = cursor.fetchall()
-        
-        if not games:
+        try:
+            job_id = enqueue_job(cursor, 'recalculate-ratings', {'tournament_id': int(tournament_id)}, f'tournament:{int(tournament_id)}')
+            conn.commit()
+        finally:
             cursor.close()
-            conn.close()
-            return {
-                'statusCode': 404,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*'
-                },
-                'isBase64Encoded': False,
-                'body': json.dumps({'error': 'No games found for this tournament'})
-            }
-        
-        # Get initial ratings for all players
-        player_ids = set()
-        for game in games:
-            player_ids.add(game[2])  # player1_id
-            if game[3]:  # player2_id
-                player_ids.add(game[3])
-        
-        # Use parameterized query with ANY for IN clause
-        cursor.execute("""
-            SELECT id, rating
-            FROM t_p79348767_tournament_site_buil.users
-            WHERE id = ANY(%s)
-        """, (list(player_ids),))
-        
-        # Initialize ratings (use current rating as starting point, or 1200 default)
-        current_ratings = {}
-        for row in cursor.fetchall():
-            current_ratings[row[0]] = row[1] if row[1] else 1200
-        
-        # Calculate Elo rating changes
-        def calculate_elo_change(player_rating: int, opponent_rating: int, result: float, k_factor: int = 32) -> int:
-            expected_score = 1.0 / (1.0 + pow(10, (opponent_rating - player_rating) / 400.0))
-            return round(k_factor * (result - expected_score))
-        
-        # Process games round by round
-        updates: List[Tuple[int, int, int]] = []
-        
-        for game in games:
-            game_id, round_num, p1_id, p2_id, result, is_bye = game
-            
-            if is_bye or not p2_id:
-                # Bye - no rating change
-                updates.append((game_id, 0, 0))
-            else:
-                p1_rating = current_ratings.get(p1_id, 1200)
-                p2_rating = current_ratings.get(p2_id, 1200)
-                
-                # Determine results (1 = win, 0.5 = draw, 0 = loss)
-                if result == 'win1':
-                    p1_result = 1.0
-                    p2_result = 0.0
-                elif result == 'win2':
-                    p1_result = 0.0
-                    p2_result = 1.0
-                elif result == 'draw':
-                    p1_result = 0.5
-                    p2_result = 0.5
-                else:
-                    # No result yet
-                    updates.append((game_id, 0, 0))
-                    continue
-                
-                # Calculate rating changes
-                p1_change = calculate_elo_change(p1_rating, p2_rating, p1_result)
-                p2_change = calculate_elo_change(p2_rating, p1_rating, p2_result)
-                
-                # Update current ratings for next round
-                current_ratings[p1_id] = p1_rating + p1_change
-                current_ratings[p2_id] = p2_rating + p2_change
-                
-                updates.append((game_id, p1_change, p2_change))
-        
-        # Update all games with rating changes
-        for game_id, p1_change, p2_change in updates:
-            cursor.execute("""
-                UPDATE t_p79348767_tournament_site_buil.games
-                SET player1_rating_change = %s,
-                    player2_rating_change = %s
-                WHERE id = %s
-            """, (p1_change, p2_change, game_id))
-        
-        conn.commit()
-        cursor.close()
-        conn.close()
+            release_connection(conn)
         
         return {
-            'statusCode': 200,
+            'statusCode': 202,
             'headers': {
                 'Content-Type': 'application/json',
                 'Access-Control-Allow-Origin': '*'
@@ -179,8 +520,8 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             'isBase64Encoded': False,
             'body': json.dumps({
                 'success': True,
-                'updated_games': len(updates),
-                'message': f'Successfully recalculated ratings for {len(updates)} games'
+                'job_id': job_id,
+                'message': f'Rating recalculation queued for tournament {tournament_id}'
             })
         }
         
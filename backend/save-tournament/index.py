@@ -1,24 +1,489 @@
 import json
 import os
-import psycopg2
-import psycopg2.extensions
-from typing import Dict, Any
+import hashlib
+import importlib
+import threading
+import time
+from typing import Dict, Any, List, Optional, Tuple
+from collections import OrderedDict
+
+# Lazy imports and warm connections inline (shared module doesn't work in cloud functions)
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', '2'))
+DB_IDLE_PING_SECONDS = float(os.environ.get('DB_IDLE_PING_SECONDS', '30'))
+
+class LazyModule:
+    '''Defers importing a heavy dependency until its first attribute access'''
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def load(self) -> Any:
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.load(), attr)
+
+psycopg2 = LazyModule('psycopg2')
+jwt = LazyModule('jwt')
+_idle_connections: List[Tuple[Any, float]] = []
+_pool_lock = threading.Lock()
+
+def get_connection() -> Any:
+    '''Reuse an idle connection of this warm instance, pinging it after a long idle period'''
+    with _pool_lock:
+        conn, released_at = _idle_connections.pop() if _idle_connections else (None, 0.0)
+    if conn is not None and not conn.closed and time.monotonic() - released_at > DB_IDLE_PING_SECONDS:
+        try:
+            ping_cursor = conn.cursor()
+            ping_cursor.execute('SELECT 1')
+            ping_cursor.close()
+            conn.rollback()
+        except psycopg2.Error:
+            conn.close()
+    if conn is None or conn.closed:
+        conn = psycopg2.connect(os.environ['DATABASE_URL'])
+    return conn
+
+def release_connection(conn: Any) -> None:
+    '''Return a connection to the idle pool in a clean transaction state'''
+    if conn.closed:
+        return
+    try:
+        if conn.autocommit:
+            conn.autocommit = False
+        else:
+            conn.rollback()
+    except psycopg2.Error:
+        conn.close()
+        return
+    with _pool_lock:
+        if len(_idle_connections) < DB_POOL_SIZE:
+            _idle_connections.append((conn, time.monotonic()))
+            return
+    conn.close()
+
+def is_warm_up(event: Dict[str, Any]) -> bool:
+    return bool(event.get('warmup')) or event.get('httpMethod') == 'WARMUP'
+
+def warm_up() -> Dict[str, Any]:
+    '''Init phase: import heavy modules and fill the idle pool before real traffic arrives'''
+    started = time.perf_counter()
+    for module in (psycopg2, jwt):
+        module.load()
+    warmed = 0
+    if os.environ.get('DATABASE_URL'):
+        connections = [get_connection() for _ in range(DB_POOL_SIZE)]
+        for conn in connections:
+            release_connection(conn)
+        warmed = len(connections)
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json'},
+        'isBase64Encoded': False,
+        'body': json.dumps({'warm': True, 'connections': warmed, 'ms': round((time.perf_counter() - started) * 1000, 1)})
+    }
+
+if os.environ.get('PREWARM_ON_IMPORT') == '1':
+    warm_up()
+
+# Auth inline (shared module doesn't work in cloud functions); scripts/check_inline.py keeps copies identical
+AUTH_CACHE_SIZE = int(os.environ.get('AUTH_CACHE_SIZE', '1024'))
+_verified_tokens: 'OrderedDict[bytes, Tuple[Dict[str, Any], float]]' = OrderedDict()
+_auth_lock = threading.Lock()
+
+def get_jwt_secret() -> Optional[str]:
+    return os.environ.get('JWT_SECRET')
+
+def decode_token(token: str) -> Dict[str, Any]:
+    '''HS256 verification memoized by token digest until the token expires (bounded LRU)'''
+    digest = hashlib.sha256(token.encode('utf-8')).digest()
+    now = time.time()
+    with _auth_lock:
+        cached = _verified_tokens.get(digest)
+        if cached is not None:
+            if cached[1] > now:
+                _verified_tokens.move_to_end(digest)
+                return cached[0]
+            del _verified_tokens[digest]
+    payload = jwt.decode(token, get_jwt_secret(), algorithms=['HS256'])
+    with _auth_lock:
+        _verified_tokens[digest] = (payload, float(payload.get('exp', now + 60)))
+        while len(_verified_tokens) > AUTH_CACHE_SIZE:
+            _verified_tokens.popitem(last=False)
+    return payload
+
+def verify_token(event: Dict[str, Any]) -> Tuple[bool, Optional[Dict], Optional[str]]:
+    '''Verify JWT token from request headers'''
+    headers = event.get('headers') or {}
+    token = headers.get('x-auth-token') or headers.get('X-Auth-Token')
+    
+    if not token:
+        return False, None, 'Missing authentication token'
+    
+    if not get_jwt_secret():
+        return False, None, 'Server configuration error'
+    
+    try:
+        payload = decode_token(token)
+    except jwt.ExpiredSignatureError:
+        return False, None, 'Token expired'
+    except jwt.InvalidTokenError:
+        return False, None, 'Invalid token'
+    
+    if is_token_revoked(payload):
+        return False, None, 'Token revoked'
+    
+    return True, payload, None
+
+def create_auth_error(message: str, status_code: int = 401) -> Dict[str, Any]:
+    '''Create authentication error response'''
+    return {
+        'statusCode': status_code,
+        'headers': {
+            'Content-Type': 'application/json',
+            'Access-Control-Allow-Origin': '*'
+        },
+        'isBase64Encoded': False,
+        'body': json.dumps({'error': message, 'success': False})
+    }
+
+def is_admin(claims: Dict[str, Any]) -> bool:
+    return claims.get('role') == 'admin'
+
+def judges_tournament(claims: Dict[str, Any], tournament_id: Any) -> bool:
+    '''Admins manage every tournament, judges the ones listed in their judgeOf claim'''
+    if is_admin(claims):
+        return True
+    try:
+        return int(tournament_id) in (claims.get('judgeOf') or [])
+    except (TypeError, ValueError):
+        return False
+
+# Token revocation: bloom filter of revoked jti values plus an exact set of the latest ones
+REVOCATION_REFRESH_SECONDS = float(os.environ.get('REVOCATION_REFRESH_SECONDS', '15'))
+REVOCATION_REBUILD_SECONDS = 3600
+REVOCATION_RECENT_SIZE = 256
+BLOOM_BITS = 1 << 16
+BLOOM_HASHES = 7
+
+class BloomFilter:
+    '''Fixed-size bloom filter over strings using double hashing of a SHA-256 digest'''
+    def __init__(self, bits: int = BLOOM_BITS, hashes: int = BLOOM_HASHES):
+        self.bits = bits
+        self.hashes = hashes
+        self.array = bytearray(bits // 8)
+
+    def _positions(self, value: str) -> List[int]:
+        digest = hashlib.sha256(value.encode('utf-8')).digest()
+        first = int.from_bytes(digest[:8], 'big')
+        second = int.from_bytes(digest[8:16], 'big') | 1
+        return [(first + i * second) % self.bits for i in range(self.hashes)]
+
+    def add(self, value: str) -> None:
+        for position in self._positions(value):
+            self.array[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value: str) -> bool:
+        return all(self.array[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+_revocation_bloom = BloomFilter()
+_recent_revocations: 'OrderedDict[str, None]' = OrderedDict()
+_revocation_watermark: Optional[Any] = None
+_revocations_refreshed_at = float('-inf')
+_revocations_built_at = float('-inf')
+
+def remember_revocation(jti: str) -> None:
+    with _auth_lock:
+        _revocation_bloom.add(jti)
+        _recent_revocations[jti] = None
+        _recent_revocations.move_to_end(jti)
+        while len(_recent_revocations) > REVOCATION_RECENT_SIZE:
+            _recent_revocations.popitem(last=False)
+
+def refresh_revocations() -> None:
+    '''Pull revocations newer than the watermark; rebuild hourly so expired ids leave the filter'''
+    global _revocation_bloom, _revocation_watermark, _revocations_refreshed_at, _revocations_built_at
+    now = time.monotonic()
+    rebuild = now - _revocations_built_at > REVOCATION_REBUILD_SECONDS
+    watermark = None if rebuild else _revocation_watermark
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        # Overlap the watermark a little so revocations committed out of order are not skipped
+        cursor.execute("""
+            SELECT jti, revoked_at FROM t_p79348767_tournament_site_buil.revoked_tokens
+            WHERE expires_at > NOW()
+              AND (%s::timestamptz IS NULL OR revoked_at > %s::timestamptz - INTERVAL '5 seconds')
+            ORDER BY revoked_at
+        """, (watermark, watermark))
+        rows = cursor.fetchall()
+        cursor.close()
+    finally:
+        release_connection(conn)
+    
+    if rebuild:
+        with _auth_lock:
+            _revocation_bloom = BloomFilter()
+            _recent_revocations.clear()
+        _revocations_built_at = now
+    for jti, revoked_at in rows:
+        remember_revocation(jti)
+        watermark = revoked_at
+    _revocation_watermark = watermark
+    _revocations_refreshed_at = now
+
+def is_token_revoked(claims: Dict[str, Any]) -> bool:
+    '''Exact set and bloom filter answer locally; a bloom hit or a stale filter costs a database lookup'''
+    jti = claims.get('jti')
+    if not jti:
+        return False
+    if time.monotonic() - _revocations_refreshed_at > REVOCATION_REFRESH_SECONDS:
+        try:
+            refresh_revocations()
+        except Exception as e:
+            print(f'Revocation refresh failed: {str(e)}')
+    if jti in _recent_revocations:
+        return True
+    # A miss only proves "not revoked" while the filter is fresh; after a failed refresh check exactly (fail closed)
+    stale = time.monotonic() - _revocations_refreshed_at > REVOCATION_REFRESH_SECONDS
+    if jti not in _revocation_bloom and not stale:
+        return False
+    try:
+        conn = get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                'SELECT 1 FROM t_p79348767_tournament_site_buil.revoked_tokens WHERE jti = %s',
+                (jti,)
+            )
+            revoked = cursor.fetchone() is not None
+            cursor.close()
+        finally:
+            release_connection(conn)
+    except Exception:
+        return True
+    if revoked:
+        remember_revocation(jti)
+    return revoked
+
+# Outbox inline (shared module doesn't work in cloud functions); backend/jobs dispatches the events
+def record_outbox(cur: Any, event_type: str, tournament_id: Optional[int], payload: Optional[Dict[str, Any]] = None) -> None:
+    '''Record a domain event in the caller's transaction, so it exists exactly when the write commits'''
+    cur.execute("""
+        INSERT INTO t_p79348767_tournament_site_buil.outbox (tournament_id, event_type, payload)
+        VALUES (%s, %s, %s::jsonb)
+    """, (tournament_id, event_type, json.dumps(payload or {})))
+
+# Participants are rows of tournament_participants; arrays sent by the client are diffed against them
+def sync_participants(cursor: Any, tournament_id: int, participants: List[Any]) -> None:
+    '''Make the rows match the array: only new, removed or reordered players are written'''
+    player_ids = [int(p) for p in participants or []]
+    cursor.execute("""
+        WITH incoming AS (
+            SELECT player_id, MIN(position) AS position
+            FROM unnest(%(players)s::integer[]) WITH ORDINALITY AS p(player_id, position)
+            GROUP BY player_id
+        ), removed AS (
+            DELETE FROM t_p79348767_tournament_site_buil.tournament_participants
+            WHERE tournament_id = %(tournament)s AND player_id <> ALL(%(players)s::integer[])
+        )
+        INSERT INTO t_p79348767_tournament_site_buil.tournament_participants (tournament_id, player_id, registration_order)
+        SELECT %(tournament)s, player_id, position FROM incoming
+        ON CONFLICT (tournament_id, player_id) DO UPDATE
+        SET registration_order = EXCLUDED.registration_order
+        WHERE tournament_participants.registration_order IS DISTINCT FROM EXCLUDED.registration_order
+    """, {'tournament': tournament_id, 'players': player_ids})
+
+def sync_dropped(cursor: Any, tournament_id: int, dropped_players: List[Any]) -> None:
+    '''Flag newly dropped players with the round after their last pairing and clear undropped ones'''
+    player_ids = [int(p) for p in dropped_players or []]
+    cursor.execute("""
+        UPDATE t_p79348767_tournament_site_buil.tournament_participants tp
+        SET drop_round = CASE WHEN tp.player_id = ANY(%(dropped)s::integer[]) THEN (
+                SELECT COALESCE(MAX(g.round_number), 0) + 1
+                FROM t_p79348767_tournament_site_buil.games g
+                WHERE g.tournament_id = tp.tournament_id AND (g.player1_id = tp.player_id OR g.player2_id = tp.player_id)
+            ) END
+        WHERE tp.tournament_id = %(tournament)s
+          AND (tp.player_id = ANY(%(dropped)s::integer[])) <> (tp.drop_round IS NOT NULL)
+    """, {'tournament': tournament_id, 'dropped': player_ids})
+
+def can_manage_tournament(cursor: Any, claims: Dict[str, Any], tournament_id: int) -> bool:
+    '''Admin or the tournament's judge; judgeOf may lag behind a fresh assignment, so fall back to the row'''
+    if judges_tournament(claims, tournament_id):
+        return True
+    if claims.get('role') != 'judge':
+        return False
+    cursor.execute(
+        'SELECT judge_id FROM t_p79348767_tournament_site_buil.tournaments WHERE id = %s',
+        (tournament_id,)
+    )
+    row = cursor.fetchone()
+    return bool(row) and row[0] == claims.get('userId')
+
+def participants_handler(event: Dict[str, Any], method: str) -> Dict[str, Any]:
+    '''POST registers one player, DELETE removes one; each touches a single participant row'''
+    headers = {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'}
+    is_valid, claims, error_msg = verify_token(event)
+    if not is_valid:
+        return create_auth_error(error_msg or 'Unauthorized')
+    
+    if method == 'POST':
+        data = json.loads(event.get('body') or '{}')
+    else:
+        data = event.get('queryStringParameters') or {}
+    try:
+        tournament_id = int(data.get('tournament_id'))
+        player_id = int(data.get('player_id'))
+        seed = int(data['seed']) if data.get('seed') is not None else None
+    except (TypeError, ValueError):
+        return {'statusCode': 400, 'headers': headers, 'isBase64Encoded': False,
+                'body': json.dumps({'error': 'tournament_id and player_id must be integers'})}
+    
+    conn = get_connection()
+    cursor = conn.cursor()
+    try:
+        if not can_manage_tournament(cursor, claims, tournament_id):
+            return create_auth_error('Insufficient permissions', 403)
+        
+        if method == 'POST':
+            # The tournament row lock serializes registrations, so two of them never read the same MAX(registration_order)
+            cursor.execute("""
+                SELECT id FROM t_p79348767_tournament_site_buil.tournaments
+                WHERE id = %s AND deleted_at IS NULL
+                FOR UPDATE
+            """, (tournament_id,))
+            if not cursor.fetchone():
+                conn.rollback()
+                return {'statusCode': 404, 'headers': headers, 'isBase64Encoded': False,
+                        'body': json.dumps({'error': 'Tournament not found'})}
+            # tournament_participants has no foreign key to users, so a mistyped id would leave an orphan row
+            cursor.execute('SELECT 1 FROM t_p79348767_tournament_site_buil.users WHERE id = %s', (player_id,))
+            if not cursor.fetchone():
+                conn.rollback()
+                return {'statusCode': 404, 'headers': headers, 'isBase64Encoded': False,
+                        'body': json.dumps({'error': 'Player not found'})}
+            cursor.execute("""
+                INSERT INTO t_p79348767_tournament_site_buil.tournament_participants
+                (tournament_id, player_id, registration_order, seed)
+                SELECT %(tournament)s, %(player)s, COALESCE(MAX(registration_order), 0) + 1, %(seed)s
+                FROM t_p79348767_tournament_site_buil.tournament_participants
+                WHERE tournament_id = %(tournament)s
+                ON CONFLICT (tournament_id, player_id) DO NOTHING
+                RETURNING registration_order
+            """, {'tournament': tournament_id, 'player': player_id, 'seed': seed})
+            row = cursor.fetchone()
+            if row:
+                record_outbox(cursor, 'participant-registered', tournament_id, {'player_id': player_id})
+            conn.commit()
+            return {
+                'statusCode': 201 if row else 200,
+                'headers': headers,
+                'isBase64Encoded': False,
+                'body': json.dumps({'success': True, 'registered': bool(row), 'registration_order': row[0] if row else None})
+            }
+        
+        cursor.execute("""
+            DELETE FROM t_p79348767_tournament_site_buil.tournament_participants
+            WHERE tournament_id = %s AND player_id = %s
+        """, (tournament_id, player_id))
+        removed = cursor.rowcount
+        if removed:
+            record_outbox(cursor, 'participant-removed', tournament_id, {'player_id': player_id})
+        conn.commit()
+        return {
+            'statusCode': 200 if removed else 404,
+            'headers': headers,
+            'isBase64Encoded': False,
+            'body': json.dumps({'success': bool(removed)} if removed else {'error': 'Player is not registered'})
+        }
+    finally:
+        cursor.close()
+        release_connection(conn)
+
+def drop_handler(event: Dict[str, Any], method: str) -> Dict[str, Any]:
+    '''POST drops a player as of a round (default: the round after their last pairing), DELETE brings them back'''
+    headers = {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'}
+    is_valid, claims, error_msg = verify_token(event)
+    if not is_valid:
+        return create_auth_error(error_msg or 'Unauthorized')
+    
+    if method == 'POST':
+        data = json.loads(event.get('body') or '{}')
+    else:
+        data = event.get('queryStringParameters') or {}
+    try:
+        tournament_id = int(data.get('tournament_id'))
+        player_id = int(data.get('player_id'))
+        drop_round = int(data['round']) if data.get('round') is not None else None
+    except (TypeError, ValueError):
+        return {'statusCode': 400, 'headers': headers, 'isBase64Encoded': False,
+                'body': json.dumps({'error': 'tournament_id, player_id and round must be integers'})}
+    
+    conn = get_connection()
+    cursor = conn.cursor()
+    try:
+        if not can_manage_tournament(cursor, claims, tournament_id):
+            return create_auth_error('Insufficient permissions', 403)
+        
+        if method == 'POST':
+            # An already dropped player keeps their round unless one is given explicitly
+            cursor.execute("""
+                UPDATE t_p79348767_tournament_site_buil.tournament_participants tp
+                SET drop_round = COALESCE(%(round)s, tp.drop_round, (
+                    SELECT COALESCE(MAX(g.round_number), 0) + 1
+                    FROM t_p79348767_tournament_site_buil.games g
+                    WHERE g.tournament_id = tp.tournament_id AND (g.player1_id = tp.player_id OR g.player2_id = tp.player_id)
+                ))
+                WHERE tp.tournament_id = %(tournament)s AND tp.player_id = %(player)s
+                RETURNING drop_round
+            """, {'tournament': tournament_id, 'player': player_id, 'round': drop_round})
+        else:
+            cursor.execute("""
+                UPDATE t_p79348767_tournament_site_buil.tournament_participants
+                SET drop_round = NULL
+                WHERE tournament_id = %s AND player_id = %s
+                RETURNING drop_round
+            """, (tournament_id, player_id))
+        row = cursor.fetchone()
+        if row:
+            record_outbox(cursor, 'player-dropped' if method == 'POST' else 'player-restored', tournament_id,
+                          {'player_id': player_id, 'drop_round': row[0]})
+        conn.commit()
+        if not row:
+            return {'statusCode': 404, 'headers': headers, 'isBase64Encoded': False,
+                    'body': json.dumps({'error': 'Player is not registered'})}
+        return {
+            'statusCode': 200,
+            'headers': headers,
+            'isBase64Encoded': False,
+            'body': json.dumps({'success': True, 'player_id': player_id, 'drop_round': row[0]})
+        }
+    finally:
+        cursor.close()
+        release_connection(conn)
 
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     '''
-    Business: Save tournament data to PostgreSQL database
+    Business: Save tournament data to PostgreSQL database; /participants registers or removes a single player,
+              /drop drops or restores one with the round it happened in
     Args: event - dict with httpMethod, body containing tournament data
           context - execution context
     Returns: HTTP response dict with created tournament
     '''
     method = event.get('httpMethod', 'POST')
     
+    if is_warm_up(event):
+        return warm_up()
+    
     if method == 'OPTIONS':
         return {
             'statusCode': 200,
             'headers': {
                 'Access-Control-Allow-Origin': '*',
-                'Access-Control-Allow-Methods': 'POST, PUT, OPTIONS',
+                'Access-Control-Allow-Methods': 'POST, PUT, DELETE, OPTIONS',
                 'Access-Control-Allow-Headers': 'Content-Type, X-Auth-Token',
                 'Access-Control-Max-Age': '86400'
             },
@@ -26,6 +491,12 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             'body': ''
         }
     
+    if event.get('path', '/').rstrip('/').endswith('/participants') and method in ['POST', 'DELETE']:
+        return participants_handler(event, method)
+    
+    if event.get('path', '/').rstrip('/').endswith('/drop') and method in ['POST', 'DELETE']:
+        return drop_handler(event, method)
+    
     if method not in ['POST', 'PUT']:
         return {
             'statusCode': 405,
@@ -70,7 +541,7 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                     'body': json.dumps({'error': 'Database connection not configured'})
                 }
             
-            conn = psycopg2.connect(database_url)
+            conn = get_connection()
             cursor = conn.cursor()
             
             def escape_string(val):
@@ -112,14 +583,6 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 top_val = tournament_data['top_rounds'] if tournament_data['top_rounds'] else None
                 update_parts.append(f"top_rounds = {escape_string(top_val)}")
             
-            if 'participants' in tournament_data:
-                participants = tournament_data['participants']
-                if participants:
-                    participants_str = '{' + ','.join(str(int(p)) for p in participants) + '}'
-                else:
-                    participants_str = '{}'
-                update_parts.append(f"participants = '{participants_str}'::integer[]")
-            
             if 'status' in tournament_data:
                 update_parts.append(f"status = {escape_string(tournament_data['status'])}")
             
@@ -139,17 +602,11 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             if 'hasSeating' in tournament_data:
                 update_parts.append(f"t_seating = {escape_string(tournament_data['hasSeating'])}")
             
-            if 'droppedPlayers' in tournament_data:
-                dropped_players = tournament_data['droppedPlayers']
-                if dropped_players:
-                    dropped_str = '{' + ','.join(str(int(p)) for p in dropped_players) + '}'
-                else:
-                    dropped_str = '{}'
-                update_parts.append(f"dropped_players = '{dropped_str}'::integer[]")
+            syncs_participants = 'participants' in tournament_data or 'droppedPlayers' in tournament_data
             
-            if not update_parts:
+            if not update_parts and not syncs_participants:
                 cursor.close()
-                conn.close()
+                release_connection(conn)
                 return {
                     'statusCode': 400,
                     'headers': {
@@ -160,22 +617,42 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                     'body': json.dumps({'error': 'No fields to update'})
                 }
             
-            query = f"""
-                UPDATE t_p79348767_tournament_site_buil.tournaments 
-                SET {', '.join(update_parts)}
-                WHERE id = {int(tournament_id)}
-                RETURNING id, name, status, swiss_rounds, top_rounds, participants
-            """
+            if update_parts:
+                query = f"""
+                    UPDATE t_p79348767_tournament_site_buil.tournaments 
+                    SET {', '.join(update_parts)}
+                    WHERE id = {int(tournament_id)}
+                    RETURNING id
+                """
+            else:
+                query = f'SELECT id FROM t_p79348767_tournament_site_buil.tournaments WHERE id = {int(tournament_id)} FOR UPDATE'
             
             print(f'🔧 Update query: {query}')
             
             cursor.execute(query)
             row = cursor.fetchone()
+            
+            if row and 'participants' in tournament_data:
+                sync_participants(cursor, int(tournament_id), tournament_data['participants'])
+            if row and 'droppedPlayers' in tournament_data:
+                sync_dropped(cursor, int(tournament_id), tournament_data['droppedPlayers'])
+            if row:
+                cursor.execute("""
+                    SELECT t.id, t.name, t.status, t.swiss_rounds, t.top_rounds, COALESCE(p.participants, '{}')
+                    FROM t_p79348767_tournament_site_buil.tournaments t
+                    LEFT JOIN t_p79348767_tournament_site_buil.tournament_participant_arrays p ON p.tournament_id = t.id
+                    WHERE t.id = %s
+                """, (int(tournament_id),))
+                row = cursor.fetchone()
+                record_outbox(cursor, 'tournament-updated', row[0], {
+                    'status': row[2],
+                    'changed': sorted(key for key in tournament_data if key != 'id')
+                })
             conn.commit()
             
             if not row:
                 cursor.close()
-                conn.close()
+                release_connection(conn)
                 return {
                     'statusCode': 404,
                     'headers': {
@@ -189,7 +666,7 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             print(f'✅ Tournament updated successfully: {row}')
             
             cursor.close()
-            conn.close()
+            release_connection(conn)
             
             return {
                 'statusCode': 200,
@@ -245,7 +722,7 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 'body': json.dumps({'error': 'Database connection not configured'})
             }
         
-        conn = psycopg2.connect(database_url)
+        conn = get_connection()
         cursor = conn.cursor()
         
         def escape_string(val):
@@ -267,24 +744,20 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         top_rounds_sql = escape_string(top_rounds) if top_rounds else 'NULL'
         judge_id_sql = str(int(judge_id)) if judge_id else 'NULL'
         
-        if participants:
-            participants_sql = "'{" + ','.join(str(int(p)) for p in participants) + "}'::integer[]"
-        else:
-            participants_sql = "'{}'::integer[]"
-        
         query = f"""
             INSERT INTO t_p79348767_tournament_site_buil.tournaments 
-            (name, type, format, tournament_date, city, club, is_rated, swiss_rounds, top_rounds, participants, status, current_round, judge_id)
-            VALUES ({name_sql}, 'swiss', {format_sql}, {date_sql}, {city_sql}, {club_sql}, {is_rated_sql}, {swiss_rounds_sql}, {top_rounds_sql}, {participants_sql}, 'setup', 1, {judge_id_sql})
-            RETURNING id, name, format, tournament_date, city, club, is_rated, swiss_rounds, top_rounds, participants, status
+            (name, type, format, tournament_date, city, club, is_rated, swiss_rounds, top_rounds, status, current_round, judge_id)
+            VALUES ({name_sql}, 'swiss', {format_sql}, {date_sql}, {city_sql}, {club_sql}, {is_rated_sql}, {swiss_rounds_sql}, {top_rounds_sql}, 'setup', 1, {judge_id_sql})
+            RETURNING id, name, format, tournament_date, city, club, is_rated, swiss_rounds, top_rounds, status
         """
         
         cursor.execute(query)
         row = cursor.fetchone()
+        sync_participants(cursor, row[0], participants)
         conn.commit()
         
         cursor.close()
-        conn.close()
+        release_connection(conn)
         
         return {
             'statusCode': 201,
@@ -305,8 +778,8 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                     'is_rated': row[6],
                     'swiss_rounds': row[7],
                     'top_rounds': row[8],
-                    'participants': row[9],
-                    'status': row[10]
+                    'participants': [int(p) for p in participants or []],
+                    'status': row[9]
                 }
             })
         }
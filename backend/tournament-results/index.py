@@ -6,12 +6,235 @@ Returns: HTTP response with saved results or retrieved results
 
 import json
 import os
-from typing import Dict, Any
-import psycopg2
+import importlib
+import threading
+import re
+import time
+import random
+import functools
+from typing import Dict, Any, List, Optional, Tuple
 
+# Lazy imports and warm connections inline (shared module doesn't work in cloud functions)
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', '2'))
+DB_IDLE_PING_SECONDS = float(os.environ.get('DB_IDLE_PING_SECONDS', '30'))
+
+class LazyModule:
+    '''Defers importing a heavy dependency until its first attribute access'''
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def load(self) -> Any:
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.load(), attr)
+
+psycopg2 = LazyModule('psycopg2')
+_idle_connections: List[Tuple[Any, float]] = []
+_pool_lock = threading.Lock()
+
+def get_connection() -> Any:
+    '''Reuse an idle connection of this warm instance, pinging it after a long idle period'''
+    with _pool_lock:
+        conn, released_at = _idle_connections.pop() if _idle_connections else (None, 0.0)
+    if conn is not None and not conn.closed and time.monotonic() - released_at > DB_IDLE_PING_SECONDS:
+        try:
+            ping_cursor = conn.cursor()
+            ping_cursor.execute('SELECT 1')
+            ping_cursor.close()
+            conn.rollback()
+        except psycopg2.Error:
+            conn.close()
+    if conn is None or conn.closed:
+        conn = psycopg2.connect(os.environ['DATABASE_URL'])
+    return conn
+
+def release_connection(conn: Any) -> None:
+    '''Return a connection to the idle pool in a clean transaction state'''
+    if conn.closed:
+        return
+    try:
+        if conn.autocommit:
+            conn.autocommit = False
+        else:
+            conn.rollback()
+    except psycopg2.Error:
+        conn.close()
+        return
+    with _pool_lock:
+        if len(_idle_connections) < DB_POOL_SIZE:
+            _idle_connections.append((conn, time.monotonic()))
+            return
+    conn.close()
+
+def is_warm_up(event: Dict[str, Any]) -> bool:
+    return bool(event.get('warmup')) or event.get('httpMethod') == 'WARMUP'
+
+def warm_up() -> Dict[str, Any]:
+    '''Init phase: import heavy modules and fill the idle pool before real traffic arrives'''
+    started = time.perf_counter()
+    for module in (psycopg2,):
+        module.load()
+    warmed = 0
+    if os.environ.get('DATABASE_URL'):
+        connections = [get_connection() for _ in range(DB_POOL_SIZE)]
+        for conn in connections:
+            release_connection(conn)
+        warmed = len(connections)
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json'},
+        'isBase64Encoded': False,
+        'body': json.dumps({'warm': True, 'connections': warmed, 'ms': round((time.perf_counter() - started) * 1000, 1)})
+    }
+
+if os.environ.get('PREWARM_ON_IMPORT') == '1':
+    warm_up()
+
+# Slow-query capture inline (shared module doesn't work in cloud functions)
+SQL_STATS_SAMPLE_RATE = float(os.environ.get('SQL_STATS_SAMPLE_RATE', '0'))
+SQL_SLOW_MS = float(os.environ.get('SQL_SLOW_MS', '200'))
+SQL_STATS_MAX_SAMPLES = 500
+
+_SQL_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b|(?i:\btrue\b|\bfalse\b)")
+_SQL_LIST_RE = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+_sql_stats: Dict[str, Dict[str, Any]] = {}
+_sql_trace: List[Dict[str, Any]] = []
+_sql_sampling = False
+
+def fingerprint_sql(query: str) -> str:
+    '''Normalize SQL so f-string variants of one statement share a fingerprint'''
+    normalized = _SQL_LITERAL_RE.sub('?', query)
+    normalized = _SQL_LIST_RE.sub('(?+)', normalized)
+    return ' '.join(normalized.split())
+
+def explain_sql(cursor: Any, query: Any, params: Any) -> Optional[Any]:
+    '''Capture EXPLAIN plan for a slow statement without disturbing the caller's transaction'''
+    text = query.decode('utf-8') if isinstance(query, bytes) else str(query)
+    if text.lstrip().split(' ', 1)[0].upper() not in ('SELECT', 'WITH', 'INSERT', 'UPDATE', 'DELETE'):
+        return None
+    conn = cursor.connection
+    explain_cursor = conn.cursor()
+    try:
+        if not conn.autocommit:
+            explain_cursor.execute('SAVEPOINT sql_stats_explain')
+        explain_cursor.execute('EXPLAIN (FORMAT JSON) ' + text, params)
+        plan = explain_cursor.fetchone()[0]
+        if not conn.autocommit:
+            explain_cursor.execute('RELEASE SAVEPOINT sql_stats_explain')
+        return plan
+    except psycopg2.Error:
+        if not conn.autocommit:
+            explain_cursor.execute('ROLLBACK TO SAVEPOINT sql_stats_explain')
+        return None
+    finally:
+        explain_cursor.close()
+
+def record_sql(cursor: Any, query: Any, params: Any, duration_ms: float) -> None:
+    '''Add one statement execution to the per-fingerprint distributions'''
+    text = query.decode('utf-8') if isinstance(query, bytes) else str(query)
+    fingerprint = fingerprint_sql(text)
+    rows = max(cursor.rowcount, 0)
+    entry = _sql_stats.setdefault(fingerprint, {'calls': 0, 'total_ms': 0.0, 'durations': [], 'rows': [], 'explain': None})
+    entry['calls'] += 1
+    entry['total_ms'] += duration_ms
+    if len(entry['durations']) < SQL_STATS_MAX_SAMPLES:
+        entry['durations'].append(duration_ms)
+        entry['rows'].append(rows)
+    else:
+        slot = random.randrange(entry['calls'])
+        if slot < SQL_STATS_MAX_SAMPLES:
+            entry['durations'][slot] = duration_ms
+            entry['rows'][slot] = rows
+    trace_item: Dict[str, Any] = {'fingerprint': fingerprint, 'ms': round(duration_ms, 2), 'rows': rows}
+    if duration_ms >= SQL_SLOW_MS:
+        plan = explain_sql(cursor, query, params)
+        if plan is not None:
+            entry['explain'] = plan
+            trace_item['explain'] = plan
+    _sql_trace.append(trace_item)
+
+_stats_cursor_class = None
+
+def stats_cursor_class() -> Any:
+    '''Cursor class that records duration and row count of every statement (built lazily with psycopg2)'''
+    global _stats_cursor_class
+    if _stats_cursor_class is None:
+        class StatsCursor(psycopg2.extensions.cursor):
+            def execute(self, query, vars=None):
+                started = time.perf_counter()
+                result = super().execute(query, vars)
+                record_sql(self, query, vars, (time.perf_counter() - started) * 1000)
+                return result
+        _stats_cursor_class = StatsCursor
+    return _stats_cursor_class
+
+def open_cursor(conn: Any) -> Any:
+    '''Open a cursor, instrumented only when the current invocation is sampled'''
+    if _sql_sampling:
+        return conn.cursor(cursor_factory=stats_cursor_class())
+    return conn.cursor()
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[int(round(q * (len(ordered) - 1)))] if ordered else 0.0
+
+def sql_stats_report(limit: int = 10) -> List[Dict[str, Any]]:
+    '''Top-N fingerprints by total DB time collected in this instance'''
+    grand_total = sum(entry['total_ms'] for entry in _sql_stats.values()) or 1.0
+    ranked = sorted(_sql_stats.items(), key=lambda item: item[1]['total_ms'], reverse=True)
+    return [{
+        'fingerprint': fingerprint,
+        'calls': entry['calls'],
+        'total_ms': round(entry['total_ms'], 2),
+        'share': round(entry['total_ms'] / grand_total, 4),
+        'mean_ms': round(entry['total_ms'] / entry['calls'], 2),
+        'p50_ms': round(_percentile(entry['durations'], 0.5), 2),
+        'p95_ms': round(_percentile(entry['durations'], 0.95), 2),
+        'max_ms': round(max(entry['durations']), 2),
+        'rows_mean': round(sum(entry['rows']) / len(entry['rows']), 1),
+        'rows_max': max(entry['rows']),
+        'explain': entry['explain']
+    } for fingerprint, entry in ranked[:limit]]
+
+def with_sql_stats(func):
+    '''Sample handler invocations and log their statements as one SQL_STATS line'''
+    @functools.wraps(func)
+    def wrapper(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+        global _sql_sampling
+        _sql_sampling = SQL_STATS_SAMPLE_RATE > 0 and random.random() < SQL_STATS_SAMPLE_RATE
+        if not _sql_sampling:
+            return func(event, context)
+        _sql_trace.clear()
+        try:
+            return func(event, context)
+        finally:
+            _sql_sampling = False
+            print('SQL_STATS ' + json.dumps({
+                'function': getattr(context, 'function_name', None),
+                'request_id': getattr(context, 'request_id', None),
+                'statements': _sql_trace
+            }, default=str))
+    return wrapper
+
+# Outbox inline (shared module doesn't work in cloud functions); backend/jobs dispatches the events
+def record_outbox(cur: Any, event_type: str, tournament_id: Optional[int], payload: Optional[Dict[str, Any]] = None) -> None:
+    '''Record a domain event in the caller's transaction, so it exists exactly when the write commits'''
+    cur.execute("""
+        INSERT INTO t_p79348767_tournament_site_buil.outbox (tournament_id, event_type, payload)
+        VALUES (%s, %s, %s::jsonb)
+    """, (tournament_id, event_type, json.dumps(payload or {})))
+
+@with_sql_stats
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     method: str = event.get('httpMethod', 'GET')
     
+    if is_warm_up(event):
+        return warm_up()
+    
     if method == 'OPTIONS':
         return {
             'statusCode': 200,
@@ -32,8 +255,8 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             'body': json.dumps({'error': 'Database configuration missing'})
         }
     
-    conn = psycopg2.connect(dsn)
-    cursor = conn.cursor()
+    conn = get_connection()
+    cursor = open_cursor(conn)
     
     try:
         if method == 'GET':
@@ -129,6 +352,7 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 """
                 cursor.execute(insert_query)
             
+            record_outbox(cursor, 'results-saved', int(tournament_id), {'players': len(results)})
             conn.commit()
             
             return {
@@ -157,4 +381,4 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         }
     finally:
         cursor.close()
-        conn.close()
+        release_connection(conn)
@@ -1,28 +1,141 @@
 import json
 import os
-import psycopg2
-import jwt
-from typing import Dict, Any, Optional, Tuple
+import hashlib
+import importlib
+import threading
+import time
+from typing import Dict, Any, Optional, Tuple, List, Callable
+from collections import OrderedDict
+
+# Lazy imports and warm connections inline (shared module doesn't work in cloud functions)
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', '2'))
+DB_IDLE_PING_SECONDS = float(os.environ.get('DB_IDLE_PING_SECONDS', '30'))
+
+class LazyModule:
+    '''Defers importing a heavy dependency until its first attribute access'''
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def load(self) -> Any:
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.load(), attr)
+
+psycopg2 = LazyModule('psycopg2')
+jwt = LazyModule('jwt')
+_idle_connections: List[Tuple[Any, float]] = []
+_pool_lock = threading.Lock()
+
+def get_connection() -> Any:
+    '''Reuse an idle connection of this warm instance, pinging it after a long idle period'''
+    with _pool_lock:
+        conn, released_at = _idle_connections.pop() if _idle_connections else (None, 0.0)
+    if conn is not None and not conn.closed and time.monotonic() - released_at > DB_IDLE_PING_SECONDS:
+        try:
+            ping_cursor = conn.cursor()
+            ping_cursor.execute('SELECT 1')
+            ping_cursor.close()
+            conn.rollback()
+        except psycopg2.Error:
+            conn.close()
+    if conn is None or conn.closed:
+        conn = psycopg2.connect(os.environ['DATABASE_URL'])
+    return conn
+
+def release_connection(conn: Any) -> None:
+    '''Return a connection to the idle pool in a clean transaction state'''
+    if conn.closed:
+        return
+    try:
+        if conn.autocommit:
+            conn.autocommit = False
+        else:
+            conn.rollback()
+    except psycopg2.Error:
+        conn.close()
+        return
+    with _pool_lock:
+        if len(_idle_connections) < DB_POOL_SIZE:
+            _idle_connections.append((conn, time.monotonic()))
+            return
+    conn.close()
+
+def is_warm_up(event: Dict[str, Any]) -> bool:
+    return bool(event.get('warmup')) or event.get('httpMethod') == 'WARMUP'
+
+def warm_up() -> Dict[str, Any]:
+    '''Init phase: import heavy modules and fill the idle pool before real traffic arrives'''
+    started = time.perf_counter()
+    for module in (psycopg2, jwt):
+        module.load()
+    warmed = 0
+    if os.environ.get('DATABASE_URL'):
+        connections = [get_connection() for _ in range(DB_POOL_SIZE)]
+        for conn in connections:
+            release_connection(conn)
+        warmed = len(connections)
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json'},
+        'isBase64Encoded': False,
+        'body': json.dumps({'warm': True, 'connections': warmed, 'ms': round((time.perf_counter() - started) * 1000, 1)})
+    }
+
+if os.environ.get('PREWARM_ON_IMPORT') == '1':
+    warm_up()
+
+# Auth inline (shared module doesn't work in cloud functions); scripts/check_inline.py keeps copies identical
+AUTH_CACHE_SIZE = int(os.environ.get('AUTH_CACHE_SIZE', '1024'))
+_verified_tokens: 'OrderedDict[bytes, Tuple[Dict[str, Any], float]]' = OrderedDict()
+_auth_lock = threading.Lock()
+
+def get_jwt_secret() -> Optional[str]:
+    return os.environ.get('JWT_SECRET')
+
+def decode_token(token: str) -> Dict[str, Any]:
+    '''HS256 verification memoized by token digest until the token expires (bounded LRU)'''
+    digest = hashlib.sha256(token.encode('utf-8')).digest()
+    now = time.time()
+    with _auth_lock:
+        cached = _verified_tokens.get(digest)
+        if cached is not None:
+            if cached[1] > now:
+                _verified_tokens.move_to_end(digest)
+                return cached[0]
+            del _verified_tokens[digest]
+    payload = jwt.decode(token, get_jwt_secret(), algorithms=['HS256'])
+    with _auth_lock:
+        _verified_tokens[digest] = (payload, float(payload.get('exp', now + 60)))
+        while len(_verified_tokens) > AUTH_CACHE_SIZE:
+            _verified_tokens.popitem(last=False)
+    return payload
 
 def verify_token(event: Dict[str, Any]) -> Tuple[bool, Optional[Dict], Optional[str]]:
     '''Verify JWT token from request headers'''
-    headers = event.get('headers', {})
+    headers = event.get('headers') or {}
     token = headers.get('x-auth-token') or headers.get('X-Auth-Token')
     
     if not token:
         return False, None, 'Missing authentication token'
     
-    jwt_secret = os.environ.get('JWT_SECRET')
-    if not jwt_secret:
+    if not get_jwt_secret():
         return False, None, 'Server configuration error'
     
     try:
-        payload = jwt.decode(token, jwt_secret, algorithms=['HS256'])
-        return True, payload, None
+        payload = decode_token(token)
     except jwt.ExpiredSignatureError:
         return False, None, 'Token expired'
     except jwt.InvalidTokenError:
         return False, None, 'Invalid token'
+    
+    if is_token_revoked(payload):
+        return False, None, 'Token revoked'
+    
+    return True, payload, None
 
 def create_auth_error(message: str, status_code: int = 401) -> Dict[str, Any]:
     '''Create authentication error response'''
@@ -36,15 +149,415 @@ def create_auth_error(message: str, status_code: int = 401) -> Dict[str, Any]:
         'body': json.dumps({'error': message, 'success': False})
     }
 
+def is_admin(claims: Dict[str, Any]) -> bool:
+    return claims.get('role') == 'admin'
+
+def judges_tournament(claims: Dict[str, Any], tournament_id: Any) -> bool:
+    '''Admins manage every tournament, judges the ones listed in their judgeOf claim'''
+    if is_admin(claims):
+        return True
+    try:
+        return int(tournament_id) in (claims.get('judgeOf') or [])
+    except (TypeError, ValueError):
+        return False
+
+# Token revocation: bloom filter of revoked jti values plus an exact set of the latest ones
+REVOCATION_REFRESH_SECONDS = float(os.environ.get('REVOCATION_REFRESH_SECONDS', '15'))
+REVOCATION_REBUILD_SECONDS = 3600
+REVOCATION_RECENT_SIZE = 256
+BLOOM_BITS = 1 << 16
+BLOOM_HASHES = 7
+
+class BloomFilter:
+    '''Fixed-size bloom filter over strings using double hashing of a SHA-256 digest'''
+    def __init__(self, bits: int = BLOOM_BITS, hashes: int = BLOOM_HASHES):
+        self.bits = bits
+        self.hashes = hashes
+        self.array = bytearray(bits // 8)
+
+    def _positions(self, value: str) -> List[int]:
+        digest = hashlib.sha256(value.encode('utf-8')).digest()
+        first = int.from_bytes(digest[:8], 'big')
+        second = int.from_bytes(digest[8:16], 'big') | 1
+        return [(first + i * second) % self.bits for i in range(self.hashes)]
+
+    def add(self, value: str) -> None:
+        for position in self._positions(value):
+            self.array[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value: str) -> bool:
+        return all(self.array[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+_revocation_bloom = BloomFilter()
+_recent_revocations: 'OrderedDict[str, None]' = OrderedDict()
+_revocation_watermark: Optional[Any] = None
+_revocations_refreshed_at = float('-inf')
+_revocations_built_at = float('-inf')
+
+def remember_revocation(jti: str) -> None:
+    with _auth_lock:
+        _revocation_bloom.add(jti)
+        _recent_revocations[jti] = None
+        _recent_revocations.move_to_end(jti)
+        while len(_recent_revocations) > REVOCATION_RECENT_SIZE:
+            _recent_revocations.popitem(last=False)
+
+def refresh_revocations() -> None:
+    '''Pull revocations newer than the watermark; rebuild hourly so expired ids leave the filter'''
+    global _revocation_bloom, _revocation_watermark, _revocations_refreshed_at, _revocations_built_at
+    now = time.monotonic()
+    rebuild = now - _revocations_built_at > REVOCATION_REBUILD_SECONDS
+    watermark = None if rebuild else _revocation_watermark
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        # Overlap the watermark a little so revocations committed out of order are not skipped
+        cursor.execute("""
+            SELECT jti, revoked_at FROM t_p79348767_tournament_site_buil.revoked_tokens
+            WHERE expires_at > NOW()
+              AND (%s::timestamptz IS NULL OR revoked_at > %s::timestamptz - INTERVAL '5 seconds')
+            ORDER BY revoked_at
+        """, (watermark, watermark))
+        rows = cursor.fetchall()
+        cursor.close()
+    finally:
+        release_connection(conn)
+    
+    if rebuild:
+        with _auth_lock:
+            _revocation_bloom = BloomFilter()
+            _recent_revocations.clear()
+        _revocations_built_at = now
+    for jti, revoked_at in rows:
+        remember_revocation(jti)
+        watermark = revoked_at
+    _revocation_watermark = watermark
+    _revocations_refreshed_at = now
+
+def is_token_revoked(claims: Dict[str, Any]) -> bool:
+    '''Exact set and bloom filter answer locally; a bloom hit or a stale filter costs a database lookup'''
+    jti = claims.get('jti')
+    if not jti:
+        return False
+    if time.monotonic() - _revocations_refreshed_at > REVOCATION_REFRESH_SECONDS:
+        try:
+            refresh_revocations()
+        except Exception as e:
+            print(f'Revocation refresh failed: {str(e)}')
+    if jti in _recent_revocations:
+        return True
+    # A miss only proves "not revoked" while the filter is fresh; after a failed refresh check exactly (fail closed)
+    stale = time.monotonic() - _revocations_refreshed_at > REVOCATION_REFRESH_SECONDS
+    if jti not in _revocation_bloom and not stale:
+        return False
+    try:
+        conn = get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                'SELECT 1 FROM t_p79348767_tournament_site_buil.revoked_tokens WHERE jti = %s',
+                (jti,)
+            )
+            revoked = cursor.fetchone() is not None
+            cursor.close()
+        finally:
+            release_connection(conn)
+    except Exception:
+        return True
+    if revoked:
+        remember_revocation(jti)
+    return revoked
+
+# Outbox inline (shared module doesn't work in cloud functions); backend/jobs dispatches the events
+def record_outbox(cur: Any, event_type: str, tournament_id: Optional[int], payload: Optional[Dict[str, Any]] = None) -> None:
+    '''Record a domain event in the caller's transaction, so it exists exactly when the write commits'''
+    cur.execute("""
+        INSERT INTO t_p79348767_tournament_site_buil.outbox (tournament_id, event_type, payload)
+        VALUES (%s, %s, %s::jsonb)
+    """, (tournament_id, event_type, json.dumps(payload or {})))
+
+# Single-flight inline (shared module doesn't work in cloud functions); scripts/check_inline.py keeps copies identical
+# Concurrent identical public reads (same function, normalized params and data revision) share one query and one body
+SINGLE_FLIGHT_STATS_SIZE = 256
+
+class Flight:
+    '''One in-flight load; followers wait for it and reuse its body or its error'''
+    def __init__(self):
+        self.done = threading.Event()
+        self.body: Optional[str] = None
+        self.error: Optional[BaseException] = None
+
+_flights: Dict[Tuple[str, Any], Flight] = {}
+_flight_stats: 'OrderedDict[str, Dict[str, int]]' = OrderedDict()
+_flight_lock = threading.Lock()
+
+def flight_request_key(function_name: str, params: Dict[str, Any]) -> str:
+    '''Same function and same non-empty params in any order'''
+    normalized = '&'.join(f'{name}={params[name]}' for name in sorted(params) if params[name] not in (None, ''))
+    return f'{function_name}?{normalized}'
+
+def single_flight(request_key: str, revision: Any, load: Callable[[], str]) -> str:
+    '''Run load once per (request, revision) at a time; concurrent callers get the leader's serialized body'''
+    key = (request_key, revision)
+    with _flight_lock:
+        flight = _flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = _flights[key] = Flight()
+        stats = _flight_stats.pop(request_key, None) or {'loads': 0, 'collapsed': 0}
+        stats['loads' if leader else 'collapsed'] += 1
+        _flight_stats[request_key] = stats
+        while len(_flight_stats) > SINGLE_FLIGHT_STATS_SIZE:
+            _flight_stats.popitem(last=False)
+    if not leader:
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.body
+    try:
+        flight.body = load()
+        return flight.body
+    except BaseException as e:
+        flight.error = e
+        raise
+    finally:
+        with _flight_lock:
+            _flights.pop(key, None)
+        flight.done.set()
+
+def single_flight_report(limit: int = 10) -> List[Dict[str, Any]]:
+    '''Request keys with the most collapsed requests since the instance started'''
+    with _flight_lock:
+        items = list(_flight_stats.items())
+    items.sort(key=lambda item: item[1]['collapsed'], reverse=True)
+    return [{'key': key, **stats} for key, stats in items[:limit]]
+
+# Composite tournament page: one response instead of tournaments + games + users + tournament-results,
+# cached per warm instance by the tournament's revision (versions of its keys, participants' rows, saved results)
+VIEW_CACHE_SIZE = 64
+
+_view_cache: 'OrderedDict[int, Tuple[Any, str]]' = OrderedDict()
+_view_lock = threading.Lock()
+
+def parse_view_id(event: Dict[str, Any]) -> Optional[int]:
+    '''Tournament id from /tournaments/{id}/view, or from ?id= when the gateway strips the path'''
+    segments = [segment for segment in event.get('path', '/').split('/') if segment]
+    for candidate in (segments[-2] if len(segments) >= 2 else None, (event.get('queryStringParameters') or {}).get('id')):
+        try:
+            return int(candidate)
+        except (TypeError, ValueError):
+            continue
+    return None
+
+def read_list_revision(cursor: Any) -> int:
+    '''Highest tournament revision (V0065): any tournament or participant write raises it, soft deletes included'''
+    cursor.execute('SELECT COALESCE(MAX(revision), 0) FROM t_p79348767_tournament_site_buil.tournaments')
+    return cursor.fetchone()[0]
+
+def read_view_revision(cursor: Any, tournament_id: int) -> Tuple[Any, ...]:
+    cursor.execute("""
+        SELECT
+            (SELECT version FROM t_p79348767_tournament_site_buil.reference_versions WHERE resource = %(tournament_key)s),
+            (SELECT MAX(revision) FROM t_p79348767_tournament_site_buil.games WHERE tournament_id = %(id)s),
+            (SELECT COUNT(*) FROM t_p79348767_tournament_site_buil.games WHERE tournament_id = %(id)s),
+            (SELECT MAX(u.revision)
+             FROM t_p79348767_tournament_site_buil.tournament_participants tp
+             JOIN t_p79348767_tournament_site_buil.users u ON u.id = tp.player_id
+             WHERE tp.tournament_id = %(id)s),
+            (SELECT MAX(id) FROM t_p79348767_tournament_site_buil.tournament_results WHERE tournament_id = %(id)s)
+    """, {'tournament_key': f'tournament:{tournament_id}', 'id': tournament_id})
+    return tuple(cursor.fetchone())
+
+def compute_standings(tournament: Dict[str, Any], participants: List[Dict[str, Any]], rounds: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    '''Swiss standings with the client's rules: byes and wins 3, draws 1, Buchholz and sum of opponents' Buchholz'''
+    swiss_rounds = tournament.get('swiss_rounds') or 0
+    swiss = [round_ for round_ in rounds if 0 < round_['round_number'] <= swiss_rounds]
+    
+    # Tie-breaks use every swiss game, drops included, like the client does
+    all_points: Dict[int, int] = {}
+    all_opponents: Dict[int, List[int]] = {}
+    for round_ in swiss:
+        for game in round_['games']:
+            player1, player2, result = game['player1_id'], game['player2_id'], game['result']
+            if player2 is None:
+                all_points[player1] = all_points.get(player1, 0) + 3
+                continue
+            if not result:
+                continue
+            all_opponents.setdefault(player1, []).append(player2)
+            all_opponents.setdefault(player2, []).append(player1)
+            if result == 'draw':
+                all_points[player1] = all_points.get(player1, 0) + 1
+                all_points[player2] = all_points.get(player2, 0) + 1
+            else:
+                winner = player1 if result == 'win1' else player2
+                all_points[winner] = all_points.get(winner, 0) + 3
+    
+    standings = []
+    for participant in participants:
+        player_id = participant['id']
+        drop_round = participant.get('drop_round')
+        points = wins = losses = draws = 0
+        opponents = []
+        for round_ in swiss:
+            if drop_round is not None and round_['round_number'] >= drop_round:
+                continue
+            game = next((g for g in round_['games'] if player_id in (g['player1_id'], g['player2_id'])), None)
+            if game is None:
+                continue
+            if game['player2_id'] is None:
+                points += 3
+                wins += 1
+            elif game['result']:
+                is_player1 = game['player1_id'] == player_id
+                opponents.append(game['player2_id'] if is_player1 else game['player1_id'])
+                if game['result'] == 'draw':
+                    points += 1
+                    draws += 1
+                elif (game['result'] == 'win1') == is_player1:
+                    points += 3
+                    wins += 1
+                else:
+                    losses += 1
+        standings.append({
+            'player_id': player_id,
+            'points': points,
+            'wins': wins,
+            'losses': losses,
+            'draws': draws,
+            'buchholz': sum(all_points.get(opponent, 0) for opponent in opponents),
+            'sum_buchholz': sum(
+                sum(all_points.get(second, 0) for second in all_opponents.get(opponent, []))
+                for opponent in opponents
+            ),
+            'dropped': drop_round is not None,
+            'name': participant['name']
+        })
+    
+    if (tournament.get('current_round') or 0) > 0 and any(round_['round_number'] > 0 for round_ in rounds):
+        standings.sort(key=lambda row: (-row['points'], -row['buchholz'], -row['sum_buchholz'], row['name']))
+    else:
+        standings.sort(key=lambda row: row['name'])
+    for place, row in enumerate(standings, start=1):
+        row['place'] = place
+        del row['name']
+    return standings
+
+def load_view(tournament_id: int) -> str:
+    '''Three indexed reads with JSON built in Postgres; an empty string when the tournament does not exist'''
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT json_build_object(
+                       'id', t.id, 'name', t.name, 'format', t.format, 'status', t.status,
+                       'swiss_rounds', t.swiss_rounds, 'top_rounds', t.top_rounds, 'city', t.city, 'club', t.club,
+                       'tournament_date', t.tournament_date, 'is_rated', t.is_rated, 'judge_id', t.judge_id,
+                       'current_round', t.current_round, 'confirmed', t.confirmed, 'hasSeating', t.t_seating,
+                       'created_at', t.created_at, 'updated_at', t.updated_at
+                   ),
+                   COALESCE((
+                       SELECT json_agg(json_build_object(
+                                  'id', u.id, 'name', u.name, 'city', u.city, 'rating', u.rating,
+                                  'seed', tp.seed, 'drop_round', tp.drop_round
+                              ) ORDER BY tp.registration_order, tp.player_id)
+                       FROM t_p79348767_tournament_site_buil.tournament_participants tp
+                       JOIN t_p79348767_tournament_site_buil.users u ON u.id = tp.player_id
+                       WHERE tp.tournament_id = t.id
+                   ), '[]'::json)
+            FROM t_p79348767_tournament_site_buil.tournaments t
+            WHERE t.id = %s AND t.deleted_at IS NULL
+        """, (tournament_id,))
+        row = cursor.fetchone()
+        if not row:
+            cursor.close()
+            return ''
+        tournament, participants = row
+        
+        cursor.execute("""
+            SELECT round_number,
+                   json_agg(json_build_object(
+                       'id', id, 'player1_id', player1_id, 'player2_id', player2_id,
+                       'result', result, 'table_number', table_number
+                   ) ORDER BY table_number NULLS LAST, id)
+            FROM t_p79348767_tournament_site_buil.games
+            WHERE tournament_id = %s
+            GROUP BY round_number
+            ORDER BY round_number
+        """, (tournament_id,))
+        rounds = [{'round_number': number, 'games': games} for number, games in cursor.fetchall()]
+        
+        # Confirmed tournaments have saved final places (playoff included); otherwise compute swiss standings
+        cursor.execute("""
+            SELECT COALESCE(json_agg(json_build_object(
+                       'player_id', player_id, 'place', place, 'points', points, 'buchholz', buchholz,
+                       'sum_buchholz', sum_buchholz, 'wins', wins, 'losses', losses, 'draws', draws
+                   ) ORDER BY place), '[]'::json)
+            FROM t_p79348767_tournament_site_buil.tournament_results
+            WHERE tournament_id = %s
+        """, (tournament_id,))
+        standings = cursor.fetchone()[0] or compute_standings(tournament, participants, rounds)
+        cursor.close()
+    finally:
+        release_connection(conn)
+    
+    return json.dumps({
+        'tournament': tournament,
+        'participants': participants,
+        'rounds': rounds,
+        'standings': standings
+    })
+
+def view_tournament(event: Dict[str, Any]) -> Dict[str, Any]:
+    headers = {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'}
+    tournament_id = parse_view_id(event)
+    if tournament_id is None:
+        return {'statusCode': 400, 'headers': headers, 'isBase64Encoded': False, 'body': json.dumps({'error': 'Tournament ID is required'})}
+    
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        revision = read_view_revision(cursor, tournament_id)
+        cursor.close()
+    finally:
+        release_connection(conn)
+    
+    etag = '"view-' + hashlib.sha1(f'{tournament_id}|{revision}'.encode('utf-8')).hexdigest() + '"'
+    response_headers = {**headers, 'ETag': etag, 'Cache-Control': 'public, max-age=0, must-revalidate'}
+    request_headers = event.get('headers') or {}
+    if (request_headers.get('If-None-Match') or request_headers.get('if-none-match')) == etag:
+        return {'statusCode': 304, 'headers': response_headers, 'isBase64Encoded': False, 'body': ''}
+    
+    with _view_lock:
+        cached = _view_cache.get(tournament_id)
+        if cached is not None and cached[0] == revision:
+            _view_cache.move_to_end(tournament_id)
+    if cached is not None and cached[0] == revision:
+        body = cached[1]
+    else:
+        body = single_flight(f'tournaments/{tournament_id}/view', revision, lambda: load_view(tournament_id))
+        with _view_lock:
+            _view_cache[tournament_id] = (revision, body)
+            _view_cache.move_to_end(tournament_id)
+            while len(_view_cache) > VIEW_CACHE_SIZE:
+                _view_cache.popitem(last=False)
+    
+    if not body:
+        return {'statusCode': 404, 'headers': headers, 'isBase64Encoded': False, 'body': json.dumps({'error': 'Tournament not found'})}
+    return {'statusCode': 200, 'headers': response_headers, 'isBase64Encoded': False, 'body': body}
+
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     '''
-    Business: Get tournaments from database
-    Args: event - dict with httpMethod, body 
+    Business: Get tournaments from database; GET /{id}/view returns one tournament page (rounds, participants, standings)
+    Args: event - dict with httpMethod, path, body, headers (If-None-Match for the view)
           context - object with request_id
     Returns: HTTP response dict with tournaments list
     '''
     method = event.get('httpMethod', 'GET')
     
+    if is_warm_up(event):
+        return warm_up()
+    
     # Handle CORS OPTIONS request
     if method == 'OPTIONS':
         return {
@@ -52,13 +565,28 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             'headers': {
                 'Access-Control-Allow-Origin': '*',
                 'Access-Control-Allow-Methods': 'GET, POST, PUT, OPTIONS',
-                'Access-Control-Allow-Headers': 'Content-Type, X-Auth-Token',
+                'Access-Control-Allow-Headers': 'Content-Type, X-Auth-Token, If-None-Match',
+                'Access-Control-Expose-Headers': 'ETag',
                 'Access-Control-Max-Age': '86400'
             },
             'isBase64Encoded': False,
             'body': ''
         }
     
+    if method == 'GET' and event.get('path', '/').rstrip('/').endswith('/view'):
+        try:
+            return view_tournament(event)
+        except Exception as e:
+            return {
+                'statusCode': 500,
+                'headers': {
+                    'Content-Type': 'application/json',
+                    'Access-Control-Allow-Origin': '*'
+                },
+                'isBase64Encoded': False,
+                'body': json.dumps({'error': f'Unexpected error: {str(e)}'})
+            }
+    
     if method == 'GET':
         # GET is public - no auth required
         try:
@@ -74,43 +602,59 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                     'body': json.dumps({'error': 'Database connection not configured'})
                 }
             
-            conn = psycopg2.connect(database_url)
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                SELECT id, name, format, status, swiss_rounds, top_rounds,
-                       created_at, updated_at, city, club, tournament_date, is_rated, judge_id, participants, current_round, confirmed, dropped_players, t_seating
-                FROM t_p79348767_tournament_site_buil.tournaments
-                ORDER BY created_at DESC
-            """)
-            
-            rows = cursor.fetchall()
-            
-            tournaments = []
-            for row in rows:
-                tournaments.append({
-                    'id': row[0],
-                    'name': row[1],
-                    'format': row[2],
-                    'status': row[3],
-                    'swiss_rounds': row[4],
-                    'top_rounds': row[5],
-                    'created_at': row[6].isoformat() if row[6] else None,
-                    'updated_at': row[7].isoformat() if row[7] else None,
-                    'city': row[8],
-                    'club': row[9],
-                    'tournament_date': row[10].isoformat() if row[10] else None,
-                    'is_rated': row[11],
-                    'judge_id': row[12],
-                    'participants': row[13] if row[13] else [],
-                    'current_round': row[14] if len(row) > 14 else 0,
-                    'confirmed': row[15] if len(row) > 15 else False,
-                    'droppedPlayers': row[16] if len(row) > 16 and row[16] else [],
-                    'hasSeating': row[17] if len(row) > 17 else False
-                })
+            # Concurrent readers at the same list revision share one query and one serialized body
+            conn = get_connection()
+            try:
+                cursor = conn.cursor()
+                revision = read_list_revision(cursor)
+                cursor.close()
+            finally:
+                release_connection(conn)
             
-            cursor.close()
-            conn.close()
+            def load_tournaments() -> str:
+                conn = get_connection()
+                try:
+                    cursor = conn.cursor()
+                    
+                    cursor.execute("""
+                        SELECT t.id, t.name, t.format, t.status, t.swiss_rounds, t.top_rounds,
+                               t.created_at, t.updated_at, t.city, t.club, t.tournament_date, t.is_rated, t.judge_id, p.participants, t.current_round, t.confirmed, p.dropped_players, t.t_seating, p.drop_rounds
+                        FROM t_p79348767_tournament_site_buil.tournaments t
+                        LEFT JOIN t_p79348767_tournament_site_buil.tournament_participant_arrays p ON p.tournament_id = t.id
+                        WHERE t.deleted_at IS NULL
+                        ORDER BY t.created_at DESC
+                    """)
+                    
+                    rows = cursor.fetchall()
+                    
+                    tournaments = []
+                    for row in rows:
+                        tournaments.append({
+                            'id': row[0],
+                            'name': row[1],
+                            'format': row[2],
+                            'status': row[3],
+                            'swiss_rounds': row[4],
+                            'top_rounds': row[5],
+                            'created_at': row[6].isoformat() if row[6] else None,
+                            'updated_at': row[7].isoformat() if row[7] else None,
+                            'city': row[8],
+                            'club': row[9],
+                            'tournament_date': row[10].isoformat() if row[10] else None,
+                            'is_rated': row[11],
+                            'judge_id': row[12],
+                            'participants': row[13] if row[13] else [],
+                            'current_round': row[14] if len(row) > 14 else 0,
+                            'confirmed': row[15] if len(row) > 15 else False,
+                            'droppedPlayers': row[16] if len(row) > 16 and row[16] else [],
+                            'hasSeating': row[17] if len(row) > 17 else False,
+                            'dropRounds': row[18] if len(row) > 18 and row[18] else {}
+                        })
+                    
+                    cursor.close()
+                finally:
+                    release_connection(conn)
+                return json.dumps({'tournaments': tournaments})
             
             return {
                 'statusCode': 200,
@@ -119,7 +663,9 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                     'Access-Control-Allow-Origin': '*'
                 },
                 'isBase64Encoded': False,
-                'body': json.dumps({'tournaments': tournaments})
+                'body': single_flight(
+                    flight_request_key('tournaments', event.get('queryStringParameters') or {}), revision, load_tournaments
+                )
             }
             
         except psycopg2.Error as e:
@@ -232,7 +778,7 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                     'body': json.dumps({'error': 'Database connection not configured'})
                 }
             
-            conn = psycopg2.connect(database_url)
+            conn = get_connection()
             cursor = conn.cursor()
             
             # Build UPDATE query dynamically based on provided fields
@@ -272,11 +818,17 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             
             cursor.execute(update_query, tuple(query_params))
             row = cursor.fetchone()
+            if row:
+                record_outbox(cursor, 'tournament-updated', row[0], {
+                    'status': row[1],
+                    'current_round': row[2],
+                    'changed': sorted(key for key in body_data if key != 'id')
+                })
             conn.commit()
             
             if not row:
                 cursor.close()
-                conn.close()
+                release_connection(conn)
                 return {
                     'statusCode': 404,
                     'headers': {
@@ -295,7 +847,7 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             }
             
             cursor.close()
-            conn.close()
+            release_connection(conn)
             
             return {
                 'statusCode': 200,
@@ -0,0 +1,20 @@
+-- On-demand handler profiles (PROFILE_STORE=db), keyed by cloud function request_id
+CREATE TABLE IF NOT EXISTS t_p79348767_tournament_site_buil.handler_profiles (
+    id SERIAL PRIMARY KEY,
+    request_id VARCHAR(100) NOT NULL,
+    function_name VARCHAR(100) NOT NULL,
+    mode VARCHAR(20) NOT NULL,
+    duration_ms DOUBLE PRECISION NOT NULL,
+    report TEXT NOT NULL,
+    raw BYTEA,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_handler_profiles_request_id
+ON t_p79348767_tournament_site_buil.handler_profiles (request_id);
+
+CREATE INDEX IF NOT EXISTS idx_handler_profiles_created_at
+ON t_p79348767_tournament_site_buil.handler_profiles (created_at);
+
+COMMENT ON COLUMN t_p79348767_tournament_site_buil.handler_profiles.report IS 'pstats text (cprofile) or folded stacks for flame graphs (sample)';
+COMMENT ON COLUMN t_p79348767_tournament_site_buil.handler_profiles.raw IS 'marshalled pstats data, loadable with pstats/snakeviz';
@@ -0,0 +1,13 @@
+-- Revoked JWTs (by jti), kept until the token itself would expire
+CREATE TABLE IF NOT EXISTS t_p79348767_tournament_site_buil.revoked_tokens (
+    jti VARCHAR(64) PRIMARY KEY,
+    user_id INTEGER,
+    revoked_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    expires_at TIMESTAMPTZ NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_revoked_tokens_revoked_at
+ON t_p79348767_tournament_site_buil.revoked_tokens (revoked_at);
+
+CREATE INDEX IF NOT EXISTS idx_revoked_tokens_expires_at
+ON t_p79348767_tournament_site_buil.revoked_tokens (expires_at);
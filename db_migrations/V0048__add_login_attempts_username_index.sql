@@ -0,0 +1,3 @@
+-- Username side of the login throttle lookup; the ip side uses idx_login_attempts_lookup
+CREATE INDEX IF NOT EXISTS idx_login_attempts_username
+ON t_p79348767_tournament_site_buil.login_attempts (LOWER(username), last_attempt);
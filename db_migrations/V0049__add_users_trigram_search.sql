@@ -0,0 +1,11 @@
+-- Player search (GET /search on users): trigram indexes serve both prefix LIKE and fuzzy matching
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_users_name_trgm
+ON t_p79348767_tournament_site_buil.users USING gin (LOWER(name) gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_users_username_trgm
+ON t_p79348767_tournament_site_buil.users USING gin (LOWER(username) gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_users_city_trgm
+ON t_p79348767_tournament_site_buil.users USING gin (LOWER(city) gin_trgm_ops);
@@ -0,0 +1,17 @@
+-- Monotonic revision per user row, bumped on every insert/update; ETags of user lookups derive from it
+CREATE SEQUENCE IF NOT EXISTS t_p79348767_tournament_site_buil.users_revision_seq;
+
+ALTER TABLE t_p79348767_tournament_site_buil.users
+ADD COLUMN IF NOT EXISTS revision BIGINT NOT NULL DEFAULT nextval('t_p79348767_tournament_site_buil.users_revision_seq');
+
+CREATE OR REPLACE FUNCTION t_p79348767_tournament_site_buil.bump_users_revision() RETURNS trigger AS $$
+BEGIN
+    NEW.revision := nextval('t_p79348767_tournament_site_buil.users_revision_seq');
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_users_revision ON t_p79348767_tournament_site_buil.users;
+CREATE TRIGGER trg_users_revision
+BEFORE UPDATE ON t_p79348767_tournament_site_buil.users
+FOR EACH ROW EXECUTE FUNCTION t_p79348767_tournament_site_buil.bump_users_revision();
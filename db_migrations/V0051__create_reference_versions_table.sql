@@ -0,0 +1,10 @@
+-- Version stamps of cached reference data; writers bump, warm instances compare before reusing their copy
+CREATE TABLE IF NOT EXISTS t_p79348767_tournament_site_buil.reference_versions (
+    resource VARCHAR(50) PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 1,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT INTO t_p79348767_tournament_site_buil.reference_versions (resource, version)
+VALUES ('cities', 1), ('formats', 1), ('clubs', 1)
+ON CONFLICT (resource) DO NOTHING;
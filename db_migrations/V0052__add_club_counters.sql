@@ -0,0 +1,94 @@
+-- Club directory: name-prefix search and per-club counters maintained incrementally from tournaments
+CREATE INDEX IF NOT EXISTS idx_clubs_name_prefix
+ON clubs (LOWER(name) text_pattern_ops);
+
+ALTER TABLE clubs
+ADD COLUMN IF NOT EXISTS tournaments_count INTEGER NOT NULL DEFAULT 0,
+ADD COLUMN IF NOT EXISTS players_count INTEGER NOT NULL DEFAULT 0;
+
+-- How many of a club's tournaments each player took part in; a player counts for the club while > 0
+CREATE TABLE IF NOT EXISTS club_players (
+    club_id INTEGER NOT NULL,
+    player_id INTEGER NOT NULL,
+    tournaments INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (club_id, player_id)
+);
+
+-- tournaments.club stores the club name; prefer the club in the tournament's city when names repeat
+CREATE OR REPLACE FUNCTION resolve_club_id(club_name VARCHAR, club_city VARCHAR) RETURNS INTEGER AS $$
+    SELECT id FROM clubs
+    WHERE name = club_name
+    ORDER BY (city IS NOT DISTINCT FROM club_city) DESC, id
+    LIMIT 1
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION apply_club_tournament(club_name VARCHAR, club_city VARCHAR, player_ids INTEGER[], delta INTEGER) RETURNS void AS $$
+DECLARE
+    target_club INTEGER := resolve_club_id(club_name, club_city);
+    distinct_ids INTEGER[] := ARRAY(SELECT DISTINCT unnest(COALESCE(player_ids, '{}')));
+BEGIN
+    IF target_club IS NULL THEN
+        RETURN;
+    END IF;
+
+    IF delta > 0 THEN
+        -- A row that ends at 1 is a player new to the club
+        WITH upserted AS (
+            INSERT INTO club_players (club_id, player_id, tournaments)
+            SELECT target_club, unnest(distinct_ids), 1
+            ON CONFLICT (club_id, player_id) DO UPDATE SET tournaments = club_players.tournaments + 1
+            RETURNING tournaments
+        )
+        UPDATE clubs
+        SET tournaments_count = tournaments_count + 1,
+            players_count = players_count + (SELECT COUNT(*) FROM upserted WHERE tournaments = 1)
+        WHERE id = target_club;
+    ELSE
+        UPDATE club_players SET tournaments = tournaments - 1
+        WHERE club_id = target_club AND player_id = ANY(distinct_ids);
+
+        WITH gone AS (
+            DELETE FROM club_players
+            WHERE club_id = target_club AND player_id = ANY(distinct_ids) AND tournaments <= 0
+            RETURNING player_id
+        )
+        UPDATE clubs
+        SET tournaments_count = GREATEST(tournaments_count - 1, 0),
+            players_count = GREATEST(players_count - (SELECT COUNT(*) FROM gone), 0)
+        WHERE id = target_club;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION track_club_counters() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.club IS NOT NULL THEN
+        PERFORM apply_club_tournament(OLD.club, OLD.city, OLD.participants, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.club IS NOT NULL THEN
+        PERFORM apply_club_tournament(NEW.club, NEW.city, NEW.participants, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_tournaments_club_counters ON tournaments;
+CREATE TRIGGER trg_tournaments_club_counters
+AFTER INSERT OR DELETE OR UPDATE OF club, city, participants ON tournaments
+FOR EACH ROW EXECUTE FUNCTION track_club_counters();
+
+-- Backfill from existing tournaments
+INSERT INTO club_players (club_id, player_id, tournaments)
+SELECT club_id, player_id, COUNT(*)
+FROM (
+    SELECT DISTINCT t.id, resolve_club_id(t.club, t.city) AS club_id, unnest(COALESCE(t.participants, '{}')) AS player_id
+    FROM tournaments t
+    WHERE t.club IS NOT NULL
+) p
+WHERE club_id IS NOT NULL
+GROUP BY club_id, player_id
+ON CONFLICT (club_id, player_id) DO UPDATE SET tournaments = EXCLUDED.tournaments;
+
+UPDATE clubs c SET
+    tournaments_count = (SELECT COUNT(*) FROM tournaments t WHERE t.club IS NOT NULL AND resolve_club_id(t.club, t.city) = c.id),
+    players_count = (SELECT COUNT(*) FROM club_players cp WHERE cp.club_id = c.id AND cp.tournaments > 0);
@@ -0,0 +1,127 @@
+-- Participants as rows instead of tournaments.participants / dropped_players arrays:
+-- registering or removing a player touches one row, and "tournaments of player" is an index lookup
+CREATE TABLE IF NOT EXISTS t_p79348767_tournament_site_buil.tournament_participants (
+    tournament_id INTEGER NOT NULL,
+    player_id INTEGER NOT NULL,
+    registration_order INTEGER NOT NULL,
+    seed INTEGER,
+    drop_round INTEGER,
+    registered_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (tournament_id, player_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_tournament_participants_player
+ON t_p79348767_tournament_site_buil.tournament_participants (player_id, tournament_id);
+
+COMMENT ON COLUMN t_p79348767_tournament_site_buil.tournament_participants.drop_round IS 'first round the player no longer plays in; NULL while active';
+
+INSERT INTO t_p79348767_tournament_site_buil.tournament_participants (tournament_id, player_id, registration_order)
+SELECT t.id, p.player_id, MIN(p.position)
+FROM t_p79348767_tournament_site_buil.tournaments t
+CROSS JOIN LATERAL unnest(COALESCE(t.participants, '{}')) WITH ORDINALITY AS p(player_id, position)
+GROUP BY t.id, p.player_id
+ON CONFLICT (tournament_id, player_id) DO NOTHING;
+
+-- Dropped players: the first round they have no game in, the rule calculateTournamentStandings applied to
+-- the arrays, so existing standings stay identical; one who missed no round drops after the last round
+UPDATE t_p79348767_tournament_site_buil.tournament_participants tp
+SET drop_round = COALESCE((
+    SELECT MIN(r.round_number)
+    FROM (
+        SELECT DISTINCT g.round_number FROM t_p79348767_tournament_site_buil.games g
+        WHERE g.tournament_id = tp.tournament_id
+    ) r
+    WHERE NOT EXISTS (
+        SELECT 1 FROM t_p79348767_tournament_site_buil.games g
+        WHERE g.tournament_id = tp.tournament_id AND g.round_number = r.round_number
+          AND (g.player1_id = tp.player_id OR g.player2_id = tp.player_id)
+    )
+), (
+    SELECT COALESCE(MAX(g.round_number), 0) + 1 FROM t_p79348767_tournament_site_buil.games g
+    WHERE g.tournament_id = tp.tournament_id
+))
+FROM t_p79348767_tournament_site_buil.tournaments t
+WHERE t.id = tp.tournament_id AND tp.player_id = ANY(COALESCE(t.dropped_players, '{}'));
+
+-- Compatibility: the arrays readers used to get from tournaments
+CREATE OR REPLACE VIEW t_p79348767_tournament_site_buil.tournament_participant_arrays AS
+SELECT tournament_id,
+       array_agg(player_id ORDER BY registration_order, player_id) AS participants,
+       COALESCE(array_agg(player_id ORDER BY registration_order, player_id) FILTER (WHERE drop_round IS NOT NULL), '{}') AS dropped_players
+FROM t_p79348767_tournament_site_buil.tournament_participants
+GROUP BY tournament_id;
+
+-- Club counters now follow participant rows; tournament-level changes move the current rows
+CREATE OR REPLACE FUNCTION adjust_club_player(target_club INTEGER, target_player INTEGER, delta INTEGER) RETURNS void AS $$
+DECLARE
+    remaining INTEGER;
+BEGIN
+    IF target_club IS NULL THEN
+        RETURN;
+    END IF;
+    IF delta > 0 THEN
+        INSERT INTO club_players (club_id, player_id, tournaments) VALUES (target_club, target_player, 1)
+        ON CONFLICT (club_id, player_id) DO UPDATE SET tournaments = club_players.tournaments + 1
+        RETURNING tournaments INTO remaining;
+        IF remaining = 1 THEN
+            UPDATE clubs SET players_count = players_count + 1 WHERE id = target_club;
+        END IF;
+    ELSE
+        UPDATE club_players SET tournaments = tournaments - 1
+        WHERE club_id = target_club AND player_id = target_player
+        RETURNING tournaments INTO remaining;
+        IF remaining IS NOT NULL AND remaining <= 0 THEN
+            DELETE FROM club_players WHERE club_id = target_club AND player_id = target_player;
+            UPDATE clubs SET players_count = GREATEST(players_count - 1, 0) WHERE id = target_club;
+        END IF;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION track_club_participants() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM adjust_club_player(
+            (SELECT resolve_club_id(club, city) FROM tournaments WHERE id = OLD.tournament_id AND club IS NOT NULL),
+            OLD.player_id, -1
+        );
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM adjust_club_player(
+            (SELECT resolve_club_id(club, city) FROM tournaments WHERE id = NEW.tournament_id AND club IS NOT NULL),
+            NEW.player_id, 1
+        );
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION track_club_counters() RETURNS trigger AS $$
+DECLARE
+    changed_tournament INTEGER := CASE WHEN TG_OP = 'DELETE' THEN OLD.id ELSE NEW.id END;
+    player_ids INTEGER[] := ARRAY(
+        SELECT tp.player_id FROM t_p79348767_tournament_site_buil.tournament_participants tp WHERE tp.tournament_id = changed_tournament
+    );
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.club IS NOT NULL THEN
+        PERFORM apply_club_tournament(OLD.club, OLD.city, player_ids, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.club IS NOT NULL THEN
+        PERFORM apply_club_tournament(NEW.club, NEW.city, player_ids, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_tournaments_club_counters ON tournaments;
+CREATE TRIGGER trg_tournaments_club_counters
+AFTER INSERT OR DELETE OR UPDATE OF club, city ON tournaments
+FOR EACH ROW EXECUTE FUNCTION track_club_counters();
+
+DROP TRIGGER IF EXISTS trg_tournament_participants_club_counters ON t_p79348767_tournament_site_buil.tournament_participants;
+CREATE TRIGGER trg_tournament_participants_club_counters
+AFTER INSERT OR DELETE OR UPDATE OF tournament_id, player_id ON t_p79348767_tournament_site_buil.tournament_participants
+FOR EACH ROW EXECUTE FUNCTION track_club_participants();
+
+ALTER TABLE t_p79348767_tournament_site_buil.tournaments DROP COLUMN IF EXISTS participants;
+ALTER TABLE t_p79348767_tournament_site_buil.tournaments DROP COLUMN IF EXISTS dropped_players;
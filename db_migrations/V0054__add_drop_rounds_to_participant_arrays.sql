@@ -0,0 +1,8 @@
+-- Drop rounds alongside the arrays: standings and pairing read {player_id: drop_round} instead of rescanning rounds
+CREATE OR REPLACE VIEW t_p79348767_tournament_site_buil.tournament_participant_arrays AS
+SELECT tournament_id,
+       array_agg(player_id ORDER BY registration_order, player_id) AS participants,
+       COALESCE(array_agg(player_id ORDER BY registration_order, player_id) FILTER (WHERE drop_round IS NOT NULL), '{}') AS dropped_players,
+       COALESCE(jsonb_object_agg(player_id::text, drop_round) FILTER (WHERE drop_round IS NOT NULL), '{}'::jsonb) AS drop_rounds
+FROM t_p79348767_tournament_site_buil.tournament_participants
+GROUP BY tournament_id;
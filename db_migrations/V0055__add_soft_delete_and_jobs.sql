@@ -0,0 +1,26 @@
+-- Soft delete: a deleted tournament disappears from listings at once, its rows are purged later in batches
+ALTER TABLE t_p79348767_tournament_site_buil.tournaments ADD COLUMN IF NOT EXISTS deleted_at TIMESTAMP;
+
+CREATE INDEX IF NOT EXISTS idx_tournaments_live_created
+ON t_p79348767_tournament_site_buil.tournaments (created_at DESC)
+WHERE deleted_at IS NULL;
+
+-- Background jobs: workers claim rows with FOR UPDATE SKIP LOCKED and hold a lease while working,
+-- so a job whose worker died is picked up again once locked_until passes
+CREATE TABLE IF NOT EXISTS t_p79348767_tournament_site_buil.jobs (
+    id BIGSERIAL PRIMARY KEY,
+    kind VARCHAR(64) NOT NULL,
+    payload JSONB NOT NULL DEFAULT '{}'::jsonb,
+    status VARCHAR(16) NOT NULL DEFAULT 'queued' CHECK (status IN ('queued', 'running', 'done', 'failed')),
+    progress JSONB NOT NULL DEFAULT '{}'::jsonb,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    run_after TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    locked_until TIMESTAMPTZ,
+    last_error TEXT,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_jobs_ready
+ON t_p79348767_tournament_site_buil.jobs (kind, run_after, id)
+WHERE status IN ('queued', 'running');
@@ -0,0 +1,22 @@
+-- Job subsystem: retries with backoff, results, and serialization keys.
+-- Jobs sharing a key (e.g. tournament:42) run one at a time in queue order.
+ALTER TABLE t_p79348767_tournament_site_buil.jobs
+    ADD COLUMN IF NOT EXISTS serialization_key VARCHAR(128),
+    ADD COLUMN IF NOT EXISTS max_attempts INTEGER NOT NULL DEFAULT 5,
+    ADD COLUMN IF NOT EXISTS result JSONB,
+    ADD COLUMN IF NOT EXISTS finished_at TIMESTAMPTZ;
+
+CREATE INDEX IF NOT EXISTS idx_jobs_serialization_key
+ON t_p79348767_tournament_site_buil.jobs (serialization_key, id)
+WHERE status IN ('queued', 'running') AND serialization_key IS NOT NULL;
+
+-- Any worker now picks up any kind, so readiness is indexed without kind
+DROP INDEX IF EXISTS t_p79348767_tournament_site_buil.idx_jobs_ready;
+CREATE INDEX IF NOT EXISTS idx_jobs_ready
+ON t_p79348767_tournament_site_buil.jobs (run_after, id)
+WHERE status IN ('queued', 'running');
+
+-- Purge jobs queued before workers existed get their tournament key
+UPDATE t_p79348767_tournament_site_buil.jobs
+SET serialization_key = 'tournament:' || (payload->>'tournament_id')
+WHERE kind = 'purge-tournament' AND serialization_key IS NULL;
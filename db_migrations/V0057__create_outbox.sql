@@ -0,0 +1,18 @@
+-- Transactional outbox: each domain write records an event in its own transaction;
+-- the jobs dispatcher turns pending events into coalesced derived-data jobs
+CREATE TABLE IF NOT EXISTS t_p79348767_tournament_site_buil.outbox (
+    id BIGSERIAL PRIMARY KEY,
+    tournament_id INTEGER,
+    event_type VARCHAR(64) NOT NULL,
+    payload JSONB NOT NULL DEFAULT '{}'::jsonb,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    dispatched_at TIMESTAMPTZ
+);
+
+CREATE INDEX IF NOT EXISTS idx_outbox_pending
+ON t_p79348767_tournament_site_buil.outbox (id)
+WHERE dispatched_at IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_outbox_dispatched
+ON t_p79348767_tournament_site_buil.outbox (dispatched_at)
+WHERE dispatched_at IS NOT NULL;
@@ -0,0 +1,75 @@
+-- Invalidation bus: bump the version row of a cache key and NOTIFY cache_invalidation with
+-- {"t": type, "id": id, "v": version}; the notification is delivered when the transaction commits
+CREATE OR REPLACE FUNCTION t_p79348767_tournament_site_buil.publish_invalidation(resource_type TEXT, resource_id TEXT)
+RETURNS BIGINT AS $$
+DECLARE
+    cache_key TEXT := CASE WHEN resource_id IS NULL THEN resource_type ELSE resource_type || ':' || resource_id END;
+    new_version BIGINT;
+BEGIN
+    INSERT INTO t_p79348767_tournament_site_buil.reference_versions (resource, version, updated_at)
+    VALUES (cache_key, 1, NOW())
+    ON CONFLICT (resource) DO UPDATE
+    SET version = reference_versions.version + 1, updated_at = NOW()
+    RETURNING version INTO new_version;
+    PERFORM pg_notify('cache_invalidation', json_build_object('t', resource_type, 'id', resource_id, 'v', new_version)::text);
+    RETURN new_version;
+END;
+$$ LANGUAGE plpgsql;
+
+ALTER TABLE t_p79348767_tournament_site_buil.reference_versions ALTER COLUMN resource TYPE VARCHAR(100);
+
+-- Games and tournaments publish from triggers so every writer is covered; statement-level with
+-- transition tables, so a batch touching many rows publishes once per tournament
+CREATE OR REPLACE FUNCTION t_p79348767_tournament_site_buil.publish_games_invalidation() RETURNS trigger AS $$
+BEGIN
+    PERFORM t_p79348767_tournament_site_buil.publish_invalidation('games', tournament_id::text)
+    FROM (SELECT DISTINCT tournament_id FROM changed_rows) affected;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION t_p79348767_tournament_site_buil.publish_tournament_invalidation() RETURNS trigger AS $$
+BEGIN
+    PERFORM t_p79348767_tournament_site_buil.publish_invalidation('tournament', id::text)
+    FROM (SELECT DISTINCT id FROM changed_rows) affected;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION t_p79348767_tournament_site_buil.publish_participants_invalidation() RETURNS trigger AS $$
+BEGIN
+    PERFORM t_p79348767_tournament_site_buil.publish_invalidation('tournament', tournament_id::text)
+    FROM (SELECT DISTINCT tournament_id FROM changed_rows) affected;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_games_invalidation_insert ON t_p79348767_tournament_site_buil.games;
+CREATE TRIGGER trg_games_invalidation_insert AFTER INSERT ON t_p79348767_tournament_site_buil.games
+REFERENCING NEW TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION t_p79348767_tournament_site_buil.publish_games_invalidation();
+DROP TRIGGER IF EXISTS trg_games_invalidation_update ON t_p79348767_tournament_site_buil.games;
+CREATE TRIGGER trg_games_invalidation_update AFTER UPDATE ON t_p79348767_tournament_site_buil.games
+REFERENCING NEW TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION t_p79348767_tournament_site_buil.publish_games_invalidation();
+DROP TRIGGER IF EXISTS trg_games_invalidation_delete ON t_p79348767_tournament_site_buil.games;
+CREATE TRIGGER trg_games_invalidation_delete AFTER DELETE ON t_p79348767_tournament_site_buil.games
+REFERENCING OLD TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION t_p79348767_tournament_site_buil.publish_games_invalidation();
+
+DROP TRIGGER IF EXISTS trg_tournaments_invalidation_insert ON t_p79348767_tournament_site_buil.tournaments;
+CREATE TRIGGER trg_tournaments_invalidation_insert AFTER INSERT ON t_p79348767_tournament_site_buil.tournaments
+REFERENCING NEW TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION t_p79348767_tournament_site_buil.publish_tournament_invalidation();
+DROP TRIGGER IF EXISTS trg_tournaments_invalidation_update ON t_p79348767_tournament_site_buil.tournaments;
+CREATE TRIGGER trg_tournaments_invalidation_update AFTER UPDATE ON t_p79348767_tournament_site_buil.tournaments
+REFERENCING NEW TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION t_p79348767_tournament_site_buil.publish_tournament_invalidation();
+DROP TRIGGER IF EXISTS trg_tournaments_invalidation_delete ON t_p79348767_tournament_site_buil.tournaments;
+CREATE TRIGGER trg_tournaments_invalidation_delete AFTER DELETE ON t_p79348767_tournament_site_buil.tournaments
+REFERENCING OLD TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION t_p79348767_tournament_site_buil.publish_tournament_invalidation();
+
+DROP TRIGGER IF EXISTS trg_tournament_participants_invalidation_insert ON t_p79348767_tournament_site_buil.tournament_participants;
+CREATE TRIGGER trg_tournament_participants_invalidation_insert AFTER INSERT ON t_p79348767_tournament_site_buil.tournament_participants
+REFERENCING NEW TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION t_p79348767_tournament_site_buil.publish_participants_invalidation();
+DROP TRIGGER IF EXISTS trg_tournament_participants_invalidation_update ON t_p79348767_tournament_site_buil.tournament_participants;
+CREATE TRIGGER trg_tournament_participants_invalidation_update AFTER UPDATE ON t_p79348767_tournament_site_buil.tournament_participants
+REFERENCING NEW TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION t_p79348767_tournament_site_buil.publish_participants_invalidation();
+DROP TRIGGER IF EXISTS trg_tournament_participants_invalidation_delete ON t_p79348767_tournament_site_buil.tournament_participants;
+CREATE TRIGGER trg_tournament_participants_invalidation_delete AFTER DELETE ON t_p79348767_tournament_site_buil.tournament_participants
+REFERENCING OLD TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION t_p79348767_tournament_site_buil.publish_participants_invalidation();
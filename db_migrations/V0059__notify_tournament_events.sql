@@ -0,0 +1,26 @@
+-- Live feed: every tournament outbox event is also sent on NOTIFY tournament_events (delivered at commit),
+-- so the self-hosted SSE server fans it out without polling; ids double as SSE Last-Event-ID
+CREATE OR REPLACE FUNCTION t_p79348767_tournament_site_buil.notify_tournament_event()
+RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('tournament_events', json_build_object(
+        'id', NEW.id,
+        'tid', NEW.tournament_id,
+        'type', NEW.event_type,
+        'payload', NEW.payload,
+        'at', NEW.created_at
+    )::text);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS outbox_notify_tournament_event ON t_p79348767_tournament_site_buil.outbox;
+CREATE TRIGGER outbox_notify_tournament_event
+AFTER INSERT ON t_p79348767_tournament_site_buil.outbox
+FOR EACH ROW
+WHEN (NEW.tournament_id IS NOT NULL)
+EXECUTE FUNCTION t_p79348767_tournament_site_buil.notify_tournament_event();
+
+-- Resume reads: events of one tournament after a given id
+CREATE INDEX IF NOT EXISTS idx_outbox_tournament
+ON t_p79348767_tournament_site_buil.outbox (tournament_id, id);
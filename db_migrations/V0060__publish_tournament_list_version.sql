@@ -0,0 +1,19 @@
+-- The public tournament list has its own revision: any tournament or participant change also
+-- publishes 'tournaments', so single-flight readers of the list key their shared load by it
+CREATE OR REPLACE FUNCTION t_p79348767_tournament_site_buil.publish_tournament_invalidation() RETURNS trigger AS $$
+BEGIN
+    PERFORM t_p79348767_tournament_site_buil.publish_invalidation('tournament', id::text)
+    FROM (SELECT DISTINCT id FROM changed_rows) affected;
+    PERFORM t_p79348767_tournament_site_buil.publish_invalidation('tournaments', NULL);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION t_p79348767_tournament_site_buil.publish_participants_invalidation() RETURNS trigger AS $$
+BEGIN
+    PERFORM t_p79348767_tournament_site_buil.publish_invalidation('tournament', tournament_id::text)
+    FROM (SELECT DISTINCT tournament_id FROM changed_rows) affected;
+    PERFORM t_p79348767_tournament_site_buil.publish_invalidation('tournaments', NULL);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
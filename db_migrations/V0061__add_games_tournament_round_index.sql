@@ -0,0 +1,3 @@
+-- Games of a tournament grouped by round (tournament view, games GET) read one index range
+CREATE INDEX IF NOT EXISTS idx_games_tournament_round
+ON t_p79348767_tournament_site_buil.games (tournament_id, round_number, id);
@@ -0,0 +1,7 @@
+-- "My match" reads of games GET (tournament_id + player_id): one lookup per side, combined by a BitmapOr
+CREATE INDEX IF NOT EXISTS idx_games_tournament_player1
+ON t_p79348767_tournament_site_buil.games (tournament_id, player1_id, round_number);
+
+CREATE INDEX IF NOT EXISTS idx_games_tournament_player2
+ON t_p79348767_tournament_site_buil.games (tournament_id, player2_id, round_number)
+WHERE player2_id IS NOT NULL;
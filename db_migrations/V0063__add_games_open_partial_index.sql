@@ -0,0 +1,6 @@
+-- Games still waiting for a result: a small partial index that covers the round-status dashboard
+-- and games GET ?open=1, so a judge's refresh during a 200-table round reads only the open tables
+CREATE INDEX IF NOT EXISTS idx_games_open
+ON t_p79348767_tournament_site_buil.games (tournament_id, round_number, table_number, id)
+INCLUDE (player1_id, player2_id, created_at, updated_at)
+WHERE result IS NULL;
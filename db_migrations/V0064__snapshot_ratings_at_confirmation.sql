@@ -0,0 +1,24 @@
+-- Rating changes are computed from the ratings players had before the tournament. The client writes the
+-- final ratings right after confirming, so confirmation snapshots the participants' ratings first;
+-- recalculate-ratings jobs running later read the snapshot instead of the already-updated ratings
+ALTER TABLE t_p79348767_tournament_site_buil.tournament_participants
+ADD COLUMN IF NOT EXISTS rating_before INTEGER;
+
+COMMENT ON COLUMN t_p79348767_tournament_site_buil.tournament_participants.rating_before IS 'users.rating when the tournament was confirmed; NULL before confirmation';
+
+CREATE OR REPLACE FUNCTION t_p79348767_tournament_site_buil.snapshot_confirmed_ratings() RETURNS trigger AS $$
+BEGIN
+    UPDATE t_p79348767_tournament_site_buil.tournament_participants tp
+    SET rating_before = COALESCE(u.rating, 1200)
+    FROM t_p79348767_tournament_site_buil.users u
+    WHERE tp.tournament_id = NEW.id AND u.id = tp.player_id AND tp.rating_before IS NULL;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_tournaments_snapshot_ratings ON t_p79348767_tournament_site_buil.tournaments;
+CREATE TRIGGER trg_tournaments_snapshot_ratings
+AFTER UPDATE OF status ON t_p79348767_tournament_site_buil.tournaments
+FOR EACH ROW
+WHEN (NEW.status = 'confirmed' AND OLD.status IS DISTINCT FROM 'confirmed')
+EXECUTE FUNCTION t_p79348767_tournament_site_buil.snapshot_confirmed_ratings();
@@ -0,0 +1,44 @@
+-- The tournament list revision is MAX(revision) over tournaments instead of the single 'tournaments' row of
+-- reference_versions, which every tournament and participant write had to lock. Revisions come from a sequence
+-- and are assigned per row, so writers of different tournaments never wait on each other
+CREATE SEQUENCE IF NOT EXISTS t_p79348767_tournament_site_buil.tournaments_revision_seq;
+
+ALTER TABLE t_p79348767_tournament_site_buil.tournaments
+ADD COLUMN IF NOT EXISTS revision BIGINT NOT NULL DEFAULT nextval('t_p79348767_tournament_site_buil.tournaments_revision_seq');
+
+CREATE INDEX IF NOT EXISTS idx_tournaments_revision
+ON t_p79348767_tournament_site_buil.tournaments (revision);
+
+CREATE OR REPLACE FUNCTION t_p79348767_tournament_site_buil.bump_tournaments_revision() RETURNS trigger AS $$
+BEGIN
+    NEW.revision := nextval('t_p79348767_tournament_site_buil.tournaments_revision_seq');
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_tournaments_revision ON t_p79348767_tournament_site_buil.tournaments;
+CREATE TRIGGER trg_tournaments_revision
+BEFORE UPDATE ON t_p79348767_tournament_site_buil.tournaments
+FOR EACH ROW EXECUTE FUNCTION t_p79348767_tournament_site_buil.bump_tournaments_revision();
+
+-- Back to the V0058 bodies: per-tournament keys only
+CREATE OR REPLACE FUNCTION t_p79348767_tournament_site_buil.publish_tournament_invalidation() RETURNS trigger AS $$
+BEGIN
+    PERFORM t_p79348767_tournament_site_buil.publish_invalidation('tournament', id::text)
+    FROM (SELECT DISTINCT id FROM changed_rows) affected;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Participant rows are part of the list: touching the parent row gives it a new revision (trg_tournaments_revision)
+-- and publishes its 'tournament' key through the tournaments update trigger
+CREATE OR REPLACE FUNCTION t_p79348767_tournament_site_buil.publish_participants_invalidation() RETURNS trigger AS $$
+BEGIN
+    UPDATE t_p79348767_tournament_site_buil.tournaments
+    SET revision = revision
+    WHERE id IN (SELECT DISTINCT tournament_id FROM changed_rows);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DELETE FROM t_p79348767_tournament_site_buil.reference_versions WHERE resource = 'tournaments';
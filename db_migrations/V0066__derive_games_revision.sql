@@ -0,0 +1,29 @@
+-- A tournament's games revision is (MAX(revision), COUNT(*)) over its games instead of the reference_versions
+-- row 'games:<id>', which every result entry of the round had to lock until commit. Revisions come from a
+-- sequence and are assigned per row; the count catches deletes
+CREATE SEQUENCE IF NOT EXISTS t_p79348767_tournament_site_buil.games_revision_seq;
+
+ALTER TABLE t_p79348767_tournament_site_buil.games
+ADD COLUMN IF NOT EXISTS revision BIGINT NOT NULL DEFAULT nextval('t_p79348767_tournament_site_buil.games_revision_seq');
+
+CREATE INDEX IF NOT EXISTS idx_games_tournament_revision
+ON t_p79348767_tournament_site_buil.games (tournament_id, revision);
+
+CREATE OR REPLACE FUNCTION t_p79348767_tournament_site_buil.bump_games_revision() RETURNS trigger AS $$
+BEGIN
+    NEW.revision := nextval('t_p79348767_tournament_site_buil.games_revision_seq');
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_games_revision ON t_p79348767_tournament_site_buil.games;
+CREATE TRIGGER trg_games_revision
+BEFORE UPDATE ON t_p79348767_tournament_site_buil.games
+FOR EACH ROW EXECUTE FUNCTION t_p79348767_tournament_site_buil.bump_games_revision();
+
+DROP TRIGGER IF EXISTS trg_games_invalidation_insert ON t_p79348767_tournament_site_buil.games;
+DROP TRIGGER IF EXISTS trg_games_invalidation_update ON t_p79348767_tournament_site_buil.games;
+DROP TRIGGER IF EXISTS trg_games_invalidation_delete ON t_p79348767_tournament_site_buil.games;
+DROP FUNCTION IF EXISTS t_p79348767_tournament_site_buil.publish_games_invalidation();
+
+DELETE FROM t_p79348767_tournament_site_buil.reference_versions WHERE resource LIKE 'games:%';
@@ -0,0 +1,230 @@
+'''
+Business: Benchmark harness - runs cloud function handlers in-process against a real database
+Args: function names from backend/, --iterations, --include-writes, --top, --cold-start,
+      --login-burst with --credentials and --concurrency
+Returns: latency table per scenario and top-N SQL fingerprints by DB time;
+         with --cold-start exits non-zero when a handler exceeds its cold-start budget;
+         with --login-burst successful logins per second
+'''
+
+import argparse
+import contextlib
+import itertools
+import importlib.util
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from typing import Dict, Any, List
+from urllib.parse import urlsplit, parse_qsl
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend')
+BUDGETS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'coldstart_budgets.json')
+HEAVY_MODULES = ('psycopg2', 'jwt', 'bcrypt', 'cProfile', 'pstats')
+
+# Runs in a fresh interpreter: module import plus the first OPTIONS preflight
+COLD_START_PROBE = '''
+import importlib.util, json, sys, time
+from types import SimpleNamespace
+started = time.perf_counter()
+spec = importlib.util.spec_from_file_location('cold_start_probe', sys.argv[1])
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+imported = time.perf_counter()
+module.handler({'httpMethod': 'OPTIONS', 'headers': {}}, SimpleNamespace(request_id='cold-start', function_name=sys.argv[2]))
+answered = time.perf_counter()
+print(json.dumps({
+    'import_ms': (imported - started) * 1000,
+    'preflight_ms': (answered - imported) * 1000,
+    'heavy_modules': [name for name in sys.argv[3].split(',') if name in sys.modules]
+}))
+'''
+
+def load_function(name: str) -> Any:
+    '''Import backend/<name>/index.py as an isolated module'''
+    path = os.path.join(BACKEND_DIR, name, 'index.py')
+    spec = importlib.util.spec_from_file_location(f'bench_{name.replace("-", "_")}', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def load_scenarios(name: str, include_writes: bool) -> List[Dict[str, Any]]:
+    '''Build handler events from the function's tests.json'''
+    with open(os.path.join(BACKEND_DIR, name, 'tests.json'), encoding='utf-8') as f:
+        tests = json.load(f).get('tests', [])
+
+    scenarios = []
+    for test in tests:
+        method = test.get('method', 'GET')
+        if method != 'GET' and not include_writes:
+            continue
+        url = urlsplit(test.get('path', '/'))
+        scenarios.append({
+            'name': test.get('name', method),
+            'event': {
+                'httpMethod': method,
+                'path': url.path or '/',
+                'headers': test.get('headers', {}),
+                'queryStringParameters': dict(parse_qsl(url.query)) or None,
+                'body': json.dumps(test['body']) if 'body' in test else None,
+                'requestContext': {'identity': {'sourceIp': '127.0.0.1'}}
+            }
+        })
+    return scenarios
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[int(round(q * (len(ordered) - 1)))] if ordered else 0.0
+
+def measure_cold_start(name: str, runs: int) -> Dict[str, Any]:
+    '''Median import + first preflight time over fresh interpreters, with -X importtime offenders'''
+    env = {key: value for key, value in os.environ.items() if key != 'PREWARM_ON_IMPORT'}
+    samples = []
+    offenders: Dict[str, int] = {}
+    for _ in range(runs):
+        completed = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', COLD_START_PROBE,
+             os.path.join(BACKEND_DIR, name, 'index.py'), name, ','.join(HEAVY_MODULES)],
+            capture_output=True, text=True, env=env, check=True
+        )
+        samples.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+        for line in completed.stderr.splitlines():
+            parts = line.split('|')
+            if line.startswith('import time:') and len(parts) == 3 and parts[1].strip().isdigit():
+                module_name = parts[2].strip()
+                offenders[module_name] = max(offenders.get(module_name, 0), int(parts[1]))
+    top_offenders = sorted(offenders.items(), key=lambda item: item[1], reverse=True)[:5]
+    return {
+        'total_ms': statistics.median(sample['import_ms'] + sample['preflight_ms'] for sample in samples),
+        'import_ms': statistics.median(sample['import_ms'] for sample in samples),
+        'heavy_modules': samples[-1]['heavy_modules'],
+        'top_imports': [(module_name, microseconds / 1000) for module_name, microseconds in top_offenders]
+    }
+
+def check_cold_starts(names: List[str], runs: int) -> bool:
+    '''Compare cold starts with coldstart_budgets.json; heavy modules must stay lazy'''
+    with open(BUDGETS_PATH, encoding='utf-8') as f:
+        budgets = json.load(f)
+
+    ok = True
+    for name in names:
+        budget = budgets.get(name, budgets['default'])
+        result = measure_cold_start(name, runs)
+        within = result['total_ms'] <= budget and not result['heavy_modules']
+        ok = ok and within
+        print(f'{"ok  " if within else "FAIL"} {name:<22} cold start {result["total_ms"]:6.1f}ms (budget {budget}ms, '
+              f'import {result["import_ms"]:.1f}ms)')
+        if result['heavy_modules']:
+            print(f'     eagerly imported: {", ".join(result["heavy_modules"])}')
+        if not within:
+            for module_name, ms in result['top_imports']:
+                print(f'     {ms:6.1f}ms  {module_name}')
+    return ok
+
+def run(name: str, iterations: int, include_writes: bool, top: int) -> None:
+    module = load_function(name)
+    scenarios = load_scenarios(name, include_writes)
+    print(f'== {name}: {len(scenarios)} scenario(s) x {iterations}')
+
+    for scenario in scenarios:
+        durations = []
+        statuses = set()
+        for i in range(iterations):
+            context = SimpleNamespace(request_id=f'bench-{i}', function_name=name)
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                started = time.perf_counter()
+                response = module.handler(dict(scenario['event']), context)
+                durations.append((time.perf_counter() - started) * 1000)
+            statuses.add(response.get('statusCode'))
+        print(f'  {scenario["name"]:<40} status={sorted(statuses)} '
+              f'p50={percentile(durations, 0.5):.1f}ms p95={percentile(durations, 0.95):.1f}ms '
+              f'max={max(durations):.1f}ms')
+
+    if hasattr(module, 'sql_stats_report'):
+        print(f'  -- top {top} statements by DB time')
+        for row in module.sql_stats_report(top):
+            print(f'  {row["share"] * 100:5.1f}% {row["total_ms"]:9.1f}ms calls={row["calls"]:<5} '
+                  f'p50={row["p50_ms"]}ms p95={row["p95_ms"]}ms rows~{row["rows_mean"]}  {row["fingerprint"][:120]}')
+
+    if hasattr(module, 'single_flight_report'):
+        print('  -- single-flight keys by collapsed requests')
+        for row in module.single_flight_report(top):
+            print(f'  loads={row["loads"]:<5} collapsed={row["collapsed"]:<5} {row["key"][:120]}')
+
+def login_burst(total: int, concurrency: int, credentials_path: str) -> None:
+    '''Event-day start: players log in at once, all behind the venue's single address'''
+    with open(credentials_path, encoding='utf-8') as f:
+        credentials = [line.rstrip('\n').split(':', 1) for line in f if ':' in line]
+    if not credentials:
+        sys.exit(f'{credentials_path}: expected username:password lines')
+
+    module = load_function('auth')
+    module.warm_up()
+    events = [{
+        'httpMethod': 'POST',
+        'path': '/',
+        'headers': {},
+        'body': json.dumps({'username': username, 'password': password}),
+        'requestContext': {'identity': {'sourceIp': '10.0.0.1'}}
+    } for username, password in itertools.islice(itertools.cycle(credentials), total)]
+
+    def login(index: int) -> tuple:
+        context = SimpleNamespace(request_id=f'burst-{index}', function_name='auth')
+        started = time.perf_counter()
+        response = module.handler(events[index], context)
+        return response.get('statusCode'), (time.perf_counter() - started) * 1000
+
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(login, range(total)))
+        elapsed = time.perf_counter() - started
+
+    statuses = Counter(status for status, _ in results)
+    durations = [ms for _, ms in results]
+    print(f'== auth login burst: {total} logins, concurrency {concurrency}, {elapsed:.2f}s')
+    print(f'  {statuses.get(200, 0) / elapsed:.1f} successful logins/s, statuses {dict(sorted(statuses.items()))}')
+    print(f'  p50={percentile(durations, 0.5):.1f}ms p95={percentile(durations, 0.95):.1f}ms max={max(durations):.1f}ms')
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('functions', nargs='*', help='function directory names under backend/ (default: all)')
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--include-writes', action='store_true', help='also run POST/PUT/DELETE scenarios')
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--cold-start', action='store_true', help='check import + preflight time against budgets, no database needed')
+    parser.add_argument('--cold-start-runs', type=int, default=5)
+    parser.add_argument('--login-burst', type=int, metavar='N', help='fire N concurrent logins at auth and report logins/s')
+    parser.add_argument('--credentials', help='username:password per line, cycled through by --login-burst')
+    parser.add_argument('--concurrency', type=int, default=8)
+    args = parser.parse_args()
+
+    args.functions = args.functions or sorted(
+        name for name in os.listdir(BACKEND_DIR) if os.path.isfile(os.path.join(BACKEND_DIR, name, 'index.py'))
+    )
+
+    if args.cold_start:
+        sys.exit(0 if check_cold_starts(args.functions, args.cold_start_runs) else 1)
+
+    if not os.environ.get('DATABASE_URL'):
+        sys.exit('DATABASE_URL must point to a disposable database')
+
+    if args.login_burst:
+        if not args.credentials:
+            sys.exit('--login-burst needs --credentials')
+        login_burst(args.login_burst, args.concurrency, args.credentials)
+        return
+
+    # Capture every statement while benchmarking; handlers read this at import
+    os.environ.setdefault('SQL_STATS_SAMPLE_RATE', '1')
+
+    for name in args.functions:
+        run(name, args.iterations, args.include_writes, args.top)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+'''
+Business: Check that helpers inlined into every cloud function stay identical
+Args: none (scans backend/*/index.py)
+Returns: exit code 1 and a list of drifted helpers when copies differ
+'''
+
+import ast
+import os
+import sys
+from typing import Dict, List
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend')
+
+# Top-level names that must have the same source in every function defining them
+INLINE_GROUPS: Dict[str, List[str]] = {
+    'runtime': ['LazyModule', 'get_connection', 'release_connection', 'is_warm_up'],
+    'auth': ['get_jwt_secret', 'decode_token', 'verify_token', 'create_auth_error', 'is_admin', 'judges_tournament',
+             'BloomFilter', 'remember_revocation', 'refresh_revocations', 'is_token_revoked', 'can_manage_tournament'],
+    'sql stats': ['fingerprint_sql', 'explain_sql', 'record_sql', 'stats_cursor_class', 'open_cursor',
+                  '_percentile', 'sql_stats_report', 'with_sql_stats'],
+    'profiling': ['requested_profile_mode', 'StackSampler', 'store_profile', 'with_profiling'],
+    'reference cache': ['read_reference_version', 'invalidate_reference', 'bump_reference_version', 'apply_invalidation',
+                        'listen_for_invalidations', 'start_invalidation_listener', 'cached_reference',
+                        'load_cities', 'load_formats', 'load_clubs'],
+    'jobs': ['enqueue_job', 'read_job'],
+    'outbox': ['record_outbox'],
+    'single flight': ['Flight', 'flight_request_key', 'single_flight', 'single_flight_report'],
+}
+
+def top_level_sources(path: str) -> Dict[str, str]:
+    with open(path, encoding='utf-8') as f:
+        source = f.read()
+    return {
+        node.name: ast.get_source_segment(source, node)
+        for node in ast.parse(source).body
+        if isinstance(node, (ast.FunctionDef, ast.ClassDef))
+    }
+
+def main() -> None:
+    sources = {}
+    for name in sorted(os.listdir(BACKEND_DIR)):
+        path = os.path.join(BACKEND_DIR, name, 'index.py')
+        if os.path.isfile(path):
+            sources[name] = top_level_sources(path)
+
+    drifted = []
+    for group, helpers in INLINE_GROUPS.items():
+        for helper in helpers:
+            variants: Dict[str, List[str]] = {}
+            for function_name, definitions in sources.items():
+                if helper in definitions:
+                    variants.setdefault(definitions[helper], []).append(function_name)
+            if len(variants) > 1:
+                owners = ' | '.join(', '.join(names) for names in variants.values())
+                drifted.append(f'{group}: {helper} differs between [{owners}]')
+
+    for line in drifted:
+        print(line)
+    if drifted:
+        sys.exit(1)
+    print(f'inline helpers identical across {len(sources)} functions')
+
+if __name__ == '__main__':
+    main()
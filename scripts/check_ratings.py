@@ -0,0 +1,124 @@
+'''
+Business: End-to-end check of rating changes at confirmation - confirms a throwaway tournament through
+          save-tournament, applies the client's final-ratings write, then dispatches the outbox and runs the
+          recalculate-ratings job the way the jobs timer does
+Args: none (DATABASE_URL must point to a disposable database)
+Returns: exit code 1 when the per-game rating changes were not computed from the pre-tournament ratings
+'''
+
+import contextlib
+import json
+import os
+import sys
+import uuid
+from types import SimpleNamespace
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench import load_function
+
+SCHEMA = 't_p79348767_tournament_site_buil'
+START_RATINGS = [1200, 1350, 1500, 1100]
+# round, player1 index, player2 index, result
+GAMES = [(1, 0, 1, 'win1'), (1, 2, 3, 'draw'), (2, 0, 2, 'win2'), (2, 1, 3, 'win1')]
+SCORES = {'win1': (1.0, 0.0), 'win2': (0.0, 1.0), 'draw': (0.5, 0.5)}
+
+def expected_changes(jobs, ratings: Dict[int, int], games: List[Tuple[int, int, int, int, str]]) -> Dict[int, Tuple[int, int]]:
+    '''The client's confirmation arithmetic: Elo round by round from the starting ratings, floored at 0'''
+    ratings = dict(ratings)
+    changes = {}
+    for game_id, _, player1, player2, result in games:
+        change1 = jobs.calculate_elo_change(ratings[player1], ratings[player2], SCORES[result][0])
+        change2 = jobs.calculate_elo_change(ratings[player2], ratings[player1], SCORES[result][1])
+        ratings[player1] = max(0, ratings[player1] + change1)
+        ratings[player2] = max(0, ratings[player2] + change2)
+        changes[game_id] = (change1, change2)
+    return changes
+
+def main() -> None:
+    if not os.environ.get('DATABASE_URL'):
+        sys.exit('DATABASE_URL must point to a disposable database')
+
+    jobs = load_function('jobs')
+    save_tournament = load_function('save-tournament')
+    conn = jobs.get_connection()
+    cur = conn.cursor()
+    tag = uuid.uuid4().hex[:8]
+    player_ids: List[int] = []
+    tournament_id = None
+    try:
+        for index, rating in enumerate(START_RATINGS):
+            cur.execute(f"""
+                INSERT INTO {SCHEMA}.users (username, password, name, role, rating)
+                VALUES (%s, 'x', %s, 'player', %s) RETURNING id
+            """, (f'rating-check-{tag}-{index}', f'Rating check {index}', rating))
+            player_ids.append(cur.fetchone()[0])
+        cur.execute(f"""
+            INSERT INTO {SCHEMA}.tournaments (name, type, is_rated, swiss_rounds, top_rounds, status, current_round)
+            VALUES (%s, 'swiss', TRUE, 2, 0, 'active', 2) RETURNING id
+        """, (f'Rating check {tag}',))
+        tournament_id = cur.fetchone()[0]
+        for order, player_id in enumerate(player_ids, start=1):
+            cur.execute(f"""
+                INSERT INTO {SCHEMA}.tournament_participants (tournament_id, player_id, registration_order)
+                VALUES (%s, %s, %s)
+            """, (tournament_id, player_id, order))
+        games = []
+        for round_number, first, second, result in GAMES:
+            cur.execute(f"""
+                INSERT INTO {SCHEMA}.games (tournament_id, round_number, player1_id, player2_id, result)
+                VALUES (%s, %s, %s, %s, %s) RETURNING id
+            """, (tournament_id, round_number, player_ids[first], player_ids[second], result))
+            games.append((cur.fetchone()[0], round_number, player_ids[first], player_ids[second], result))
+        conn.commit()
+
+        start = dict(zip(player_ids, START_RATINGS))
+        expected = expected_changes(jobs, start, games)
+
+        # Confirm the way the client does: save-tournament PUT, then the batch write of final ratings
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            response = save_tournament.handler(
+                {'httpMethod': 'PUT', 'headers': {}, 'body': json.dumps({'id': tournament_id, 'status': 'confirmed'})},
+                SimpleNamespace(request_id='rating-check', function_name='save-tournament')
+            )
+        if response['statusCode'] != 200:
+            sys.exit(f'confirm failed: {response["statusCode"]} {response["body"]}')
+        final = dict(start)
+        for game_id, _, player1, player2, _ in games:
+            final[player1] += expected[game_id][0]
+            final[player2] += expected[game_id][1]
+        for player_id, rating in final.items():
+            cur.execute(f'UPDATE {SCHEMA}.users SET rating = %s WHERE id = %s', (rating, player_id))
+        conn.commit()
+
+        jobs.dispatch_outbox()
+        jobs.work(60, ['recalculate-ratings'])
+
+        cur.execute(f"""
+            SELECT id, player1_rating_change, player2_rating_change FROM {SCHEMA}.games
+            WHERE tournament_id = %s ORDER BY id
+        """, (tournament_id,))
+        actual = {row[0]: (row[1], row[2]) for row in cur.fetchall()}
+        conn.commit()
+        failed = False
+        for game_id, changes in expected.items():
+            ok = actual.get(game_id) == changes
+            failed = failed or not ok
+            print(f'{"ok  " if ok else "FAIL"} game {game_id}: expected {changes}, stored {actual.get(game_id)}')
+        if failed:
+            sys.exit(1)
+    finally:
+        conn.rollback()
+        if tournament_id is not None:
+            cur.execute(f'DELETE FROM {SCHEMA}.games WHERE tournament_id = %s', (tournament_id,))
+            cur.execute(f'DELETE FROM {SCHEMA}.tournament_participants WHERE tournament_id = %s', (tournament_id,))
+            cur.execute(f'DELETE FROM {SCHEMA}.outbox WHERE tournament_id = %s', (tournament_id,))
+            cur.execute(f'DELETE FROM {SCHEMA}.tournaments WHERE id = %s', (tournament_id,))
+        if player_ids:
+            cur.execute(f'DELETE FROM {SCHEMA}.users WHERE id = ANY(%s)', (player_ids,))
+        conn.commit()
+        cur.close()
+        jobs.release_connection(conn)
+
+if __name__ == '__main__':
+    main()
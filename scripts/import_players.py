@@ -0,0 +1,62 @@
+'''
+Business: Bulk-register players from a CSV (name,city[,role,username]) or JSON ({"players": [...]}) file
+Args: path to the file, --token (or AUTH_TOKEN) of an admin/judge, --url to override the users function, --out
+Returns: CSV of created accounts with their temporary passwords; skipped rows are reported on stderr
+'''
+
+import argparse
+import csv
+import json
+import os
+import sys
+import urllib.error
+import urllib.request
+
+FUNC2URL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend', 'func2url.json')
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('path')
+    parser.add_argument('--token', default=os.environ.get('AUTH_TOKEN'))
+    parser.add_argument('--url')
+    parser.add_argument('--out', help='write credentials here instead of stdout')
+    args = parser.parse_args()
+
+    if not args.token:
+        sys.exit('--token or AUTH_TOKEN is required')
+    if not args.url:
+        with open(FUNC2URL_PATH, encoding='utf-8') as f:
+            args.url = json.load(f)['users']
+
+    with open(args.path, 'rb') as f:
+        payload = f.read()
+    is_csv = not args.path.lower().endswith('.json')
+    request = urllib.request.Request(
+        f'{args.url}?bulk=true',
+        data=payload,
+        method='POST',
+        headers={
+            'Content-Type': 'text/csv; charset=utf-8' if is_csv else 'application/json',
+            'X-Auth-Token': args.token
+        }
+    )
+    try:
+        with urllib.request.urlopen(request) as response:
+            result = json.loads(response.read().decode('utf-8'))
+    except urllib.error.HTTPError as e:
+        sys.exit(f'Import failed ({e.code}): {e.read().decode("utf-8")}')
+
+    for skipped in result.get('skipped', []):
+        print(f'row {skipped["row"]}: {skipped["username"]} skipped, {skipped["error"]}', file=sys.stderr)
+
+    out = open(args.out, 'w', newline='', encoding='utf-8') if args.out else sys.stdout
+    writer = csv.writer(out)
+    writer.writerow(['id', 'username', 'name', 'city', 'temporary_password'])
+    for user in result.get('created', []):
+        writer.writerow([user['id'], user['username'], user['name'], user['city'] or '', user['temporary_password']])
+    if args.out:
+        out.close()
+    print(f'{len(result.get("created", []))} created, {len(result.get("skipped", []))} skipped', file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+'''
+Business: Long-running job runner - dispatches the outbox and drives backend/jobs workers in a process pool
+          outside the timer trigger
+Args: --workers, --budget seconds per round, --idle-sleep between empty rounds, --kinds to restrict, --once
+Returns: one line of worker outcome counts per round that processed jobs
+'''
+
+import argparse
+import json
+import os
+import sys
+import time
+
+JOBS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend', 'jobs')
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--budget', type=float, default=60.0, help='seconds a worker keeps claiming jobs per round')
+    parser.add_argument('--idle-sleep', type=float, default=5.0)
+    parser.add_argument('--kinds', nargs='*', help='job kinds to run (default: all)')
+    parser.add_argument('--once', action='store_true', help='run a single round and exit')
+    args = parser.parse_args()
+
+    if not os.environ.get('DATABASE_URL'):
+        sys.exit('DATABASE_URL is required')
+
+    # Imported by module name so spawned worker processes can import it too
+    sys.path.insert(0, JOBS_DIR)
+    import index as jobs
+
+    kinds = args.kinds or list(jobs.JOB_FUNCTIONS)
+    while True:
+        jobs.dispatch_outbox()
+        outcomes = jobs.run_workers(args.workers, args.budget, kinds)
+        if outcomes:
+            print(json.dumps(outcomes), flush=True)
+        if args.once:
+            return
+        if not outcomes:
+            time.sleep(args.idle_sleep)
+
+if __name__ == '__main__':
+    main()
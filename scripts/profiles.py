@@ -0,0 +1,51 @@
+'''
+Business: Export stored handler profiles (PROFILE_STORE=db) for pstats, snakeviz or flame graphs
+Args: request_id, --out directory
+Returns: writes <request_id>.prof / .txt / .folded files and prints their paths
+'''
+
+import argparse
+import os
+import sys
+
+import psycopg2
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('request_id')
+    parser.add_argument('--out', default='.')
+    args = parser.parse_args()
+
+    dsn = os.environ.get('DATABASE_URL')
+    if not dsn:
+        sys.exit('DATABASE_URL is required')
+
+    conn = psycopg2.connect(dsn)
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT function_name, mode, duration_ms, report, raw
+        FROM t_p79348767_tournament_site_buil.handler_profiles
+        WHERE request_id = %s
+        ORDER BY created_at DESC
+    """, (args.request_id,))
+    rows = cursor.fetchall()
+    cursor.close()
+    conn.close()
+
+    if not rows:
+        sys.exit(f'No profile stored for request {args.request_id}')
+
+    os.makedirs(args.out, exist_ok=True)
+    for function_name, mode, duration_ms, report, raw in rows:
+        base = os.path.join(args.out, f'{function_name}-{args.request_id}')
+        extension = 'txt' if mode == 'cprofile' else 'folded'
+        with open(f'{base}.{extension}', 'w', encoding='utf-8') as f:
+            f.write(report)
+        print(f'{base}.{extension}  ({mode}, {duration_ms:.1f}ms)')
+        if raw:
+            with open(f'{base}.prof', 'wb') as f:
+                f.write(bytes(raw))
+            print(f'{base}.prof')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+'''
+Business: Aggregate sampled SQL_STATS log lines from production into a top-N DB time report
+Args: log files (or stdin) containing SQL_STATS lines, --top, --json
+Returns: fingerprints ranked by total DB time with duration and row-count distributions
+'''
+
+import argparse
+import fileinput
+import json
+from typing import Dict, Any, List
+
+MARKER = 'SQL_STATS '
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[int(round(q * (len(ordered) - 1)))] if ordered else 0.0
+
+def aggregate(lines) -> Dict[str, Dict[str, Any]]:
+    '''Group sampled statements by (function, fingerprint)'''
+    stats: Dict[str, Dict[str, Any]] = {}
+    for line in lines:
+        position = line.find(MARKER)
+        if position < 0:
+            continue
+        try:
+            record = json.loads(line[position + len(MARKER):])
+        except ValueError:
+            continue
+        for statement in record.get('statements', []):
+            key = f"{record.get('function')}: {statement['fingerprint']}"
+            entry = stats.setdefault(key, {'durations': [], 'rows': [], 'explain': None, 'requests': set()})
+            entry['durations'].append(statement['ms'])
+            entry['rows'].append(statement['rows'])
+            entry['requests'].add(record.get('request_id'))
+            if statement.get('explain') is not None:
+                entry['explain'] = statement['explain']
+    return stats
+
+def report(stats: Dict[str, Dict[str, Any]], top: int) -> List[Dict[str, Any]]:
+    grand_total = sum(sum(entry['durations']) for entry in stats.values()) or 1.0
+    rows = []
+    for key, entry in stats.items():
+        total = sum(entry['durations'])
+        rows.append({
+            'fingerprint': key,
+            'calls': len(entry['durations']),
+            'requests': len(entry['requests']),
+            'total_ms': round(total, 2),
+            'share': round(total / grand_total, 4),
+            'p50_ms': round(percentile(entry['durations'], 0.5), 2),
+            'p95_ms': round(percentile(entry['durations'], 0.95), 2),
+            'max_ms': round(max(entry['durations']), 2),
+            'rows_mean': round(sum(entry['rows']) / len(entry['rows']), 1),
+            'rows_max': max(entry['rows']),
+            'explain': entry['explain']
+        })
+    rows.sort(key=lambda row: row['total_ms'], reverse=True)
+    return rows[:top]
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('files', nargs='*', help='log files; stdin when omitted')
+    parser.add_argument('--top', type=int, default=20)
+    parser.add_argument('--json', action='store_true', help='print JSON including EXPLAIN plans')
+    args = parser.parse_args()
+
+    rows = report(aggregate(fileinput.input(args.files or ['-'])), args.top)
+    if args.json:
+        print(json.dumps(rows, ensure_ascii=False, indent=2))
+        return
+
+    for row in rows:
+        slow = ' [plan]' if row['explain'] is not None else ''
+        print(f'{row["share"] * 100:5.1f}% {row["total_ms"]:10.1f}ms calls={row["calls"]:<6} '
+              f'p50={row["p50_ms"]}ms p95={row["p95_ms"]}ms max={row["max_ms"]}ms '
+              f'rows~{row["rows_mean"]}/{row["rows_max"]}{slow}  {row["fingerprint"][:140]}')
+
+if __name__ == '__main__':
+    main()
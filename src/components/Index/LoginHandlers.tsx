@@ -61,6 +61,9 @@ export const useLoginHandlers = (
         appState.currentUser = authenticatedUser;
         hideLoginForm();
         setLoginForm({ username: "", password: "" });
+      } else if (response.status === 429) {
+        const minutes = Math.max(1, Math.ceil(Number(response.headers.get('Retry-After') || data.retryAfter || 60) / 60));
+        alert(`Слишком много попыток входа. Повторите через ${minutes} мин.`);
       } else {
         console.error('❌ Ошибка авторизации:', data.error);
         alert(data.error || "Неверные учетные данные или пользователь заблокирован");
@@ -67,11 +67,9 @@ export const PairingsEditor: React.FC<PairingsEditorProps> = ({
     );
   }
 
+  const droppedPlayerIds = new Set(tournament.droppedPlayerIds || []);
   const availablePlayers = tournament.participants
-    .filter(
-      (playerId) =>
-        !(tournament.droppedPlayerIds || []).includes(playerId),
-    )
+    .filter((playerId) => !droppedPlayerIds.has(playerId))
     .map((playerId) => ({
       id: playerId,
       name:
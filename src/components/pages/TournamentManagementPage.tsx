@@ -60,7 +60,7 @@ export const TournamentManagementPage: React.FC<TournamentManagementPageProps> =
           method: 'DELETE',
           headers: {
             'Content-Type': 'application/json',
-            'X-User-Id': appState.currentUser?.id || '',
+            'X-Auth-Token': localStorage.getItem('auth_token') || '',
           },
           body: JSON.stringify({ tournament_id: tournamentId }),
         }
@@ -17,6 +17,39 @@ const getAuthHeaders = () => {
   return headers;
 };
 
+// Tournament list row (tournaments / bootstrap) without games; rounds are filled by the full load
+const mapDbTournamentSummary = (t: any): Tournament => {
+  // Map database status to frontend status
+  let frontendStatus: 'draft' | 'active' | 'completed' | 'confirmed' = 'draft';
+  if (t.status === 'active') frontendStatus = 'active';
+  else if (t.status === 'completed') frontendStatus = 'completed';
+  else if (t.status === 'confirmed') frontendStatus = 'confirmed';
+  else frontendStatus = 'draft';
+  
+  return {
+    id: t.id.toString(),
+    dbId: t.id,
+    name: t.name,
+    format: t.format || 'sealed',
+    date: t.created_at ? t.created_at.split('T')[0] : new Date().toISOString().split('T')[0],
+    city: t.city || '',
+    description: `Турнир по формату ${t.format || 'sealed'}`,
+    isRated: t.is_rated !== false,
+    swissRounds: t.swiss_rounds || 3,
+    topRounds: t.top_rounds || 0,
+    participants: (t.participants || []).map((id: number) => id.toString()),
+    status: frontendStatus,
+    currentRound: t.current_round || 0,
+    rounds: [],
+    judgeId: t.judge_id ? t.judge_id.toString() : '',
+    droppedPlayerIds: (t.droppedPlayers || []).map((id: number) => id.toString()),
+    dropRounds: t.dropRounds || {},
+    hasSeating: t.hasSeating || false
+  };
+};
+
+const BOOTSTRAP_CACHE_KEY = 'bootstrap_cache';
+
 export const useAppState = () => {
   // Load only UI state from localStorage
   const [appState, setAppState] = useState<AppState>(() => {
@@ -170,6 +203,7 @@ export const useAppState = () => {
               rounds: rounds,
               judgeId: t.judge_id ? t.judge_id.toString() : '',
               droppedPlayerIds: (t.droppedPlayers || []).map((id: number) => id.toString()),
+              dropRounds: t.dropRounds || {},
               hasSeating: t.hasSeating || false
             };
             
@@ -218,6 +252,14 @@ export const useAppState = () => {
   };
 
   const logout = () => {
+    const token = localStorage.getItem('auth_token');
+    if (token) {
+      // Revoke server-side; the local session is cleared regardless of the outcome
+      fetch('https://functions.poehali.dev/c8519cb6-9df9-4faf-a146-2fedd66d1623/logout', {
+        method: 'POST',
+        headers: { 'X-Auth-Token': token }
+      }).catch(() => {});
+    }
     localStorage.removeItem('auth_token');
     localStorage.removeItem('lastPage');
     localStorage.removeItem('lastTournamentId');
@@ -509,34 +551,7 @@ export const useAppState = () => {
 
   // Sync tournaments from database
   const syncDbTournaments = useCallback((tournamentsFromDb: any[]) => {
-    const mappedTournaments = tournamentsFromDb.map((t: any) => {
-      // Map database status to frontend status
-      let frontendStatus: 'draft' | 'active' | 'completed' | 'confirmed' = 'draft';
-      if (t.status === 'active') frontendStatus = 'active';
-      else if (t.status === 'completed') frontendStatus = 'completed';
-      else if (t.status === 'confirmed') frontendStatus = 'confirmed';
-      else frontendStatus = 'draft';
-      
-      return {
-        id: t.id.toString(),
-        dbId: t.id,
-        name: t.name,
-        format: t.format || 'sealed',
-        date: t.created_at ? t.created_at.split('T')[0] : new Date().toISOString().split('T')[0],
-        city: t.city || '',
-        description: `Турнир по формату ${t.format || 'sealed'}`,
-        isRated: t.is_rated !== false,
-        swissRounds: t.swiss_rounds || 3,
-        topRounds: t.top_rounds || 0,
-        participants: (t.participants || []).map((id: number) => id.toString()),
-        status: frontendStatus,
-        currentRound: t.current_round || 0,
-        rounds: [],
-        judgeId: t.judge_id ? t.judge_id.toString() : '',
-        droppedPlayerIds: (t.droppedPlayers || []).map((id: number) => id.toString()),
-        hasSeating: t.hasSeating || false
-      };
-    });
+    const mappedTournaments = tournamentsFromDb.map(mapDbTournamentSummary);
     
     setAppState(prev => ({
       ...prev,
@@ -544,7 +559,9 @@ export const useAppState = () => {
     }));
   }, []);
 
-  // Load cities from database on app start
+  // Startup data in one request: bootstrap returns cities, formats and the newest tournaments under one ETag,
+  // revalidated with If-None-Match so an unchanged startup costs a 304. Until bootstrap is listed in
+  // func2url.json the separate endpoints are used
   useEffect(() => {
     const loadCitiesFromDatabase = async () => {
       try {
@@ -571,7 +588,88 @@ export const useAppState = () => {
       }
     };
 
-    loadCitiesFromDatabase();
+    const loadFormatsFromDatabase = async () => {
+      try {
+        const response = await fetch('https://functions.poehali.dev/bc0a368c-af39-49c9-bc4c-18b509328810', {
+          method: 'GET'
+        });
+
+        if (response.ok) {
+          const data = await response.json();
+          const formatsFromDb = data.formats.map((f: any) => ({
+            id: f.id.toString(),
+            name: f.name,
+            coefficient: f.coefficient
+          }));
+          
+          console.log('🔄 Загружено форматов из БД:', formatsFromDb.length);
+          
+          setAppState(prev => ({
+            ...prev,
+            tournamentFormats: formatsFromDb
+          }));
+        }
+      } catch (error) {
+        console.warn('⚠️ Не удалось загрузить форматы из БД:', error);
+      }
+    };
+
+    const loadBootstrap = async (): Promise<boolean> => {
+      const urls = await fetch('/backend/func2url.json')
+        .then(response => (response.ok ? response.json() : {}))
+        .catch(() => ({}));
+      if (!urls.bootstrap) {
+        return false;
+      }
+      
+      let cached: { etag: string; data: any } | null = null;
+      try {
+        cached = JSON.parse(localStorage.getItem(BOOTSTRAP_CACHE_KEY) || 'null');
+      } catch (e) {
+        cached = null;
+      }
+      
+      try {
+        const headers = getAuthHeaders();
+        if (cached?.etag) {
+          headers['If-None-Match'] = cached.etag;
+        }
+        const response = await fetch(urls.bootstrap, { method: 'GET', headers });
+        let data: any;
+        if (response.status === 304 && cached) {
+          data = cached.data;
+        } else if (response.ok) {
+          data = await response.json();
+          const etag = response.headers.get('ETag');
+          if (etag) {
+            localStorage.setItem(BOOTSTRAP_CACHE_KEY, JSON.stringify({ etag, data }));
+          }
+        } else {
+          return false;
+        }
+        
+        console.log('🔄 Стартовые данные из bootstrap:', data.cities.length, data.formats.length, data.tournaments.items.length);
+        
+        setAppState(prev => ({
+          ...prev,
+          cities: data.cities.map((c: any) => ({ id: c.id.toString(), name: c.name })),
+          tournamentFormats: data.formats.map((f: any) => ({ id: f.id.toString(), name: f.name, coefficient: f.coefficient })),
+          // The first page shows right away; the full load with games replaces it when it arrives
+          tournaments: prev.tournaments.length ? prev.tournaments : data.tournaments.items.map(mapDbTournamentSummary)
+        }));
+        return true;
+      } catch (error) {
+        console.warn('⚠️ Не удалось загрузить bootstrap:', error);
+        return false;
+      }
+    };
+
+    loadBootstrap().then(loaded => {
+      if (!loaded) {
+        loadCitiesFromDatabase();
+        loadFormatsFromDatabase();
+      }
+    });
   }, []);
 
   // City management functions
@@ -682,36 +780,6 @@ export const useAppState = () => {
     }
   };
 
-  // Load tournament formats from database on app start
-  useEffect(() => {
-    const loadFormatsFromDatabase = async () => {
-      try {
-        const response = await fetch('https://functions.poehali.dev/bc0a368c-af39-49c9-bc4c-18b509328810', {
-          method: 'GET'
-        });
-
-        if (response.ok) {
-          const data = await response.json();
-          const formatsFromDb = data.formats.map((f: any) => ({
-            id: f.id.toString(),
-            name: f.name,
-            coefficient: f.coefficient
-          }));
-          
-          console.log('🔄 Загружено форматов из БД:', formatsFromDb.length);
-          
-          setAppState(prev => ({
-            ...prev,
-            tournamentFormats: formatsFromDb
-          }));
-        }
-      } catch (error) {
-        console.warn('⚠️ Не удалось загрузить форматы из БД:', error);
-      }
-    };
-
-    loadFormatsFromDatabase();
-  }, []);
 
   // Tournament format management functions
   const addTournamentFormat = async (format: TournamentFormat) => {
@@ -844,9 +912,6 @@ export const useAppState = () => {
     }
 
     const headers = getAuthHeaders();
-    if (appState.currentUser?.id) {
-      headers['X-User-Id'] = appState.currentUser.id;
-    }
 
     const response = await fetch(`https://functions.poehali.dev/04b06a3d-149f-4a4c-8754-defa21ff87f3?id=${tournament.dbId}`, {
       method: 'DELETE',
@@ -1212,11 +1277,18 @@ export const useAppState = () => {
     if (!tournament) return;
 
     const droppedPlayers = new Set(tournament.droppedPlayerIds || []);
+    const dropRounds = { ...(tournament.dropRounds || {}) };
+    const isDropping = !droppedPlayers.has(playerId);
     
-    if (droppedPlayers.has(playerId)) {
-      droppedPlayers.delete(playerId);
-    } else {
+    if (isDropping) {
       droppedPlayers.add(playerId);
+      // Локально: тур после последнего, в котором игрок был в паре; сервер вернёт свой
+      const lastPaired = tournament.rounds.reduce((last, round) =>
+        round.matches?.some(m => m.player1Id === playerId || m.player2Id === playerId) ? Math.max(last, round.number) : last, 0);
+      dropRounds[playerId] = lastPaired + 1;
+    } else {
+      droppedPlayers.delete(playerId);
+      delete dropRounds[playerId];
     }
     
     const updatedDroppedPlayers = Array.from(droppedPlayers);
@@ -1224,16 +1296,22 @@ export const useAppState = () => {
     // Update in database if tournament has dbId
     if (tournament.dbId) {
       try {
-        const response = await fetch('https://functions.poehali.dev/27da478c-7993-4119-a4e5-66f336dbb8c0', {
-          method: 'PUT',
-          headers: getAuthHeaders(),
-          body: JSON.stringify({
-            id: tournament.dbId,
-            droppedPlayers: updatedDroppedPlayers
-          })
-        });
+        const response = await fetch(
+          isDropping
+            ? 'https://functions.poehali.dev/27da478c-7993-4119-a4e5-66f336dbb8c0/drop'
+            : `https://functions.poehali.dev/27da478c-7993-4119-a4e5-66f336dbb8c0/drop?tournament_id=${tournament.dbId}&player_id=${playerId}`,
+          {
+            method: isDropping ? 'POST' : 'DELETE',
+            headers: getAuthHeaders(),
+            body: isDropping ? JSON.stringify({ tournament_id: tournament.dbId, player_id: playerId }) : undefined
+          }
+        );
         
         if (response.ok) {
+          const result = await response.json();
+          if (isDropping && result.drop_round) {
+            dropRounds[playerId] = result.drop_round;
+          }
           console.log('✅ Дропы синхронизированы с БД');
         } else {
           console.error('❌ Ошибка синхронизации дропов с БД:', await response.text());
@@ -1248,7 +1326,7 @@ export const useAppState = () => {
       ...prev,
       tournaments: prev.tournaments.map(t =>
         t.id === tournamentId
-          ? { ...t, droppedPlayerIds: updatedDroppedPlayers }
+          ? { ...t, droppedPlayerIds: updatedDroppedPlayers, dropRounds }
           : t
       )
     }));
@@ -1587,26 +1665,7 @@ export const useAppState = () => {
         console.error('❌ Ошибка запроса подтверждения турнира:', error);
       }
       
-      // Recalculate ratings (independent of status update)
-      try {
-        const recalcResponse = await fetch('https://functions.poehali.dev/b995ecfd-0dac-4af5-9359-0d111138afbd', {
-          method: 'POST',
-          headers: {
-            'Content-Type': 'application/json',
-            'X-Auth-Token': localStorage.getItem('authToken') || ''
-          },
-          body: JSON.stringify({ tournament_id: tournament.dbId })
-        });
-        
-        if (recalcResponse.ok) {
-          const recalcData = await recalcResponse.json();
-          console.log('✅ Рейтинги пересчитаны для игр турнира:', recalcData);
-        } else {
-          console.error('❌ Ошибка пересчёта рейтингов для игр');
-        }
-      } catch (error) {
-        console.error('❌ Ошибка запроса пересчёта рейтингов:', error);
-      }
+      // Рейтинги пересчитывает сервер: подтверждение пишет событие в outbox, диспетчер ставит задачу
       
       // Save tournament results (independent of other operations)
       try {
@@ -56,6 +56,7 @@ export interface Tournament {
   judgeId?: string; // ID судьи турнира
   hasSeating?: boolean; // Признак необходимости рассадки
   droppedPlayerIds?: string[];
+  dropRounds?: Record<string, number>; // Тур, с которого игрок выбыл
 }
 
 export interface Player {
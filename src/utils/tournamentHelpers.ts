@@ -161,6 +161,7 @@ export const calculateTournamentStandings = (
   users: any[],
 ) => {
   const droppedPlayerIds = new Set(tournament.droppedPlayerIds || []);
+  const dropRounds: Record<string, number> = tournament.dropRounds || {};
   
   return tournament.participants
     .map((participantId: string) => {
@@ -172,20 +173,10 @@ export const calculateTournamentStandings = (
       let losses = 0;
       let draws = 0;
       const opponentIds: string[] = [];
-      let dropRoundNumber: number | null = null;
-
-      // Determine when player was dropped (if at all)
-      if (droppedPlayerIds.has(participantId)) {
-        tournament.rounds?.forEach((round: any, index: number) => {
-          const match = round.matches?.find(
-            (m: any) => m.player1Id === participantId || m.player2Id === participantId
-          );
-          // If player is not in matches of this round, they dropped before/during it
-          if (!match && dropRoundNumber === null) {
-            dropRoundNumber = round.number;
-          }
-        });
-      }
+      // Drop round is recorded server-side when the player is dropped
+      const dropRoundNumber: number | null = droppedPlayerIds.has(participantId)
+        ? dropRounds[participantId] ?? null
+        : null;
 
       tournament.rounds?.forEach((round: any) => {
         // Пропускаем рассадочный тур (не учитывается в подсчёте очков)